@@ -0,0 +1,237 @@
+"""
+Apollo person parsing benchmark
+
+Parses one large mixed_people/search response with ApolloClient's response
+parser and reports people parsed per second.
+
+Modes:
+    legacy    - the previous _parse_person: one substring scan per title keyword,
+                per-person debug logging, full pydantic validation
+    validated - precompiled tag classifier, full pydantic validation
+    fast      - precompiled tag classifier, model_construct (the default)
+
+The response is either loaded from a file saved from a real Apollo call or
+generated (deterministically) with Apollo's field layout. Every mode must
+produce the same tags for every person; the benchmark fails if they differ.
+
+Usage:
+    python benchmarks/apollo_parse.py --people 10000 --rounds 5
+    python benchmarks/apollo_parse.py --response recorded_search.json
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from loguru import logger
+
+from scrapers.apollo_scraper import ApolloClientBase
+from scrapers.schemas import Contact
+
+
+TITLES = [
+    "CEO", "Co-Founder & CEO", "Founder", "Chief Technology Officer", "CTO", "CFO",
+    "Chief Operating Officer", "VP of Engineering", "Vice President, Sales",
+    "Director of Product", "Managing Director", "Head of Growth", "Head Engineer",
+    "Senior Software Engineer", "Account Executive, Sales", "Revenue Operations Manager",
+    "Business Development Representative", "Product Manager", "Marketing Coordinator",
+    "Data Scientist", "Office Manager", "Recruiter", None,
+]
+SENIORITIES = ["c_suite", "vp", "director", "manager", "senior", "entry", "founder", None]
+SIC_CODES = ["7372", "7375", "6282", "5045", "7371", "8742", "3674"]
+NAICS_CODES = ["541511", "518", "519", "523", "334", "541512", "5415", "611"]
+CITIES = [("San Francisco", "California", "United States"), ("New York", "New York", "United States"),
+          ("London", "England", "United Kingdom"), ("Berlin", "Berlin", "Germany")]
+
+
+def generate_response(num_people: int, seed: int = 7) -> Dict[str, Any]:
+    """A mixed_people/search response with Apollo's field layout"""
+    rng = random.Random(seed)
+    people = []
+    for i in range(num_people):
+        first, last = f"First{i}", f"Last{i}"
+        company = f"Company {i % 997}"
+        city, state, country = rng.choice(CITIES)
+        people.append({
+            "id": f"{i:024x}",
+            "first_name": first,
+            "last_name": last,
+            "name": f"{first} {last}",
+            "linkedin_url": f"http://www.linkedin.com/in/{first.lower()}-{last.lower()}",
+            "title": rng.choice(TITLES),
+            "email_status": "verified",
+            "photo_url": None,
+            "twitter_url": None,
+            "headline": "Building things",
+            "email": f"{first.lower()}.{last.lower()}@company{i % 997}.com" if rng.random() < 0.7 else None,
+            "state": state,
+            "city": city,
+            "country": country,
+            "seniority": rng.choice(SENIORITIES),
+            "departments": ["master_engineering_technical"],
+            "phone_numbers": [{"raw_number": f"+1 415 555 {i % 10000:04d}", "type": "work_direct"}]
+            if rng.random() < 0.3 else [],
+            "organization": {
+                "id": f"{i % 997:024x}",
+                "name": company if rng.random() < 0.97 else None,
+                "website_url": f"http://www.company{i % 997}.com",
+                "primary_domain": f"company{i % 997}.com",
+                "sic_codes": rng.sample(SIC_CODES, rng.randint(0, 2)),
+                "naics_codes": rng.sample(NAICS_CODES, rng.randint(0, 2)),
+                "estimated_num_employees": rng.randint(5, 5000),
+            },
+        })
+    return {
+        "people": people,
+        "pagination": {"page": 1, "per_page": num_people, "total_entries": num_people, "total_pages": 1},
+    }
+
+
+class LegacyParser(ApolloClientBase):
+    """_parse_person as it was before the precompiled classifier"""
+
+    def _parse_person(self, person_data: Dict[str, Any]) -> Contact:
+        org = person_data.get("organization", {}) or {}
+        company_name = org.get("name")
+        sic_codes = org.get("sic_codes", [])
+        naics_codes = org.get("naics_codes", [])
+
+        tags = []
+        title = (person_data.get("title") or "").lower()  # generated data has null titles
+        seniority = (person_data.get("seniority") or "").lower()
+
+        if any(word in title for word in ["ceo", "chief executive", "founder", "co-founder"]):
+            tags.append("role:ceo_founder")
+        if any(word in title for word in ["cto", "chief technology"]):
+            tags.append("role:cto")
+        if any(word in title for word in ["cfo", "chief financial"]):
+            tags.append("role:cfo")
+        if any(word in title for word in ["coo", "chief operating"]):
+            tags.append("role:coo")
+        if any(word in title for word in ["vp", "vice president"]):
+            tags.append("role:vp")
+        if "director" in title and "managing" not in title:
+            tags.append("role:director")
+        if "head of" in title or "head " in title:
+            tags.append("role:head")
+        if "engineer" in title:
+            tags.append("dept:engineering")
+        if any(word in title for word in ["sales", "revenue", "business development"]):
+            tags.append("dept:sales")
+        if "product" in title:
+            tags.append("dept:product")
+        if any(word in title for word in ["marketing", "growth"]):
+            tags.append("dept:marketing")
+
+        if seniority:
+            seniority_map = {
+                "c_suite": "C-Suite Executive",
+                "vp": "VP Level",
+                "director": "Director Level",
+                "manager": "Manager Level",
+                "senior": "Senior Level",
+                "entry": "Entry Level"
+            }
+            tags.append(f"seniority:{seniority_map.get(seniority, seniority.title())}")
+
+        if "7372" in sic_codes or "541511" in naics_codes:
+            tags.append("industry:software")
+        if "7375" in sic_codes or "518" in naics_codes or "519" in naics_codes:
+            tags.append("industry:saas")
+        if "6282" in sic_codes or "523" in naics_codes:
+            tags.append("industry:fintech")
+        if "5045" in sic_codes or "334" in naics_codes:
+            tags.append("industry:hardware")
+        if "7371" in sic_codes or "541512" in naics_codes:
+            tags.append("industry:consulting")
+
+        person_name = person_data.get("name", "Unknown")
+        logger.debug(f"📋 Parsing contact: {person_name}")
+        logger.debug(f"   Title: {person_data.get('title')}")
+        logger.debug(f"   Tags generated: {tags}")
+        logger.debug(f"   Company name extracted: {company_name}")
+
+        if not company_name:
+            logger.warning(f"⚠️  No company name for {person_name}")
+
+        return Contact(
+            apollo_id=person_data.get("id"),
+            name=person_data.get("name", ""),
+            title=person_data.get("title"),
+            company=company_name,
+            email=person_data.get("email"),
+            linkedin_url=person_data.get("linkedin_url"),
+            phone=person_data.get("phone_numbers", [{}])[0].get("raw_number") if person_data.get("phone_numbers") else None,
+            city=person_data.get("city"),
+            state=person_data.get("state"),
+            country=person_data.get("country"),
+            tags=tags,
+            source="apollo"
+        )
+
+
+class ValidatingParser(ApolloClientBase):
+    validate_responses = True
+
+
+def run_mode(parser: ApolloClientBase, data: Dict[str, Any], rounds: int) -> Dict[str, Any]:
+    """Parse the response `rounds` times; best round wins"""
+    timings = []
+    contacts = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        contacts = parser._parse_people_response(data)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    return {'contacts': contacts, 'seconds': best, 'per_second': len(contacts) / best}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--people', type=int, default=10000, help='People in the generated response')
+    parser.add_argument('--response', help='Recorded mixed_people/search response (JSON) to parse instead')
+    parser.add_argument('--save', help='Write the generated response to this file')
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.response:
+        data = json.loads(Path(args.response).read_text())
+    else:
+        data = generate_response(args.people)
+        if args.save:
+            Path(args.save).write_text(json.dumps(data))
+
+    # Log at INFO like the app does: debug lines are filtered but still formatted,
+    # warnings are dropped so they don't swamp the output
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+
+    parsers = {
+        'legacy': LegacyParser(api_key="benchmark"),
+        'validated': ValidatingParser(api_key="benchmark"),
+        'fast': ApolloClientBase(api_key="benchmark"),
+    }
+
+    print(f"Parsing {len(data.get('people', []))} people, best of {args.rounds} rounds\n")
+    results = {name: run_mode(p, data, args.rounds) for name, p in parsers.items()}
+
+    baseline = results['legacy']
+    for name, result in results.items():
+        print(f"{name:10s} {result['seconds'] * 1000:8.1f} ms  {result['per_second']:10,.0f} people/s  "
+              f"{baseline['seconds'] / result['seconds']:5.2f}x")
+
+    legacy_tags = [c.tags for c in baseline['contacts']]
+    for name in ('validated', 'fast'):
+        if [c.tags for c in results[name]['contacts']] != legacy_tags:
+            sys.exit(f"❌ {name} tags differ from legacy")
+    print("\n✅ Tags identical across modes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,444 @@
+"""
+Offline Apollo.io API stub
+
+A FastAPI app serving a seeded synthetic dataset through the Apollo endpoints
+the CRM uses, so search and enrichment can be load-tested and benchmarked
+without a live key or network:
+
+    POST /api/v1/mixed_people/search       POST /api/v1/mixed_companies/search
+    POST /api/v1/people/search             POST /api/v1/people/match
+    POST /api/v1/people/bulk_match         POST /api/v1/organizations/bulk_enrich
+
+(also served under /v1/...). Search pagination follows Apollo: per_page is
+capped at 100 and no more than max_pages pages are returned. Every request
+gets the configured latency, and a configured share of them answer 429 (with
+Retry-After) or 5xx instead.
+
+Control endpoints:
+    GET  /_stub/stats    requests per endpoint and status
+    POST /_stub/config   change latency / failure rates at runtime (partial JSON)
+    POST /_stub/reset    zero the stats
+
+Point the clients at it with APOLLO_BASE_URL=http://127.0.0.1:8099/api/v1
+(or ApolloClient(base_url=...)).
+
+Usage:
+    python benchmarks/apollo_stub.py --port 8099 --latency-ms 80 --rate-429 0.02 --error-rate 0.01
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+class StubConfig(BaseModel):
+    """Dataset size and fault injection for one stub instance"""
+    seed: int = 7
+    people: int = 20000
+    organizations: int = 2000
+    latency_ms: float = 50.0  # Mean added latency per request
+    jitter_ms: float = 20.0  # Uniform +/- around latency_ms
+    rate_429: float = 0.0  # Share of requests answered 429 Too Many Requests
+    retry_after: int = 1  # Retry-After seconds sent with 429s
+    error_rate: float = 0.0  # Share of requests answered 500/503
+    max_pages: int = 500  # Apollo stops paginating a search here
+    bulk_max: int = 10  # Records per bulk request
+    require_api_key: bool = True
+
+
+FIRST_NAMES = ["James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David",
+               "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas",
+               "Sarah", "Wei", "Priya", "Ahmed", "Sofia", "Lucas", "Yuki", "Olga", "Mateo"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez",
+              "Martinez", "Hernandez", "Lopez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore",
+              "Chen", "Patel", "Kim", "Nguyen", "Rossi", "Muller", "Tanaka", "Ivanova", "Silva"]
+COMPANY_WORDS = ["Blue", "Quantum", "Bright", "North", "Vertex", "Atlas", "Nimbus", "Cedar", "Signal",
+                 "Harbor", "Pixel", "Summit", "Lumen", "Orbit", "Forge", "Delta", "Crest", "Echo"]
+COMPANY_NOUNS = ["Labs", "Systems", "Analytics", "Cloud", "Robotics", "Health", "Capital", "Networks",
+                 "Software", "Dynamics", "Logistics", "Media", "Security", "Energy", "Bio", "Pay"]
+INDUSTRIES = ["computer software", "information technology & services", "financial services",
+              "internet", "hospital & health care", "marketing & advertising", "logistics & supply chain",
+              "venture capital & private equity", "computer hardware", "management consulting"]
+INDUSTRY_CODES = {
+    "computer software": (["7372"], ["541511"]),
+    "information technology & services": (["7371"], ["541512"]),
+    "financial services": (["6282"], ["523"]),
+    "internet": (["7375"], ["518"]),
+    "computer hardware": (["5045"], ["334"]),
+}
+FUNDING_STAGES = ["Seed", "Series A", "Series B", "Series C", "Private Equity", "Public", None]
+TECHNOLOGIES = ["salesforce", "hubspot", "aws", "google_cloud", "react", "python", "snowflake",
+                "stripe", "segment", "kubernetes", "zendesk", "slack"]
+LOCATIONS = [("San Francisco", "California", "United States"), ("New York", "New York", "United States"),
+             ("Austin", "Texas", "United States"), ("London", "England", "United Kingdom"),
+             ("Berlin", "Berlin", "Germany"), ("Paris", "Ile-de-France", "France"),
+             ("Toronto", "Ontario", "Canada"), ("Singapore", "Singapore", "Singapore")]
+EMPLOYEE_SIZES = [8, 25, 60, 150, 400, 900, 3000, 12000]
+
+# title -> seniority
+TITLES = [
+    ("CEO", "c_suite"), ("Co-Founder & CEO", "founder"), ("Founder", "founder"), ("CTO", "c_suite"),
+    ("Chief Financial Officer", "c_suite"), ("COO", "c_suite"), ("VP of Engineering", "vp"),
+    ("VP Sales", "vp"), ("Vice President, Marketing", "vp"), ("Director of Product", "director"),
+    ("Managing Director", "director"), ("Director of Engineering", "director"), ("Head of Growth", "head"),
+    ("Head of Data", "head"), ("Engineering Manager", "manager"), ("Sales Manager", "manager"),
+    ("Product Manager", "manager"), ("Senior Software Engineer", "senior"), ("Account Executive", "senior"),
+    ("Marketing Coordinator", "entry"), ("Software Engineer", "entry"), ("Recruiter", "entry"),
+]
+
+
+def build_dataset(config: StubConfig) -> Dict[str, Any]:
+    """Organizations and people generated from the seed, with lookup indexes"""
+    rng = random.Random(config.seed)
+
+    organizations = []
+    for i in range(config.organizations):
+        name = f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_NOUNS)} {i}"
+        domain = name.lower().replace(" ", "") + ".com"
+        industry = rng.choice(INDUSTRIES)
+        sic, naics = INDUSTRY_CODES.get(industry, ([], []))
+        city, state, country = rng.choice(LOCATIONS)
+        organizations.append({
+            "id": f"org{i:021d}",
+            "name": name,
+            "website_url": f"http://www.{domain}",
+            "primary_domain": domain,
+            "linkedin_url": f"http://www.linkedin.com/company/{domain.split('.')[0]}",
+            "industry": industry,
+            "short_description": f"{name} builds {industry} products.",
+            "estimated_num_employees": rng.choice(EMPLOYEE_SIZES),
+            "founded_year": rng.randint(1990, 2023),
+            "city": city,
+            "state": state,
+            "country": country,
+            "latest_funding_stage": rng.choice(FUNDING_STAGES),
+            "total_funding": rng.choice([None, 1_500_000, 12_000_000, 48_000_000, 150_000_000]),
+            "technologies": rng.sample(TECHNOLOGIES, rng.randint(0, 5)),
+            "sic_codes": sic,
+            "naics_codes": naics,
+        })
+
+    # Company sizes are skewed: a few organizations have many people
+    weights = [1.0 / (rank + 1) ** 0.8 for rank in range(len(organizations))]
+    employers = rng.choices(range(len(organizations)), weights=weights, k=config.people)
+
+    people = []
+    for i, org_index in enumerate(employers):
+        org = organizations[org_index]
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        title, seniority = rng.choice(TITLES)
+        city, state, country = rng.choice(LOCATIONS) if rng.random() < 0.3 else (org["city"], org["state"], org["country"])
+        phone = f"+1 {rng.randint(200, 989)} {rng.randint(200, 999)} {rng.randint(0, 9999):04d}"
+        people.append({
+            "id": f"per{i:021d}",
+            "first_name": first,
+            "last_name": last,
+            "name": f"{first} {last}",
+            "linkedin_url": f"http://www.linkedin.com/in/{first.lower()}-{last.lower()}-{i}",
+            "title": title,
+            "headline": f"{title} at {org['name']}",
+            "email": f"{first.lower()}.{last.lower()}{i}@{org['primary_domain']}" if rng.random() < 0.85 else None,
+            "email_status": "verified",
+            "city": city,
+            "state": state,
+            "country": country,
+            "seniority": seniority,
+            "phone_numbers": [{"raw_number": phone, "sanitized_number": phone.replace(" ", ""),
+                               "type": "work_direct"}] if rng.random() < 0.6 else [],
+            "organization_id": org["id"],
+            "organization": org,
+        })
+
+    return {
+        "organizations": organizations,
+        "people": people,
+        "people_by_email": {p["email"]: p for p in people if p["email"]},
+        "people_by_linkedin": {p["linkedin_url"]: p for p in people},
+        "organizations_by_domain": {o["primary_domain"]: o for o in organizations},
+    }
+
+
+def _contains_any(value: Optional[str], needles: List[str]) -> bool:
+    value = (value or "").lower()
+    return any(n.lower() in value for n in needles if n)
+
+
+def _in_ranges(count: int, ranges: List[str]) -> bool:
+    # Apollo's "51,200" format; the "51-200" / "10001+" spelling Claude produces is accepted too
+    for r in ranges:
+        low, _, high = str(r).replace("-", ",").replace("+", ",").partition(",")
+        if int(low or 0) <= count <= int(high or 10 ** 9):
+            return True
+    return False
+
+
+def _person_matches(person: Dict[str, Any], f: Dict[str, Any]) -> bool:
+    org = person["organization"]
+    if f.get("person_titles") and not _contains_any(person["title"], f["person_titles"]):
+        return False
+    if f.get("person_seniorities") and person["seniority"] not in f["person_seniorities"]:
+        return False
+    if f.get("q_organization_name") and f["q_organization_name"].lower() not in org["name"].lower():
+        return False
+    if f.get("organization_names") and not any(n.lower() in org["name"].lower() for n in f["organization_names"]):
+        return False
+    if f.get("person_locations") and not _contains_any(
+            f"{person['city']} {person['state']} {person['country']}", f["person_locations"]):
+        return False
+    if f.get("organization_industry_keywords") and not _contains_any(org["industry"], f["organization_industry_keywords"]):
+        return False
+    if f.get("organization_num_employees_ranges") and not _in_ranges(
+            org["estimated_num_employees"], f["organization_num_employees_ranges"]):
+        return False
+    if f.get("first_name") and person["first_name"].lower() != f["first_name"].lower():
+        return False
+    if f.get("last_name") and person["last_name"].lower() != f["last_name"].lower():
+        return False
+    if f.get("q_keywords"):
+        text = f"{person['name']} {person['title']} {org['name']} {org['industry']}".lower()
+        if not all(word in text for word in f["q_keywords"].lower().split()):
+            return False
+    return True
+
+
+def _organization_matches(org: Dict[str, Any], f: Dict[str, Any]) -> bool:
+    if f.get("q_organization_name") and f["q_organization_name"].lower() not in org["name"].lower():
+        return False
+    if f.get("organization_locations") and not _contains_any(
+            f"{org['city']} {org['state']} {org['country']}", f["organization_locations"]):
+        return False
+    if f.get("organization_num_employees_ranges") and not _in_ranges(
+            org["estimated_num_employees"], f["organization_num_employees_ranges"]):
+        return False
+    if f.get("organization_latest_funding_stage_cd") and org["latest_funding_stage"] not in f["organization_latest_funding_stage_cd"]:
+        return False
+    if f.get("organization_technology_slugs") and not set(f["organization_technology_slugs"]) & set(org["technologies"]):
+        return False
+    return True
+
+
+def create_app(config: Optional[StubConfig] = None) -> FastAPI:
+    """Build a stub app serving its own dataset (available as app.state.dataset)"""
+    config = config or StubConfig()
+    dataset = build_dataset(config)
+    stats: Counter = Counter()
+    rng = random.Random(config.seed + 1)
+
+    app = FastAPI(title="Apollo stub")
+    app.state.config = config
+    app.state.dataset = dataset
+    app.state.stats = stats
+
+    @lru_cache(maxsize=1024)
+    def search(kind: str, filters_json: str) -> Tuple[Dict[str, Any], ...]:
+        """All records matching a search's filters (cached across pages)"""
+        filters = json.loads(filters_json)
+        if kind == "people":
+            return tuple(p for p in dataset["people"] if _person_matches(p, filters))
+        return tuple(o for o in dataset["organizations"] if _organization_matches(o, filters))
+
+    def paginate(kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        filters = {k: v for k, v in payload.items() if k not in ("page", "per_page") and v not in (None, [], "")}
+        matches = search(kind, json.dumps(filters, sort_keys=True))
+        page = max(1, int(payload.get("page") or 1))
+        per_page = max(1, min(int(payload.get("per_page") or 25), 100))
+        total_pages = min(math.ceil(len(matches) / per_page), config.max_pages)
+        items = list(matches[(page - 1) * per_page:page * per_page]) if page <= total_pages else []
+        return {
+            kind: items,
+            "pagination": {
+                "page": page,
+                "per_page": per_page,
+                "total_entries": len(matches),
+                "total_pages": total_pages,
+            },
+        }
+
+    def match_person(detail: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if detail.get("email"):
+            person = dataset["people_by_email"].get(detail["email"].strip().lower())
+            if person:
+                return person
+        if detail.get("linkedin_url"):
+            person = dataset["people_by_linkedin"].get(detail["linkedin_url"].strip().rstrip("/"))
+            if person:
+                return person
+        if detail.get("first_name") and (detail.get("domain") or detail.get("organization_name")):
+            for person in dataset["people"]:
+                org = person["organization"]
+                if person["first_name"].lower() != detail["first_name"].lower():
+                    continue
+                if detail.get("last_name") and person["last_name"].lower() != detail["last_name"].lower():
+                    continue
+                if detail.get("domain") and org["primary_domain"] != detail["domain"].lower():
+                    continue
+                if detail.get("organization_name") and detail["organization_name"].lower() not in org["name"].lower():
+                    continue
+                return person
+        return None
+
+    @app.middleware("http")
+    async def inject_latency_and_faults(request: Request, call_next):
+        path = request.url.path
+        if path.startswith("/_stub"):
+            return await call_next(request)
+
+        endpoint = path.split("/v1/", 1)[-1]
+        jitter = rng.uniform(-config.jitter_ms, config.jitter_ms)
+        await asyncio.sleep(max(0.0, config.latency_ms + jitter) / 1000)
+
+        if config.require_api_key and not request.headers.get("x-api-key"):
+            stats[(endpoint, 401)] += 1
+            return JSONResponse({"error": "Invalid access credentials."}, status_code=401)
+
+        roll = rng.random()
+        if roll < config.rate_429:
+            stats[(endpoint, 429)] += 1
+            return JSONResponse(
+                {"error": "You have exceeded your rate limit.", "retry_after": config.retry_after},
+                status_code=429, headers={"Retry-After": str(config.retry_after)}
+            )
+        if roll < config.rate_429 + config.error_rate:
+            status = rng.choice([500, 503])
+            stats[(endpoint, status)] += 1
+            return JSONResponse({"error": "Internal server error"}, status_code=status)
+
+        response = await call_next(request)
+        stats[(endpoint, response.status_code)] += 1
+        return response
+
+    def bulk_limit_error(count: int) -> Optional[JSONResponse]:
+        if count > config.bulk_max:
+            return JSONResponse({"error": f"At most {config.bulk_max} records per request"}, status_code=422)
+        return None
+
+    for prefix in ("/api/v1", "/v1"):
+        @app.post(f"{prefix}/mixed_people/search")
+        @app.post(f"{prefix}/people/search")
+        async def people_search(payload: Dict[str, Any]):
+            return paginate("people", payload)
+
+        @app.post(f"{prefix}/mixed_companies/search")
+        async def companies_search(payload: Dict[str, Any]):
+            return paginate("organizations", payload)
+
+        @app.post(f"{prefix}/people/match")
+        async def people_match(payload: Dict[str, Any]):
+            return {"person": match_person(payload)}
+
+        @app.post(f"{prefix}/people/bulk_match")
+        async def people_bulk_match(payload: Dict[str, Any]):
+            details = payload.get("details") or []
+            error = bulk_limit_error(len(details))
+            if error:
+                return error
+            matches = [match_person(detail) for detail in details]
+            found = sum(1 for m in matches if m)
+            return {
+                "status": "success",
+                "matches": matches,
+                "unique_enriched_records": found,
+                "missing_records": len(matches) - found,
+                "credits_consumed": found,
+            }
+
+        @app.post(f"{prefix}/organizations/bulk_enrich")
+        async def organizations_bulk_enrich(payload: Dict[str, Any]):
+            domains = payload.get("domains") or []
+            error = bulk_limit_error(len(domains))
+            if error:
+                return error
+            organizations = [dataset["organizations_by_domain"].get((d or "").lower()) for d in domains]
+            return {"status": "success", "organizations": organizations}
+
+    @app.get("/_stub/stats")
+    async def stub_stats():
+        by_endpoint: Dict[str, Dict[str, int]] = {}
+        for (endpoint, status), count in sorted(stats.items()):
+            by_endpoint.setdefault(endpoint, {})[str(status)] = count
+        return {"requests": sum(stats.values()), "by_endpoint": by_endpoint}
+
+    @app.post("/_stub/config")
+    async def update_config(changes: Dict[str, Any]):
+        for key, value in changes.items():
+            if key in ("seed", "people", "organizations"):
+                continue  # The dataset is fixed for the app's lifetime
+            if hasattr(config, key):
+                setattr(config, key, type(getattr(config, key))(value))
+        return config.model_dump()
+
+    @app.post("/_stub/reset")
+    async def reset_stats():
+        stats.clear()
+        return {"requests": 0}
+
+    return app
+
+
+def request_counts(app: FastAPI) -> Dict[str, int]:
+    """Requests the stub has answered, by endpoint (all statuses) plus 429s and 5xx"""
+    counts: Counter = Counter()
+    for (endpoint, status), count in app.state.stats.items():
+        counts[endpoint] += count
+        if status == 429:
+            counts["429"] += count
+        elif status >= 500:
+            counts["5xx"] += count
+    return dict(counts)
+
+
+def start_stub(config: Optional[StubConfig] = None):
+    """Run a stub with uvicorn in a background thread; returns (app, server, base_url)"""
+    import uvicorn
+
+    app = create_app(config)
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=port, log_level='error'))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return app, server, f'http://127.0.0.1:{port}/api/v1'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8099)
+    for name, field in StubConfig.model_fields.items():
+        flag = '--' + name.replace('_', '-')
+        if field.annotation is bool:
+            parser.add_argument(flag, type=lambda v: v.lower() not in ('0', 'false', 'no'), default=field.default)
+        else:
+            parser.add_argument(flag, type=field.annotation, default=field.default)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    config = StubConfig(**{name: getattr(args, name) for name in StubConfig.model_fields})
+    app = create_app(config)
+    print(f"Apollo stub: {config.people} people, {config.organizations} organizations - "
+          f"APOLLO_BASE_URL=http://{args.host}:{args.port}/api/v1")
+    uvicorn.run(app, host=args.host, port=args.port, log_level='warning')
+
+
+if __name__ == '__main__':
+    main()
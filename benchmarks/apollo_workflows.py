@@ -0,0 +1,223 @@
+"""
+Apollo workflow benchmark (offline)
+
+Runs the CRM's Apollo-heavy workflows against the offline stub
+(benchmarks/apollo_stub.py) and reports wall time, requests the stub
+answered, 429/5xx responses and credits charged.
+
+Workflows:
+    phones_single    - ApolloPhoneEnrichment.enrich_contact_phone, one contact at a time
+    phones_batch     - ApolloPhoneEnrichment.enrich_contacts_batch (bulk match)
+    companies        - JobEnrichmentService.enrich_companies_with_apollo
+    companies_async  - JobEnrichmentService.enrich_companies_with_apollo_async
+    agentic          - AgenticSearchService.run_agentic_search
+
+Every workflow starts with an empty response cache, and everything (SQLite
+database, cache, rate-limit state) lives in a temp directory. Claude calls
+inside run_agentic_search are replaced by fixed query lists.
+
+Usage:
+    python benchmarks/apollo_workflows.py --contacts 500 --companies 100 --latency-ms 80
+    python benchmarks/apollo_workflows.py --rate-429 0.02 --error-rate 0.01 --workflows phones_batch,agentic
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from apollo_stub import StubConfig, request_counts, start_stub
+
+
+WORKFLOWS = ['phones_single', 'phones_batch', 'companies', 'companies_async', 'agentic']
+
+AGENTIC_QUERIES = [
+    {"titles": ["CTO", "VP of Engineering"], "person_seniorities": ["c_suite", "vp"]},
+    {"titles": ["Head of Data"], "organization_num_employees_ranges": ["51,200", "201,500"]},
+    {"titles": ["Chief Data Scientist"]},  # Finds nothing - exercises the refinement path
+]
+AGENTIC_EXPANSIONS = [
+    {"titles": ["Director of Engineering"], "person_seniorities": ["director"]},
+    {"titles": ["Founder"], "organization_num_employees_ranges": ["1,10", "11,50"]},
+]
+AGENTIC_REFINEMENTS = [
+    {"titles": ["Head of Growth"]},
+]
+
+
+def sample_contacts(dataset: Dict[str, Any], count: int) -> List[Dict[str, Any]]:
+    """CRM contact dicts for stub people - every fifth one is unknown to Apollo"""
+    contacts = []
+    people = [p for p in dataset['people'] if p['email']]
+    for i in range(count):
+        person = people[(i * 37) % len(people)]
+        email = person['email'] if i % 5 else f"nobody{i}@{person['organization']['primary_domain']}"
+        contacts.append({
+            'id': i + 1,
+            'name': person['name'],
+            'first_name': person['first_name'],
+            'last_name': person['last_name'],
+            'email': email,
+            'company': person['organization']['name'],
+        })
+    return contacts
+
+
+def seed_companies(manager, dataset: Dict[str, Any], count: int):
+    """Companies (by their stub names) for enrich_companies_with_apollo, biggest first"""
+    from database.models import Company
+
+    session = manager.get_session()
+    try:
+        session.bulk_insert_mappings(Company, [
+            {'name': org['name'], 'source': 'benchmark'}
+            for org in dataset['organizations'][:count * 2]
+        ])
+        session.commit()
+    finally:
+        session.close()
+
+
+def run_workflow(name: str, args, app, base_url: str, manager, tmp: Path) -> Dict[str, Any]:
+    from database.models import Company
+    from scrapers.apollo_cache import ApolloResponseCache
+    from scrapers.apollo_scraper import ApolloClient, AsyncApolloClient
+    from scrapers.apollo_usage import ApolloUsageLedger, usage_scope
+    from scrapers.rate_limiter import get_apollo_rate_limiter
+    from services.agentic_search_service import AgenticSearchService
+    from services.apollo_phone_enrichment import ApolloPhoneEnrichment
+    from services.job_enrichment_service import JobEnrichmentService
+
+    dataset = app.state.dataset
+    common = {
+        'api_key': 'benchmark',
+        'rate_limiter': get_apollo_rate_limiter(args.apollo_rpm),
+        'cache': ApolloResponseCache(db_path=str(tmp / f'cache_{name}.db')),
+        'usage': ApolloUsageLedger(manager),
+        'base_url': base_url,
+    }
+    app.state.stats.clear()
+
+    with usage_scope(f'benchmark:{name}') as scope:
+        start = time.perf_counter()
+
+        if name.startswith('phones'):
+            service = ApolloPhoneEnrichment(**common)
+            contacts = sample_contacts(dataset, args.contacts)
+            if name == 'phones_single':
+                results = [service.enrich_contact_phone(c) for c in contacts]
+            else:
+                results = service.enrich_contacts_batch(contacts)['results']
+            found = sum(1 for r in results if r.get('phone'))
+
+        elif name.startswith('companies'):
+            # The two variants enrich different companies so one doesn't dedupe the other's contacts
+            offset = 0 if name == 'companies' else args.companies
+            session = manager.get_session()
+            try:
+                companies = session.query(Company).order_by(Company.id).offset(offset).limit(args.companies).all()
+                service = JobEnrichmentService(
+                    ApolloClient(**common), None, manager,
+                    AsyncApolloClient(**common, max_concurrency=args.concurrency)
+                )
+                if name == 'companies':
+                    saved = service.enrich_companies_with_apollo(session, companies)
+                else:
+                    saved = asyncio.run(service.enrich_companies_with_apollo_async(session, companies))
+                found = len(saved)
+            finally:
+                session.close()
+
+        else:
+            os.environ.setdefault('ANTHROPIC_API_KEY', 'benchmark')
+            service = AgenticSearchService(ApolloClient(**common), manager)
+            service._generate_search_queries = lambda *a: [dict(q) for q in AGENTIC_QUERIES]
+            service._learn_and_expand = lambda *a: [dict(q) for q in AGENTIC_EXPANSIONS]
+            service._refine_failed_search = lambda *a: [dict(q) for q in AGENTIC_REFINEMENTS]
+            result = service.run_agentic_search(
+                'engineering leaders at data companies',
+                max_iterations=args.iterations,
+                min_results=args.min_results,
+                max_results_per_query=100,
+                max_credits=args.max_credits
+            )
+            found = result['stats']['total_contacts']
+
+        seconds = time.perf_counter() - start
+
+    counts = request_counts(app)
+    return {
+        'seconds': seconds,
+        'requests': sum(v for k, v in counts.items() if k not in ('429', '5xx')),
+        '429': counts.get('429', 0),
+        '5xx': counts.get('5xx', 0),
+        'credits': scope.spent,
+        'found': found,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workflows', default=','.join(WORKFLOWS), help='Comma-separated workflows to run')
+    parser.add_argument('--contacts', type=int, default=500, help='Contacts to phone-enrich')
+    parser.add_argument('--companies', type=int, default=100, help='Companies to find contacts at')
+    parser.add_argument('--concurrency', type=int, default=10, help='AsyncApolloClient max_concurrency')
+    parser.add_argument('--iterations', type=int, default=6, help='run_agentic_search max_iterations')
+    parser.add_argument('--min-results', type=int, default=400, help='run_agentic_search min_results')
+    parser.add_argument('--max-credits', type=int, help='run_agentic_search credit cap')
+    parser.add_argument('--apollo-rpm', type=int, default=100000, help='Client-side Apollo requests/minute per bucket')
+    parser.add_argument('--people', type=int, default=20000, help='People in the stub dataset')
+    parser.add_argument('--organizations', type=int, default=2000, help='Organizations in the stub dataset')
+    parser.add_argument('--latency-ms', type=float, default=80.0)
+    parser.add_argument('--rate-429', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    workflows = [w.strip() for w in args.workflows.split(',') if w.strip()]
+    unknown = set(workflows) - set(WORKFLOWS)
+    if unknown:
+        parser.error(f"unknown workflows: {', '.join(sorted(unknown))}")
+
+    tmp = Path(tempfile.mkdtemp(prefix='apollo_bench_'))
+    os.environ['RATE_LIMIT_DB_PATH'] = str(tmp / 'rate_limits.db')
+    os.environ['APOLLO_CACHE_DB_PATH'] = str(tmp / 'apollo_cache.db')
+
+    from loguru import logger
+    from database import db_manager as db_module
+    from database.db_manager import DatabaseManager
+
+    logger.remove()
+    logging.disable(logging.INFO)
+
+    # Usage rows and saved contacts go to a throwaway database, never the app's
+    manager = DatabaseManager(f"sqlite:///{tmp / 'bench.db'}")
+    db_module.db_manager = manager
+
+    app, server, base_url = start_stub(StubConfig(
+        seed=args.seed, people=args.people, organizations=args.organizations,
+        latency_ms=args.latency_ms, rate_429=args.rate_429, error_rate=args.error_rate
+    ))
+    seed_companies(manager, app.state.dataset, args.companies)
+
+    print(f"Apollo stub at {base_url}: {args.people} people, {args.organizations} organizations, "
+          f"{args.latency_ms:.0f} ms latency, {args.rate_429:.0%} 429s, {args.error_rate:.0%} errors\n")
+    print(f"{'workflow':16s} {'seconds':>8s} {'requests':>9s} {'429':>5s} {'5xx':>5s} {'credits':>8s} {'found':>6s}")
+    try:
+        for name in workflows:
+            r = run_workflow(name, args, app, base_url, manager, tmp)
+            print(f"{name:16s} {r['seconds']:8.2f} {r['requests']:9d} {r['429']:5d} {r['5xx']:5d} "
+                  f"{r['credits']:8d} {r['found']:6d}")
+    finally:
+        server.should_exit = True
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,260 @@
+"""
+Database concurrency benchmark
+
+Serves the API with uvicorn on a throwaway SQLite database and drives
+GET /api/contacts and GET /api/companies from concurrent async clients (in a
+separate process) while CompanyEnrichmentService.enrich_all_companies writes
+from a background thread of the server process.
+
+Modes:
+    static - legacy single shared connection (StaticPool), sync reads
+    wal    - WAL reader pool + serialized writer, sync reads on the event loop
+    async  - WAL, with read endpoints on the aiosqlite async engine
+
+The Claude call inside enrich_company is replaced by a fixed sleep so the
+benchmark runs offline and only measures database contention.
+
+Usage:
+    python benchmarks/db_concurrency.py --contacts 20000 --companies 200 --readers 8
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from database import db_manager as db_module
+from database.db_manager import DatabaseManager
+from database.models import Company, Contact
+
+
+OUR_PROFILE = {
+    'company_name': 'Benchmark Co',
+    'description': 'Benchmark profile',
+    'products_services': [],
+    'value_propositions': [],
+    'use_cases': []
+}
+
+FAKE_ENRICHMENT = {
+    'industry_analysis': 'Benchmark analysis ' * 20,
+    'pain_points': ['pain 1', 'pain 2', 'pain 3'],
+    'value_proposition': 'Benchmark value proposition ' * 10,
+    'enrichment_notes': 'Benchmark notes ' * 20,
+    'outreach_angle': 'efficiency',
+    'talking_points': ['point 1', 'point 2', 'point 3']
+}
+
+
+def seed_database(database_url: str, num_contacts: int, num_companies: int):
+    """Create companies and contacts to read and enrich"""
+    manager = DatabaseManager(database_url, wal_mode=False)
+    session = manager.get_session()
+    try:
+        session.bulk_insert_mappings(Company, [
+            {'name': f'Company {i}', 'industry': 'Software', 'source': 'benchmark'}
+            for i in range(num_companies)
+        ])
+        session.bulk_insert_mappings(Contact, [
+            {
+                'name': f'Contact {i}',
+                'email': f'contact{i}@example.com',
+                'title': 'CTO' if i % 3 == 0 else 'VP Engineering',
+                'company_id': (i % num_companies) + 1,
+                'company_name': f'Company {i % num_companies}',
+                'tags': ['role:cto', 'industry:software'],
+                'source': 'benchmark'
+            }
+            for i in range(num_contacts)
+        ])
+        session.commit()
+    finally:
+        session.close()
+        manager.engine.dispose()
+
+
+def start_server(app):
+    """Run the app with uvicorn in a background thread; returns (server, thread, base_url)"""
+    import uvicorn
+
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=port, log_level='error'))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, thread, f'http://127.0.0.1:{port}'
+
+
+async def run_readers(base_url: str, stop, readers: int, page_size: int, think_time: float) -> tuple:
+    """Concurrent clients alternating between the contacts page and the companies list"""
+    import httpx
+
+    requests_by_reader = [
+        ('/api/contacts', {'limit': page_size}),
+        ('/api/companies', {}),
+    ]
+    latencies = {path: [] for path, _ in requests_by_reader}
+    errors = []
+
+    async def reader(client, path, params):
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                response = await client.get(path, params=params)
+                ok = response.status_code == 200
+            except Exception as e:
+                ok = False
+                response = e
+            elapsed = time.perf_counter() - started
+            if ok:
+                latencies[path].append(elapsed)
+            else:
+                errors.append(str(response))
+            await asyncio.sleep(think_time)
+
+    limits = httpx.Limits(max_connections=readers)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        await asyncio.gather(*[
+            reader(client, *requests_by_reader[i % len(requests_by_reader)])
+            for i in range(readers)
+        ])
+    return latencies, errors
+
+
+def reader_process(base_url: str, stop, results, readers: int, page_size: int, think_time: float):
+    """Client side runs in its own process so it doesn't compete with the server for the GIL"""
+    results.put(asyncio.run(run_readers(base_url, stop, readers, page_size, think_time)))
+
+
+def run_mode(database_url: str, mode: str, args) -> dict:
+    """Run readers against the enrichment writer and collect latencies"""
+    from services.company_enrichment_service import CompanyEnrichmentService
+
+    manager = DatabaseManager(database_url, wal_mode=(mode != 'static'),
+                              read_pool_size=args.readers, async_mode=(mode == 'async'))
+
+    # Point the API (and anything calling get_db_manager) at the benchmark database
+    db_module.db_manager = manager
+    from crm_integration import chat_api
+    chat_api.db_manager = manager
+
+    enrichment_service = CompanyEnrichmentService(anthropic_api_key='benchmark')
+
+    def fake_enrich_company(company_data, our_profile):
+        time.sleep(args.claude_latency)
+        return dict(FAKE_ENRICHMENT)
+
+    enrichment_service.enrich_company = fake_enrich_company
+
+    server, server_thread, base_url = start_server(chat_api.app)
+    stop = multiprocessing.Event()
+    writer_result = {}
+
+    def writer():
+        session = manager.get_session()
+        started = time.perf_counter()
+        try:
+            writer_result.update(enrichment_service.enrich_all_companies(session, OUR_PROFILE))
+        finally:
+            session.close()
+            writer_result['elapsed'] = time.perf_counter() - started
+            stop.set()
+
+    client_results = multiprocessing.Queue()
+    client = multiprocessing.Process(
+        target=reader_process, args=(base_url, stop, client_results, args.readers, args.page_size, args.think_time)
+    )
+    client.start()
+    writer_thread = threading.Thread(target=writer, daemon=True)
+    writer_thread.start()
+    writer_thread.join()
+    latencies, errors = client_results.get()
+    client.join()
+
+    server.should_exit = True
+    server_thread.join()
+    manager.engine.dispose()
+    if manager.read_engine is not manager.engine:
+        manager.read_engine.dispose()
+
+    def percentile(values, p):
+        if not values:
+            return float('nan')
+        return values[min(len(values) - 1, int(len(values) * p))] * 1000
+
+    results = []
+    for path, values in latencies.items():
+        values.sort()
+        results.append({
+            'mode': mode,
+            'endpoint': path,
+            'reads': len(values),
+            'reads_per_sec': len(values) / writer_result['elapsed'] if writer_result.get('elapsed') else 0,
+            'p50_ms': percentile(values, 0.50),
+            'p95_ms': percentile(values, 0.95),
+            'p99_ms': percentile(values, 0.99),
+            'mean_ms': statistics.mean(values) * 1000 if values else float('nan'),
+        })
+    summary = {
+        'mode': mode,
+        'read_errors': len(errors),
+        'companies_enriched': writer_result.get('success', 0),
+        'writer_seconds': writer_result.get('elapsed', 0)
+    }
+    return results, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--contacts', type=int, default=20000)
+    parser.add_argument('--companies', type=int, default=200)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--think-time', type=float, default=0.1,
+                        help='Seconds each client waits between requests')
+    parser.add_argument('--claude-latency', type=float, default=0.01,
+                        help='Simulated seconds per Claude enrichment call')
+    parser.add_argument('--modes', default='static,wal,async', help='Comma-separated: static, wal, async')
+    args = parser.parse_args()
+
+    import logging
+    from loguru import logger
+    logging.disable(logging.INFO)
+    logger.remove()
+
+    results = []
+    summaries = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for mode in args.modes.split(','):
+            db_path = os.path.join(tmp_dir, f'bench_{mode}.db')
+            database_url = f'sqlite:///{db_path}'
+            seed_database(database_url, args.contacts, args.companies)
+            mode_results, summary = run_mode(database_url, mode, args)
+            results.extend(mode_results)
+            summaries.append(summary)
+
+    print(f"\n{'mode':<8}{'endpoint':<16}{'reads':>8}{'reads/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for r in results:
+        print(f"{r['mode']:<8}{r['endpoint']:<16}{r['reads']:>8}{r['reads_per_sec']:>10.1f}"
+              f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}")
+
+    print(f"\n{'mode':<8}{'errors':>8}{'enriched':>10}{'writer s':>10}")
+    for s in summaries:
+        print(f"{s['mode']:<8}{s['read_errors']:>8}{s['companies_enriched']:>10}{s['writer_seconds']:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""
+HTML parsing benchmark
+
+Runs the scrapers' extractors over the saved page corpus in
+benchmarks/fixtures/html and reports pages parsed per second for each
+installed parser backend (scrapers/html_parsing.py).
+
+Pages:
+    linkedin_job_search*   - linkedin_scrape.parse_job_ids
+    linkedin_job_detail*   - linkedin_scrape.parse_job_detail
+    linkedin_profile*      - LinkedInScraper.parse_profile
+    website*               - CompanyProfileService.extract_page_text
+
+Modes:
+    legacy       - the previous behaviour: every page fully parsed with html.parser
+    html.parser  - html.parser, parsing only the elements the extractors read
+    lxml         - lxml tree builder, same partial parsing (if lxml is installed)
+    selectolax   - lexbor extractors for job pages, lxml for the rest (if selectolax is installed)
+
+Every backend must extract exactly what legacy does from every page; the
+benchmark fails if anything differs. Pass --check to run just that comparison.
+
+Usage:
+    python benchmarks/html_parsing.py --rounds 20
+    python benchmarks/html_parsing.py --pages path/to/saved/pages --check
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from bs4 import BeautifulSoup
+from loguru import logger
+
+from linkedin_scrape import job_detail_from_soup, job_ids_from_soup, parse_job_detail, parse_job_ids
+from scrapers.html_parsing import available_backends
+from scrapers.linkedin_scraper import LinkedInScraper
+from services.company_profile_service import CompanyProfileService
+
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'html'
+
+profile_scraper = LinkedInScraper()
+
+
+def legacy_website_text(html: str) -> str:
+    """CompanyProfileService.scrape_website's text extraction before the parser layer"""
+    soup = BeautifulSoup(html, 'html.parser')
+    for script in soup(["script", "style", "nav", "footer"]):
+        script.decompose()
+    text = soup.get_text()
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return ' '.join(chunk for chunk in chunks if chunk)[:10000]
+
+
+def legacy_profile(html: str) -> Dict[str, Any]:
+    soup = BeautifulSoup(html, 'html.parser')
+    return {
+        'company': profile_scraper._extract_company_name(soup),
+        'title': profile_scraper._extract_title(soup)
+    }
+
+
+def extractors(backend: str) -> List[Tuple[str, Callable[[str, str], Any]]]:
+    """(file name prefix, extract(name, html)) for a mode"""
+    if backend == 'legacy':
+        return [
+            ('linkedin_job_search', lambda name, html: job_ids_from_soup(BeautifulSoup(html, 'html.parser'))),
+            ('linkedin_job_detail', lambda name, html: job_detail_from_soup(name, BeautifulSoup(html, 'html.parser'))),
+            ('linkedin_profile', lambda name, html: legacy_profile(html)),
+            ('website', lambda name, html: legacy_website_text(html)),
+        ]
+    return [
+        ('linkedin_job_search', lambda name, html: parse_job_ids(html, backend)),
+        ('linkedin_job_detail', lambda name, html: parse_job_detail(name, html, backend)),
+        ('linkedin_profile', lambda name, html: profile_scraper.parse_profile(html, backend)),
+        ('website', lambda name, html: CompanyProfileService.extract_page_text(html, backend)),
+    ]
+
+
+def load_pages(directory: Path) -> Dict[str, str]:
+    pages = {path.stem: path.read_text(encoding='utf-8') for path in sorted(directory.glob('*.html'))}
+    if not pages:
+        sys.exit(f"❌ No .html pages in {directory}")
+    return pages
+
+
+def extract_all(backend: str, pages: Dict[str, str]) -> Dict[str, Any]:
+    results = {}
+    for prefix, extract in extractors(backend):
+        for name, html in pages.items():
+            if name.startswith(prefix):
+                results[name] = extract(name, html)
+    return results
+
+
+def run_mode(backend: str, pages: Dict[str, str], rounds: int) -> Dict[str, Any]:
+    """Extract from every page `rounds` times; best round wins"""
+    timings = []
+    results = {}
+    for _ in range(rounds):
+        start = time.perf_counter()
+        results = extract_all(backend, pages)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    return {'results': results, 'seconds': best, 'per_second': len(results) / best}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', default=str(FIXTURES), help='Directory of saved .html pages')
+    parser.add_argument('--rounds', type=int, default=10)
+    parser.add_argument('--check', action='store_true', help='Only check every backend matches legacy')
+    args = parser.parse_args()
+
+    pages = load_pages(Path(args.pages))
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+
+    modes = ['legacy'] + list(reversed(available_backends()))
+    rounds = 1 if args.check else args.rounds
+    size = sum(len(html) for html in pages.values())
+    print(f"Parsing {len(pages)} pages ({size / 1024:.0f} KB), best of {rounds} rounds\n")
+    results = {mode: run_mode(mode, pages, rounds) for mode in modes}
+
+    baseline = results['legacy']
+    if not args.check:
+        for mode, result in results.items():
+            print(f"{mode:12s} {result['seconds'] * 1000:8.1f} ms  {result['per_second']:8,.0f} pages/s  "
+                  f"{baseline['seconds'] / result['seconds']:5.2f}x")
+        print()
+
+    for mode in modes[1:]:
+        for name, expected in baseline['results'].items():
+            if results[mode]['results'].get(name) != expected:
+                sys.exit(f"❌ {mode} differs from legacy on {name}:\n"
+                         f"   legacy: {expected!r}\n   {mode}: {results[mode]['results'].get(name)!r}")
+    print(f"✅ Extraction identical across {', '.join(modes)} ({len(baseline['results'])} pages)")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,15 +3,17 @@ Chat-based CRM API
 Conversational interface for scraping and populating Twenty CRM
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks, UploadFile, File
+from fastapi import FastAPI, HTTPException, BackgroundTasks, UploadFile, File, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, AsyncIterator
+from sqlalchemy import select, func, case
+from sqlalchemy.ext.asyncio import AsyncSession
 import json
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 import sys
 import os
 import asyncio
@@ -27,12 +29,18 @@ load_dotenv()
 sys.path.append(str(Path(__file__).parent.parent))
 
 from scrapers.schemas import Contact
-from scrapers.apollo_scraper import ApolloClient
+from scrapers.apollo_scraper import ApolloClient, AsyncApolloClient, coalesced_request_counts
+from scrapers.apollo_retry import breaker, retry_metrics
+from scrapers.apollo_cache import get_apollo_cache
+from scrapers.apollo_usage import get_usage_ledger, default_request_budget
+from scrapers.html_cache import get_html_cache
+from scrapers.adaptive_rate import get_linkedin_rate_controller
 # Removed Twenty CRM sync - we have our own CRM now!
 # from crm_integration.twenty_sync import TwentyCRMSync, sync_apollo_to_twenty
 from ai_agent.intent_parser import IntentParser, ScraperOrchestrator
 from cli.search_mock import load_mock_contacts, filter_contacts
-from database.db_manager import get_db_manager
+from database.db_manager import get_db_manager, normalize_tags, release_connection
+from database.search_index import SearchUnavailable
 from services.job_enrichment_service import JobEnrichmentService
 from services.agentic_search_service import AgenticSearchService
 from services.company_profile_service import CompanyProfileService
@@ -81,11 +89,13 @@ agentic_search = None
 company_profile_service = None
 company_enrichment_service = None
 apollo_company_enrichment = None
+apollo_async = None
 
 if has_claude and os.getenv("APOLLO_API_KEY"):
     try:
         apollo_scraper = ApolloClient()
-        job_enrichment = JobEnrichmentService(apollo_scraper, intent_parser, db_manager)
+        apollo_async = AsyncApolloClient()
+        job_enrichment = JobEnrichmentService(apollo_scraper, intent_parser, db_manager, apollo_async)
         agentic_search = AgenticSearchService(apollo_scraper, db_manager)
         company_profile_service = CompanyProfileService(os.getenv("ANTHROPIC_API_KEY"))
         company_enrichment_service = CompanyEnrichmentService(os.getenv("ANTHROPIC_API_KEY"))
@@ -102,6 +112,14 @@ if has_claude and os.getenv("APOLLO_API_KEY"):
     except Exception as e:
         logger.warning(f"⚠️  Services not available: {e}")
 
+
+
+async def get_async_read_session() -> AsyncIterator[AsyncSession]:
+    """FastAPI dependency: one non-blocking read session per request, closed afterwards"""
+    async with db_manager.get_async_read_session() as session:
+        yield session
+
+
 # Storage
 chat_history: List[Dict[str, Any]] = []
 contacts_db: List[Contact] = []
@@ -128,12 +146,45 @@ class ChatResponse(BaseModel):
 
 
 class ContactsResponse(BaseModel):
-    """Contacts list response"""
-    contacts: List[Contact]
+    """Contacts list response (one keyset page)"""
+    contacts: List[Dict[str, Any]]
     total: int
+    next_cursor: Optional[str] = None
     timestamp: datetime
 
 
+# API field name -> contacts column (None = not stored, served as a constant)
+CONTACT_FIELDS = {
+    'id': 'id',
+    'name': 'name',
+    'title': 'title',
+    'company': 'company_name',
+    'email': 'email',
+    'linkedin_url': 'linkedin_url',
+    'phone': 'phone',
+    'tags': 'tags',
+    'source': 'source',
+    'relationship_stage': None,
+    'created_at': 'created_at',
+    'last_updated': 'updated_at',
+    'apollo_id': 'apollo_id',
+    'city': 'city',
+    'state': 'state',
+    'country': 'country',
+    'headline': None,
+    'photo_url': None,
+    'twitter_url': None,
+    'facebook_url': None,
+    'workflow_stage': 'workflow_stage',
+    'last_action': 'last_action',
+    'last_action_date': 'last_action_date',
+    'next_action': 'next_action',
+    'next_action_date': 'next_action_date',
+    'automation_notes': 'automation_notes',
+}
+CONTACT_FIELD_DEFAULTS = {'source': 'apollo.io', 'relationship_stage': 'new_lead'}
+
+
 # Endpoints
 @app.get("/")
 async def root():
@@ -452,14 +503,19 @@ The companies have been scored based on their fit for your product. Check the da
                         logger.info(f"🔍 {len(contacts_without_company)} contacts missing company names - enriching from LinkedIn (first 5)...")
                         linkedin_scraper = get_linkedin_scraper()
 
-                        for contact in contacts_without_company[:5]:  # Limit to 5 to avoid rate limiting
-                            try:
-                                linkedin_data = linkedin_scraper.extract_company_from_profile(contact.linkedin_url)
-                                if linkedin_data and linkedin_data.get('company'):
-                                    contact.company = linkedin_data['company']
-                                    logger.info(f"  ✅ Enriched {contact.name}: {linkedin_data['company']}")
-                            except Exception as e:
-                                logger.warning(f"  ⚠️  Failed to enrich {contact.name}: {e}")
+                        # Off the event loop; the scraper paces itself to LinkedIn's current rate
+                        to_enrich = contacts_without_company[:5]  # Limit to 5 to avoid rate limiting
+                        profiles = await asyncio.gather(*[
+                            asyncio.to_thread(linkedin_scraper.extract_company_from_profile, contact.linkedin_url)
+                            for contact in to_enrich
+                        ], return_exceptions=True)
+
+                        for contact, linkedin_data in zip(to_enrich, profiles):
+                            if isinstance(linkedin_data, Exception):
+                                logger.warning(f"  ⚠️  Failed to enrich {contact.name}: {linkedin_data}")
+                            elif linkedin_data and linkedin_data.get('company'):
+                                contact.company = linkedin_data['company']
+                                logger.info(f"  ✅ Enriched {contact.name}: {linkedin_data['company']}")
 
                     using_apollo = True
                     logger.info(f"✅ Agentic search found {len(results)} contacts")
@@ -515,6 +571,7 @@ The AI iteratively refined searches to find the best matches for your query."""
 
             try:
                 logger.info(f"📝 Processing {len(results)} contacts for database insertion...")
+                rows = []
                 for i, contact in enumerate(results, 1):
                     # Debug: Log contact details with tags
                     tags_str = ", ".join(contact.tags) if contact.tags else "no tags"
@@ -537,34 +594,25 @@ The AI iteratively refined searches to find the best matches for your query."""
                         continue
 
                     # Generate source reason with tags
-                    tags_str = ", ".join(contact.tags) if contact.tags else "no tags"
                     source_reason = f"Found via AI search. Tags: {tags_str}"
 
-                    # Save to database (get_or_create handles deduplication)
-                    db_contact, created = db_manager.get_or_create_contact(
-                        session,
-                        email=email_to_save,
-                        linkedin_url=contact.linkedin_url,
-                        name=contact.name,
-                        title=contact.title,
-                        company_name=contact.company,
-                        phone=contact.phone,
-                        city=contact.city,
-                        state=contact.state,
-                        country=contact.country,
-                        source='apollo',
-                        tags=contact.tags,
-                        source_reason=source_reason,
-                        search_query=message.message[:500],  # Store the user's search query
-                        workflow_stage='new',  # Set initial workflow stage
-                        next_action='Send connection request'  # Set initial next action
-                    )
-
-                    if created:
-                        contacts_added += 1
-                        logger.info(f"  ✅ Added: {contact.name} at {contact.company or 'Unknown'} ({email_to_save or contact.linkedin_url})")
-                    else:
-                        logger.info(f"  ⏭️  Skipped (duplicate): {contact.name} - already in database")
+                    rows.append({
+                        'email': email_to_save,
+                        'linkedin_url': contact.linkedin_url,
+                        'name': contact.name,
+                        'title': contact.title,
+                        'company_name': contact.company,
+                        'phone': contact.phone,
+                        'city': contact.city,
+                        'state': contact.state,
+                        'country': contact.country,
+                        'source': 'apollo',
+                        'tags': contact.tags,
+                        'source_reason': source_reason,
+                        'search_query': message.message[:500],  # Store the user's search query
+                        'workflow_stage': 'new',  # Set initial workflow stage
+                        'next_action': 'Send connection request'  # Set initial next action
+                    })
 
                     # Also add to in-memory list for backward compatibility
                     exists = any(
@@ -575,6 +623,11 @@ The AI iteratively refined searches to find the best matches for your query."""
                     if not exists:
                         contacts_db.append(contact)
 
+                # Save to database in one batch (bulk upsert handles deduplication)
+                upsert_result = db_manager.bulk_upsert_contacts(session, rows)
+                contacts_added = upsert_result['created']
+                logger.info(f"  ⏭️  {upsert_result['updated']} duplicates already in database")
+
                 session.commit()
                 logger.info(f"💾 Added {contacts_added} new contacts to database")
 
@@ -666,94 +719,165 @@ async def _simple_chat_handler(message: ChatMessage) -> ChatResponse:
 
 @app.get("/api/contacts", response_model=ContactsResponse)
 async def get_contacts(
-    limit: int = 1000,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: str = "id",
+    fields: Optional[str] = None,
     tags: Optional[str] = None,
-    title: Optional[str] = None
+    tag_match: str = "all",
+    title: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_read_session)
 ):
     """
-    Get all contacts from CRM database.
+    Get one page of contacts from the CRM database.
 
     Query params:
-    - limit: Maximum number of contacts to return (default: 1000)
-    - tags: Filter by tags (comma-separated) - NOT IMPLEMENTED YET
+    - limit: Page size (default: 100, max 1000)
+    - cursor: next_cursor from the previous page
+    - sort: "id" (oldest first, default) or "updated_at" (most recently updated first)
+    - fields: Comma-separated fields to return (e.g. id,name,email,company); default all
+    - tags: Filter by tags (comma-separated, e.g. role:cto,industry:saas)
+    - tag_match: "all" = contact has every tag (AND), "any" = at least one (OR)
     - title: Filter by job title
     """
-    session = db_manager.get_session()
+    if tag_match not in ("all", "any"):
+        raise HTTPException(status_code=400, detail="tag_match must be 'all' or 'any'")
+    if sort not in ("id", "updated_at"):
+        raise HTTPException(status_code=400, detail="sort must be 'id' or 'updated_at'")
+    limit = max(1, min(limit, 1000))
+
+    if fields:
+        requested = list(dict.fromkeys(f.strip() for f in fields.split(',') if f.strip()))
+        unknown = [f for f in requested if f not in CONTACT_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        if 'id' not in requested:
+            requested.insert(0, 'id')
+    else:
+        requested = list(CONTACT_FIELDS)
+
+    tag_list = [t.strip() for t in tags.split(',') if t.strip()] if tags else []
 
     try:
-        # Get contacts from database
         from database.models import Contact as DBContact
-        query = session.query(DBContact)
+
+        # Select only the columns behind the requested fields (+ the sort key)
+        column_names = {CONTACT_FIELDS[f] for f in requested if CONTACT_FIELDS[f]}
+        column_names.update({'id', 'updated_at'} if sort == 'updated_at' else {'id'})
+        columns = [getattr(DBContact, name) for name in sorted(column_names)]
+        stmt = select(*columns)
+
+        # Apply tag filter through the indexed contact_tags table
+        if tag_list:
+            stmt = db_manager.filter_by_tags(stmt, DBContact, tag_list, match_all=(tag_match == "all"))
 
         # Apply title filter if provided
         if title:
-            query = query.filter(DBContact.title.ilike(f'%{title}%'))
+            stmt = stmt.where(DBContact.title.ilike(f'%{title}%'))
 
-        # Get results with limit
-        db_contacts = query.limit(limit).all()
+        try:
+            rows, next_cursor = await db_manager.keyset_paginate_async(
+                session, stmt, DBContact, limit, cursor=cursor, sort=sort
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
-        # Convert database models to Contact schema
-        results = []
-        for db_contact in db_contacts:
-            # Handle email validation - Contact schema requires valid email or None
-            email_value = db_contact.email if db_contact.email else None
+        filter_key = None
+        if tag_list or title:
+            filter_key = (tuple(sorted(t.lower() for t in tag_list)), tag_match, (title or '').lower())
+        total = await db_manager.cached_count_async(session, stmt, DBContact.__tablename__, filter_key)
 
-            # Parse tags from JSON if available
-            tags = db_contact.tags if db_contact.tags else []
-            if isinstance(tags, str):
-                import json
-                try:
-                    tags = json.loads(tags)
-                except:
-                    tags = []
+        # Plain dicts - no per-row pydantic/EmailStr validation
+        results = []
+        for row in rows:
+            values = row._mapping
+            contact = {}
+            for field in requested:
+                column = CONTACT_FIELDS[field]
+                value = values[column] if column else None
+                if field == 'id':
+                    value = str(value)
+                elif field == 'tags':
+                    value = normalize_tags(value)
+                else:
+                    value = value or CONTACT_FIELD_DEFAULTS.get(field)
+                contact[field] = value
+            results.append(contact)
 
-            results.append(Contact(
-                id=str(db_contact.id),  # Include the database ID!
-                name=db_contact.name,
-                email=email_value,
-                title=db_contact.title or None,
-                company=db_contact.company_name or None,
-                linkedin_url=db_contact.linkedin_url or None,
-                phone=db_contact.phone or None,
-                city=db_contact.city or None,
-                state=db_contact.state or None,
-                country=db_contact.country or None,
-                tags=tags,
-                source=db_contact.source or "apollo.io",
-                relationship_stage="new_lead",  # Default value since DB doesn't have this field
-                workflow_stage=db_contact.workflow_stage or None,
-                last_action=db_contact.last_action or None,
-                last_action_date=db_contact.last_action_date or None,
-                next_action=db_contact.next_action or None,
-                next_action_date=db_contact.next_action_date or None,
-                automation_notes=db_contact.automation_notes or None,
-                created_at=db_contact.created_at,
-                last_updated=db_contact.updated_at  # DB uses 'updated_at' not 'last_updated'
-            ))
-
-        logger.info(f"📊 Retrieved {len(results)} contacts from database")
+        logger.info(f"📊 Retrieved {len(results)} of {total} contacts from database")
 
         return ContactsResponse(
             contacts=results,
-            total=len(results),
+            total=total,
+            next_cursor=next_cursor,
             timestamp=datetime.now()
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving contacts from database: {e}")
         # Fallback to in-memory list
         filtered = contacts_db.copy()
 
+        if tag_list:
+            wanted = {t.lower() for t in tag_list}
+            check = all if tag_match == "all" else any
+            filtered = [c for c in filtered if check(t in {ct.lower() for ct in c.tags} for t in wanted)]
+
         if title:
             filtered = [c for c in filtered if c.title and title.lower() in c.title.lower()]
 
-        results = filtered[:limit]
+        results = [c.model_dump(include=set(requested)) for c in filtered[:limit]]
 
         return ContactsResponse(
             contacts=results,
-            total=len(results),
+            total=len(filtered),
             timestamp=datetime.now()
         )
+
+
+@app.get("/api/search")
+async def search(
+    q: str,
+    limit: int = 20,
+    offset: int = 0,
+    types: Optional[str] = None
+):
+    """
+    Full-text search across contacts, companies and job postings.
+
+    Query params:
+    - q: Search text (all words must match, last word is prefix-matched)
+    - limit: Page size (default: 20, max 100)
+    - offset: Number of hits to skip
+    - types: Comma-separated subset of contact,company,job_posting (default: all)
+    """
+    limit = max(1, min(limit, 100))
+    offset = max(0, offset)
+    entity_types = [t.strip() for t in types.split(',') if t.strip()] if types else None
+
+    session = db_manager.get_read_session()
+
+    try:
+        result = db_manager.search(session, q, limit=limit, offset=offset, entity_types=entity_types)
+
+        return {
+            'query': q,
+            'hits': result['hits'],
+            'limit': limit,
+            'offset': offset,
+            'has_more': result['has_more'],
+            'timestamp': datetime.now().isoformat()
+        }
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except SearchUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error searching: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
     finally:
         session.close()
 
@@ -776,9 +900,7 @@ async def create_contact_manually(contact_data: Dict[str, Any]):
         if isinstance(tags, str):
             tags = [t.strip() for t in tags.split(',') if t.strip()]
 
-        # Convert tags list to JSON string for SQLite
-        import json
-        contact_data['tags'] = json.dumps(tags) if tags else None
+        contact_data['tags'] = tags or None
 
         # Create contact
         db_contact, created = db_manager.get_or_create_contact(
@@ -821,8 +943,7 @@ async def update_contact(contact_id: int, contact_data: Dict[str, Any]):
             tags = contact_data.pop('tags')
             if isinstance(tags, str):
                 tags = [t.strip() for t in tags.split(',') if t.strip()]
-            import json
-            contact_data['tags'] = json.dumps(tags) if tags else None
+            contact_data['tags'] = tags or None
 
         # Update contact fields
         for key, value in contact_data.items():
@@ -923,7 +1044,7 @@ async def import_contacts_from_csv(file: UploadFile = File(...)):
         errors = []
 
         try:
-            from database.models import Contact as DBContact
+            rows = []
 
             for row_num, row in enumerate(csv_reader, start=2):  # Start at 2 (header is row 1)
                 try:
@@ -948,41 +1069,27 @@ async def import_contacts_from_csv(file: UploadFile = File(...)):
                         error_count += 1
                         continue
 
-                    # Handle tags - convert comma-separated string to JSON
+                    # Handle tags - convert comma-separated string to a list
                     if 'tags' in contact_data:
                         tags_str = contact_data['tags']
-                        tags_list = [t.strip() for t in tags_str.split(',') if t.strip()]
-                        contact_data['tags'] = json.dumps(tags_list)
+                        contact_data['tags'] = [t.strip() for t in tags_str.split(',') if t.strip()]
 
                     # Set source
                     contact_data['source'] = 'csv_import'
 
-                    # Check for duplicates (by email or linkedin_url)
-                    existing = None
-                    if 'email' in contact_data and contact_data['email']:
-                        existing = session.query(DBContact).filter(
-                            DBContact.email == contact_data['email']
-                        ).first()
-
-                    if not existing and 'linkedin_url' in contact_data and contact_data['linkedin_url']:
-                        existing = session.query(DBContact).filter(
-                            DBContact.linkedin_url == contact_data['linkedin_url']
-                        ).first()
-
-                    if existing:
-                        skipped_count += 1
-                        continue
-
-                    # Create new contact
-                    new_contact = DBContact(**contact_data)
-                    session.add(new_contact)
-                    imported_count += 1
+                    rows.append(contact_data)
 
                 except Exception as row_error:
                     error_count += 1
                     errors.append(f"Row {row_num}: {str(row_error)}")
                     logger.error(f"Error importing row {row_num}: {row_error}")
 
+            # Insert in one batch; rows matching an existing contact (by email or
+            # linkedin_url) are skipped, not merged
+            upsert_result = db_manager.bulk_upsert_contacts(session, rows, update_existing=False)
+            imported_count = upsert_result['created']
+            skipped_count = upsert_result['skipped']
+
             # Commit all changes
             session.commit()
 
@@ -1015,22 +1122,35 @@ async def clear_contacts():
 
 
 @app.get("/api/companies")
-async def get_companies():
-    """Get all companies from database"""
-    try:
-        db_manager = get_db_manager()
-        session = db_manager.get_session()
+async def get_companies(
+    tags: Optional[str] = None,
+    tag_match: str = "all",
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    """
+    Get all companies from database.
 
+    Query params:
+    - tags: Filter by tags (comma-separated, e.g. industry:software,size:small)
+    - tag_match: "all" = company has every tag (AND), "any" = at least one (OR)
+    """
+    try:
         # Get all companies with contact count
         from database.models import Company, Contact
-        from sqlalchemy import func
 
-        companies = session.query(
+        query = select(
             Company,
             func.count(Contact.id).label('contact_count')
         ).outerjoin(
             Contact, Company.id == Contact.company_id
-        ).group_by(Company.id).all()
+        )
+
+        # Apply tag filter through the indexed company_tags table
+        if tags:
+            tag_list = [t.strip() for t in tags.split(',') if t.strip()]
+            query = db_manager.filter_by_tags(query, Company, tag_list, match_all=(tag_match != "any"))
+
+        companies = (await session.execute(query.group_by(Company.id))).all()
 
         results = []
         for company, contact_count in companies:
@@ -1097,8 +1217,6 @@ async def get_companies():
     except Exception as e:
         logger.error(f"Error retrieving companies: {e}")
         return {'companies': [], 'total': 0}
-    finally:
-        session.close()
 
 
 @app.post("/api/companies/sync-contacts")
@@ -1109,12 +1227,17 @@ async def sync_contacts_for_companies():
             return {"error": "Job enrichment service not available", "contacts_added": 0, "companies_processed": 0}
 
         db_manager = get_db_manager()
-        session = db_manager.get_session()
 
         from database.models import Company
 
-        # Get all companies
-        companies = session.query(Company).all()
+        # Get all companies - no session stays open across the Apollo searches,
+        # so the single writer connection is free for other requests meanwhile
+        read_session = db_manager.get_read_session()
+        try:
+            companies = read_session.query(Company).all()
+            job_titles_by_company = job_enrichment.load_job_titles(read_session, companies)
+        finally:
+            read_session.close()
 
         if not companies:
             return {"message": "No companies found", "contacts_added": 0, "companies_processed": 0}
@@ -1122,14 +1245,25 @@ async def sync_contacts_for_companies():
         logger.info(f"🔄 Syncing contacts for {len(companies)} companies...")
 
         # Use the job enrichment service to find contacts
-        contacts = job_enrichment.enrich_companies_with_apollo(
-            session,
+        rows = await job_enrichment.search_company_contacts_async(
             companies,
+            job_titles_by_company,
             max_contacts_per_company=1  # Only 1 contact per company
         )
 
-        # Commit changes
-        session.commit()
+        def save_contacts():
+            session = db_manager.get_session()
+            try:
+                contacts = job_enrichment.save_contact_rows(session, rows)
+                session.commit()
+                return contacts
+            except Exception:
+                session.rollback()
+                raise
+            finally:
+                session.close()
+
+        contacts = await asyncio.to_thread(save_contacts)
 
         logger.info(f"✅ Synced {len(contacts)} contacts for {len(companies)} companies")
 
@@ -1141,22 +1275,16 @@ async def sync_contacts_for_companies():
 
     except Exception as e:
         logger.error(f"Error syncing contacts: {e}")
-        session.rollback()
         return {"error": str(e), "contacts_added": 0, "companies_processed": 0}
-    finally:
-        session.close()
 
 
 @app.get("/api/campaigns")
-async def get_campaigns():
+async def get_campaigns(session: AsyncSession = Depends(get_async_read_session)):
     """Get all campaigns from database"""
     try:
-        db_manager = get_db_manager()
-        session = db_manager.get_session()
-
         from database.models import Campaign
 
-        campaigns = session.query(Campaign).all()
+        campaigns = (await session.scalars(select(Campaign))).all()
 
         results = []
         for campaign in campaigns:
@@ -1181,39 +1309,171 @@ async def get_campaigns():
     except Exception as e:
         logger.error(f"Error retrieving campaigns: {e}")
         return {'campaigns': [], 'total': 0}
-    finally:
-        session.close()
 
 
 @app.get("/api/stats")
-async def get_stats():
-    """Get CRM statistics"""
-    total_contacts = len(contacts_db)
-    
-    # Count by tags
-    tags_count = {}
-    for contact in contacts_db:
-        for tag in contact.tags:
-            tags_count[tag] = tags_count.get(tag, 0) + 1
-    
-    # Count by title
-    titles_count = {}
-    for contact in contacts_db:
-        if contact.title:
-            titles_count[contact.title] = titles_count.get(contact.title, 0) + 1
-    
-    # Count by company
-    companies_count = {}
-    for contact in contacts_db:
-        if contact.company:
-            companies_count[contact.company] = companies_count.get(contact.company, 0) + 1
-    
+async def get_stats(session: AsyncSession = Depends(get_async_read_session)):
+    """Get CRM statistics from the crm_stats rollup (kept current on every contact write)"""
+    from database.models import CrmStat
+
+    async def top(dimension: str, limit: int) -> Dict[str, int]:
+        result = await session.execute(
+            select(CrmStat.value, CrmStat.count)
+            .where(CrmStat.dimension == dimension)
+            .order_by(CrmStat.count.desc())
+            .limit(limit)
+        )
+        return {value: count for value, count in result.all()}
+
+    total_contacts = await session.scalar(
+        select(CrmStat.count).where(CrmStat.dimension == 'total', CrmStat.value == '')
+    )
+
     return {
-        "total_contacts": total_contacts,
+        "total_contacts": total_contacts or 0,
         "total_chats": len(chat_history),
-        "tags": tags_count,
-        "titles": dict(sorted(titles_count.items(), key=lambda x: x[1], reverse=True)[:10]),
-        "companies": dict(sorted(companies_count.items(), key=lambda x: x[1], reverse=True)[:10]),
+        "tags": await top('tag', 50),
+        "titles": await top('title', 10),
+        "companies": await top('company', 10),
+        "workflow_stages": await top('workflow_stage', 20),
+        "sources": await top('source', 20),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@app.get("/api/apollo/metrics")
+async def get_apollo_metrics():
+    """Apollo response cache, coalesced duplicate requests, retries and circuit breaker (this process)"""
+    return {
+        "cache": get_apollo_cache().stats(),
+        "coalesced": coalesced_request_counts(),
+        **retry_metrics.to_dict(),
+        "circuit": breaker.stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@app.get("/api/scraper/metrics")
+async def get_scraper_metrics():
+    """Raw HTML cache for scraped job pages, LinkedIn profiles and websites, and LinkedIn request rates"""
+    return {
+        "html_cache": get_html_cache().stats(),
+        "linkedin_rate": get_linkedin_rate_controller().stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@app.get("/api/usage")
+async def get_api_usage(days: int = 1, session: AsyncSession = Depends(get_async_read_session)):
+    """
+    Apollo credit ledger for the last `days` UTC days (1 = today): credits,
+    requests, cache hits and latency by day, endpoint and caller, plus budgets.
+    """
+    from database.models import ApiUsage
+
+    if not 1 <= days <= 90:
+        raise HTTPException(status_code=400, detail="days must be between 1 and 90")
+
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    since = today - timedelta(days=days - 1)
+
+    async def grouped(column) -> Dict[str, Dict[str, Any]]:
+        result = await session.execute(
+            select(
+                column,
+                func.count(),
+                func.coalesce(func.sum(ApiUsage.credits), 0),
+                func.sum(case((ApiUsage.cache_hit, 1), else_=0)),
+                func.avg(case((ApiUsage.cache_hit == False, ApiUsage.latency_ms))),  # noqa: E712
+            )
+            .where(ApiUsage.created_at >= since)
+            .group_by(column)
+            .order_by(column)
+        )
+        return {
+            str(key): {
+                "requests": requests_ - cache_hits,
+                "cache_hits": cache_hits,
+                "credits": credits,
+                "avg_latency_ms": round(latency, 1) if latency is not None else None
+            }
+            for key, requests_, credits, cache_hits, latency in result.all()
+        }
+
+    by_day = await grouped(func.date(ApiUsage.created_at))
+    by_endpoint = await grouped(ApiUsage.endpoint)
+    by_caller = await grouped(func.coalesce(ApiUsage.caller, "unknown"))
+
+    credits = sum(row["credits"] for row in by_day.values())
+    requests_sent = sum(row["requests"] for row in by_day.values())
+    cache_hits = sum(row["cache_hits"] for row in by_day.values())
+    spent_today = by_day.get(today.date().isoformat(), {}).get("credits", 0)
+    ledger = get_usage_ledger()
+
+    return {
+        "days": days,
+        "since": since.isoformat(),
+        "credits": credits,
+        "requests": requests_sent,
+        "cache_hits": cache_hits,
+        "cache_hit_rate": cache_hits / (cache_hits + requests_sent) if cache_hits + requests_sent else 0.0,
+        "by_day": by_day,
+        "by_endpoint": by_endpoint,
+        "by_caller": by_caller,
+        "budget": {
+            "daily": ledger.daily_budget,
+            "spent_today": spent_today,
+            "remaining_today": max(0, ledger.daily_budget - spent_today) if ledger.daily_budget is not None else None,
+            "per_request": default_request_budget()
+        },
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+CHANGE_ENTITY_TYPES = ('contact', 'company', 'job_posting')
+
+
+@app.get("/api/changes")
+async def get_changes(
+    since: int = 0,
+    limit: int = 500,
+    entity_type: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    """
+    Change feed: contact/company/job posting writes with seq > since, oldest first.
+    Consumers store next_since and poll with it instead of re-reading whole tables.
+    """
+    from database.models import ChangeLog
+
+    if not 1 <= limit <= 5000:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 5000")
+    if entity_type and entity_type not in CHANGE_ENTITY_TYPES:
+        raise HTTPException(status_code=400, detail=f"entity_type must be one of {', '.join(CHANGE_ENTITY_TYPES)}")
+
+    stmt = select(ChangeLog).where(ChangeLog.seq > since)
+    if entity_type:
+        stmt = stmt.where(ChangeLog.entity_type == entity_type)
+    result = await session.scalars(stmt.order_by(ChangeLog.seq).limit(limit + 1))
+    changes = result.all()
+
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    return {
+        "changes": [
+            {
+                "seq": change.seq,
+                "entity_type": change.entity_type,
+                "entity_id": change.entity_id,
+                "operation": change.operation,
+                "changed_fields": change.changed_fields,
+                "created_at": change.created_at.isoformat() if change.created_at else None
+            }
+            for change in changes
+        ],
+        "next_since": changes[-1].seq if changes else since,
+        "has_more": has_more,
         "timestamp": datetime.now().isoformat()
     }
 
@@ -1264,7 +1524,7 @@ async def get_company_profile():
         if not company_profile_service:
             raise HTTPException(status_code=503, detail="Company profile service not available")
 
-        session = db_manager.get_session()
+        session = db_manager.get_read_session()
         try:
             profile = company_profile_service.get_profile_from_db(session)
             if not profile:
@@ -1401,7 +1661,8 @@ async def enrich_all_companies_with_apollo(data: Optional[Dict[str, Any]] = None
                 "message": f"Enriched {result['success']} companies with Apollo",
                 "total": result['total'],
                 "success": result['success'],
-                "failure": result['failure']
+                "failure": result['failure'],
+                "skipped": result['skipped']
             }
         finally:
             session.close()
@@ -1420,7 +1681,6 @@ async def update_company(company_id: int, data: Dict[str, Any]):
         session = db_manager.get_session()
         try:
             from database.models import Company
-            import json
 
             company = session.query(Company).filter(Company.id == company_id).first()
 
@@ -1429,7 +1689,7 @@ async def update_company(company_id: int, data: Dict[str, Any]):
 
             # Update allowed fields
             if 'tags' in data:
-                company.tags = json.dumps(data['tags']) if isinstance(data['tags'], list) else data['tags']
+                company.tags = normalize_tags(data['tags']) or None
 
             if 'relationship_stage' in data:
                 company.relationship_stage = data['relationship_stage']
@@ -1457,7 +1717,7 @@ async def get_integrations():
     """Get all integrations"""
     try:
         db_manager = get_db_manager()
-        session = db_manager.get_session()
+        session = db_manager.get_read_session()
 
         try:
             from database.models import Integration
@@ -1713,7 +1973,8 @@ async def enrich_contact_phones(request: PhoneEnrichmentRequest):
                 for c in contacts
             ]
 
-            # Enrich with Apollo
+            # Enrich with Apollo (without holding the writer connection)
+            release_connection(session)
             enrichment_service = ApolloPhoneEnrichment()
             results = enrichment_service.enrich_contacts_batch(contact_dicts)
 
@@ -1811,6 +2072,8 @@ async def start_telegram_campaign(request: TelegramCampaignRequest, background_t
                     for c in contacts
                 ]
 
+                # Don't hold the writer connection during the Apollo lookups
+                release_connection(session)
                 enrichment_service = ApolloPhoneEnrichment()
                 enrichment_result = enrichment_service.enrich_contacts_batch(contact_dicts)
 
@@ -1892,7 +2155,8 @@ async def execute_telegram_campaign(
             phone=integration.phone_number
         )
 
-        # Connect to Telegram
+        # Connect to Telegram (without holding the writer connection)
+        release_connection(session)
         connected = await telegram_service.connect()
         if not connected:
             logger.error("Failed to connect to Telegram")
@@ -1960,64 +2224,48 @@ async def execute_telegram_campaign(
 
 
 @app.get("/api/telegram/campaign/status")
-async def get_telegram_campaign_status():
+async def get_telegram_campaign_status(session: AsyncSession = Depends(get_async_read_session)):
     """Get Telegram campaign status and rate limit info"""
     try:
-        db_manager = get_db_manager()
-        session = db_manager.get_session()
-
-        try:
-            from database.models import Integration, TelegramMessage
+        from database.models import Integration, TelegramMessage
 
-            # Get integration
-            integration = session.query(Integration).filter(
-                Integration.platform == 'telegram_user'
-            ).first()
+        # Get integration
+        integration = (await session.scalars(
+            select(Integration).where(Integration.platform == 'telegram_user').limit(1)
+        )).first()
 
-            if not integration:
-                return {
-                    'connected': False,
-                    'message': 'No Telegram integration found'
-                }
+        if not integration:
+            return {
+                'connected': False,
+                'message': 'No Telegram integration found'
+            }
 
-            # Get message stats for today
-            today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-            messages_today = session.query(TelegramMessage).filter(
+        # Message counts by status (one grouped query), plus sent today
+        today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        status_counts = dict((await session.execute(
+            select(TelegramMessage.status, func.count(TelegramMessage.id))
+            .where(TelegramMessage.integration_id == integration.id)
+            .group_by(TelegramMessage.status)
+        )).all())
+        messages_today = await session.scalar(
+            select(func.count(TelegramMessage.id)).where(
                 TelegramMessage.integration_id == integration.id,
                 TelegramMessage.sent_at >= today_start,
                 TelegramMessage.status == 'sent'
-            ).count()
-
-            # Get total stats
-            total_sent = session.query(TelegramMessage).filter(
-                TelegramMessage.integration_id == integration.id,
-                TelegramMessage.status == 'sent'
-            ).count()
-
-            total_failed = session.query(TelegramMessage).filter(
-                TelegramMessage.integration_id == integration.id,
-                TelegramMessage.status == 'failed'
-            ).count()
-
-            total_no_telegram = session.query(TelegramMessage).filter(
-                TelegramMessage.integration_id == integration.id,
-                TelegramMessage.status == 'no_telegram'
-            ).count()
-
-            return {
-                'connected': integration.status == 'connected',
-                'phone': integration.phone_number,
-                'messages_sent_today': messages_today,
-                'daily_limit': 10,
-                'messages_remaining_today': max(0, 10 - messages_today),
-                'total_sent': total_sent,
-                'total_failed': total_failed,
-                'total_no_telegram': total_no_telegram,
-                'last_used': integration.last_used_at.isoformat() if integration.last_used_at else None
-            }
+            )
+        )
 
-        finally:
-            session.close()
+        return {
+            'connected': integration.status == 'connected',
+            'phone': integration.phone_number,
+            'messages_sent_today': messages_today,
+            'daily_limit': 10,
+            'messages_remaining_today': max(0, 10 - messages_today),
+            'total_sent': status_counts.get('sent', 0),
+            'total_failed': status_counts.get('failed', 0),
+            'total_no_telegram': status_counts.get('no_telegram', 0),
+            'last_used': integration.last_used_at.isoformat() if integration.last_used_at else None
+        }
 
     except Exception as e:
         logger.error(f"Error getting campaign status: {e}")
@@ -2025,46 +2273,70 @@ async def get_telegram_campaign_status():
 
 
 @app.get("/api/telegram/messages")
-async def get_telegram_messages(limit: int = 50):
+async def get_telegram_messages(limit: int = 50, session: AsyncSession = Depends(get_async_read_session)):
     """Get recent Telegram messages"""
     try:
-        db_manager = get_db_manager()
-        session = db_manager.get_session()
-
-        try:
-            from database.models import TelegramMessage, Contact
+        from database.models import TelegramMessage, Contact
 
-            messages = session.query(TelegramMessage).join(Contact).order_by(
+        messages = (await session.scalars(
+            select(TelegramMessage).join(Contact).order_by(
                 TelegramMessage.created_at.desc()
-            ).limit(limit).all()
+            ).limit(limit)
+        )).all()
 
-            return {
-                'messages': [
-                    {
-                        'id': msg.id,
-                        'contact_id': msg.contact_id,
-                        'phone_number': msg.phone_number,
-                        'telegram_username': msg.telegram_username,
-                        'status': msg.status,
-                        'error_message': msg.error_message,
-                        'sent_at': msg.sent_at.isoformat() if msg.sent_at else None,
-                        'created_at': msg.created_at.isoformat()
-                    }
-                    for msg in messages
-                ]
-            }
-
-        finally:
-            session.close()
+        return {
+            'messages': [
+                {
+                    'id': msg.id,
+                    'contact_id': msg.contact_id,
+                    'phone_number': msg.phone_number,
+                    'telegram_username': msg.telegram_username,
+                    'status': msg.status,
+                    'error_message': msg.error_message,
+                    'sent_at': msg.sent_at.isoformat() if msg.sent_at else None,
+                    'created_at': msg.created_at.isoformat()
+                }
+                for msg in messages
+            ]
+        }
 
     except Exception as e:
         logger.error(f"Error getting messages: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Full recount of crm_stats, in case anything wrote contacts around the ORM
+STATS_RECONCILE_SECONDS = float(os.getenv("CRM_STATS_RECONCILE_SECONDS", "3600"))
+stats_reconcile_task: Optional[asyncio.Task] = None
+
+
+def reconcile_stats() -> Dict[str, int]:
+    """Recompute the crm_stats rollup on a writer session"""
+    session = db_manager.get_session()
+    try:
+        return db_manager.reconcile_stats(session)
+    finally:
+        session.close()
+
+
+async def reconcile_stats_periodically():
+    """Background loop: reconcile crm_stats every STATS_RECONCILE_SECONDS"""
+    while True:
+        await asyncio.sleep(STATS_RECONCILE_SECONDS)
+        try:
+            result = await asyncio.to_thread(reconcile_stats)
+            logger.info(f"📊 crm_stats reconciled: {result['rows']} rows, {result['drift']} corrected")
+        except Exception as e:
+            logger.error(f"crm_stats reconcile failed: {e}")
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize on startup"""
+    global stats_reconcile_task
+    if STATS_RECONCILE_SECONDS > 0:
+        stats_reconcile_task = asyncio.create_task(reconcile_stats_periodically())
+
     print("\n" + "="*60)
     print("🚀 LeadOn CRM API starting...")
     print("="*60)
@@ -2077,6 +2349,17 @@ async def startup_event():
     print("="*60 + "\n")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background jobs and release pooled Apollo and async database connections"""
+    if stats_reconcile_task:
+        stats_reconcile_task.cancel()
+    if apollo_async:
+        await apollo_async.aclose()
+    get_usage_ledger().flush()
+    await db_manager.dispose_async_engine()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -30,10 +30,7 @@ async function loadContacts(silent = false) {
             showLoading();
         }
         
-        const response = await fetch(`${API_BASE}/api/contacts`);
-        const data = await response.json();
-        
-        contacts = data.contacts || [];
+        contacts = await fetchAllContacts();
         renderContactsTable();
         updateStats();
         
@@ -45,6 +42,23 @@ async function loadContacts(silent = false) {
     }
 }
 
+// /api/contacts is paged - follow next_cursor until the last page
+async function fetchAllContacts() {
+    const all = [];
+    let cursor = null;
+    do {
+        let url = `${API_BASE}/api/contacts?limit=1000`;
+        if (cursor) {
+            url += `&cursor=${encodeURIComponent(cursor)}`;
+        }
+        const response = await fetch(url);
+        const data = await response.json();
+        all.push(...(data.contacts || []));
+        cursor = data.next_cursor;
+    } while (cursor);
+    return all;
+}
+
 async function syncContacts() {
     showLoading('Syncing contacts...');
     await loadContacts();
@@ -103,11 +103,26 @@ async function performSearch() {
 }
 
 // Contacts Management
+// /api/contacts is paged - follow next_cursor until the last page
+async function fetchAllContacts() {
+    const all = [];
+    let cursor = null;
+    do {
+        let url = '/api/contacts?limit=1000';
+        if (cursor) {
+            url += '&cursor=' + encodeURIComponent(cursor);
+        }
+        const response = await fetch(url);
+        const data = await response.json();
+        all.push(...(data.contacts || []));
+        cursor = data.next_cursor;
+    } while (cursor);
+    return all;
+}
+
 async function refreshContacts() {
     try {
-        const response = await fetch('/api/contacts?limit=1000');
-        const data = await response.json();
-        contacts = data.contacts;
+        contacts = await fetchAllContacts();
         filteredContacts = [...contacts];
         renderContacts();
         updateDashboard();
@@ -4,27 +4,225 @@ Handles database connections, CRUD operations, and migrations
 """
 
 import os
-from sqlalchemy import create_engine
+import re
+import json
+import base64
+import unicodedata
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event, insert, delete, select, func, inspect, and_, or_
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
-from typing import List, Optional, Dict, Any
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.pool import QueuePool, StaticPool, AsyncAdaptedQueuePool
+from sqlalchemy.dialects import sqlite, postgresql
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from typing import List, Optional, Dict, Any, Iterator
 from datetime import datetime
+from urllib.parse import urlparse
 import logging
 
-from database.models import Base, Company, Contact, JobPosting, Campaign, SearchHistory
+from database.search_index import (
+    create_search_index, has_search_index, search as search_index, SEARCH_INDEXES, SearchUnavailable
+)
+from database.models import (
+    Base, Company, Contact, ContactTag, CompanyTag, JobPosting, Campaign, SearchHistory, CrmStat,
+    ChangeLog
+)
 
 logger = logging.getLogger(__name__)
 
+# Max bound parameters per IN (...) clause - keeps us under SQLite's variable limit
+IN_CLAUSE_CHUNK_SIZE = 500
+
+# Seconds a cached row count is served before it is recounted
+COUNT_CACHE_TTL = 30.0
+
+# Sync dialect -> asyncio driver used for the async read engine
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+}
+
+
+def normalize_tags(tags: Any) -> List[str]:
+    """Return tags as a list, accepting legacy JSON-encoded or comma-separated strings"""
+    if not tags:
+        return []
+    if isinstance(tags, str):
+        try:
+            tags = json.loads(tags)
+        except ValueError:
+            return [t.strip() for t in tags.split(',') if t.strip()]
+    return list(tags) if isinstance(tags, (list, tuple, set)) else []
+
+
+# Trailing words dropped from company names when building name_key
+LEGAL_SUFFIXES = {
+    'inc', 'incorporated', 'corp', 'corporation', 'co', 'company', 'llc', 'lc',
+    'ltd', 'limited', 'plc', 'gmbh', 'ag', 'sa', 'sas', 'sarl', 'srl', 'spa',
+    'bv', 'nv', 'oy', 'ab', 'as', 'aps', 'pty', 'pte', 'lp', 'llp', 'kk',
+}
+
+# Hosts (and their subdomains) that don't identify the company: profile pages,
+# and shared hosting where unrelated sites differ only by subdomain or path
+GENERIC_WEBSITE_HOSTS = {
+    'linkedin.com', 'facebook.com', 'twitter.com', 'x.com', 'crunchbase.com',
+    'instagram.com', 'youtube.com', 'linktr.ee',
+    'sites.google.com', 'github.io', 'github.com', 'gitlab.io', 'wixsite.com',
+    'notion.site', 'notion.so', 'medium.com', 'substack.com', 'wordpress.com',
+    'blogspot.com', 'webflow.io', 'netlify.app', 'vercel.app', 'herokuapp.com',
+    'myshopify.com', 'squarespace.com', 'weebly.com', 'carrd.co', 'framer.website',
+}
+
+_DOMAIN_NAME_RE = re.compile(r'^(?:https?://)?(?:www\.)?([a-z0-9-]+)(?:\.[a-z]{2,})+/?$')
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9]+')
+
+
+def company_name_key(name: Optional[str]) -> Optional[str]:
+    """
+    Canonical matching key for a company name.
+    "Acme Inc", "ACME, Inc." and "acme.io" all become "acme".
+    """
+    if not name:
+        return None
+
+    text = unicodedata.normalize('NFKD', name)
+    text = ''.join(c for c in text if not unicodedata.combining(c)).casefold().strip()
+
+    # Names that are just a domain ("Acme.io") -> the domain label
+    domain = _DOMAIN_NAME_RE.match(text)
+    if domain:
+        return domain.group(1).replace('-', '')
+
+    text = text.replace('&', ' and ').replace("'", '').replace('.', '')
+    words = _NON_ALNUM_RE.sub(' ', text).split()
+    if words and words[0] == 'the' and len(words) > 1:
+        words = words[1:]
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+
+    return ''.join(words) or None
+
+
+def website_name_key(website: Optional[str]) -> Optional[str]:
+    """
+    name_key implied by a company website (acme.com, www.acme.co.uk -> "acme").
+    None for hosts in GENERIC_WEBSITE_HOSTS or under them.
+    """
+    if not website:
+        return None
+    host = urlparse(website if '//' in website else f'//{website}').hostname or ''
+    host = host.lower().removeprefix('www.')
+    parts = host.split('.')
+    if len(parts) < 2:
+        return None
+    # acme.github.io, de.linkedin.com, sites.google.com/view/acme, ...
+    if any('.'.join(parts[i:]) in GENERIC_WEBSITE_HOSTS for i in range(len(parts) - 1)):
+        return None
+    # Two-level public suffixes like co.uk / com.au
+    if len(parts) >= 3 and len(parts[-1]) == 2 and parts[-2] in ('co', 'com', 'org', 'net', 'ac'):
+        label = parts[-3]
+    else:
+        label = parts[-2]
+    return label.replace('-', '') or None
+
+
+# Models recorded in change_log, by entity_type
+CHANGE_FEED_MODELS = {
+    Contact: 'contact',
+    Company: 'company',
+    JobPosting: 'job_posting',
+}
+
+
+# crm_stats dimension -> Contact attribute (tags are counted separately, per tag)
+STATS_DIMENSIONS = {
+    'title': 'title',
+    'company': 'company_name',
+    'workflow_stage': 'workflow_stage',
+    'source': 'source',
+}
+STATS_ATTRIBUTES = ('tags',) + tuple(STATS_DIMENSIONS.values())
+
+
+def contact_stat_keys(values: Dict[str, Any]) -> List[tuple]:
+    """crm_stats (dimension, value) keys a contact with these attribute values counts towards"""
+    keys = [('total', '')]
+    keys += [('tag', tag) for tag in tag_keys(values.get('tags'))]
+    for dimension, attr in STATS_DIMENSIONS.items():
+        value = values.get(attr)
+        value = value.strip() if isinstance(value, str) else value
+        if value:
+            keys.append((dimension, str(value)[:255]))
+    return keys
+
+
+def _load_previous_value(target, value, oldvalue, initiator):
+    """No-op; registered with active_history so the old value is loaded before a set"""
+
+
+# Stats deltas need the value being replaced, even when the attribute was expired
+for _attr in STATS_ATTRIBUTES:
+    event.listen(getattr(Contact, _attr), 'set', _load_previous_value, active_history=True)
+
+
+def tag_keys(tags: Any) -> List[str]:
+    """Indexed form of tags: lowercased, stripped and de-duplicated"""
+    keys = []
+    for tag in normalize_tags(tags):
+        key = str(tag).strip().lower()
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+
+def release_connection(session: Session):
+    """
+    End a session's transaction so its connection goes back to the pool. Call
+    it before slow network I/O (Apollo, Claude, scraping) on a session that has
+    only read so far: in WAL mode there is a single writer connection, and a
+    session holds it from its first query until commit/rollback/close, so every
+    other writer would wait on the network call. Loaded objects are not expired,
+    so reading them afterwards doesn't take the connection back; lazy loads and
+    new queries still do.
+
+    Raises:
+        RuntimeError: The session has unsaved changes - commit them first
+    """
+    if session.new or session.dirty or session.deleted:
+        raise RuntimeError("Commit pending changes before releasing the session's connection")
+    expire_on_commit = session.expire_on_commit
+    session.expire_on_commit = False
+    try:
+        session.commit()
+    finally:
+        session.expire_on_commit = expire_on_commit
+
 
 class DatabaseManager:
     """Manages database operations for LeadOn CRM"""
     
-    def __init__(self, database_url: Optional[str] = None):
+    def __init__(self, database_url: Optional[str] = None, wal_mode: bool = True,
+                 read_pool_size: int = 5, busy_timeout_ms: int = 5000,
+                 writer_timeout: float = 30.0, async_mode: bool = True,
+                 run_migrations: bool = True):
         """
         Initialize database manager
         
         Args:
             database_url: Database connection string (defaults to SQLite)
+            wal_mode: For file-backed SQLite, use WAL journaling with a pool of reader
+                connections plus one serialized writer. False keeps the legacy single
+                shared connection (StaticPool).
+            read_pool_size: Number of pooled reader connections (WAL mode only)
+            busy_timeout_ms: SQLite busy timeout applied to every connection
+            writer_timeout: Seconds to wait for the writer connection before failing
+            async_mode: Also create an asyncio read engine (aiosqlite / asyncpg) so async
+                endpoints don't block the event loop. Needs WAL mode on SQLite; disabled
+                with a warning if the driver isn't installed.
+            run_migrations: Apply pending schema migrations (database/migrations) now
         """
         if database_url is None:
             # Default to SQLite in the database folder
@@ -32,39 +230,206 @@ class DatabaseManager:
             database_url = f"sqlite:///{db_path}"
         
         self.database_url = database_url
+        self.wal_mode = False
         
-        # Create engine
-        if database_url.startswith("sqlite"):
-            # SQLite-specific settings
+        # Create engines
+        if database_url.startswith("sqlite") and wal_mode and not self._is_sqlite_memory(database_url):
+            # SQLite WAL: readers never block the writer and vice versa, but there is
+            # only ever one writer - so give writes a single pooled connection and
+            # let readers use their own pool.
+            self.wal_mode = True
+            self.engine = create_engine(
+                database_url,
+                connect_args={"check_same_thread": False},
+                poolclass=QueuePool,
+                pool_size=1,
+                max_overflow=0,
+                pool_timeout=writer_timeout
+            )
+            self.read_engine = create_engine(
+                database_url,
+                connect_args={"check_same_thread": False},
+                poolclass=QueuePool,
+                pool_size=read_pool_size,
+                max_overflow=0
+            )
+            self._configure_sqlite(self.engine, busy_timeout_ms, read_only=False)
+            self._configure_sqlite(self.read_engine, busy_timeout_ms, read_only=True)
+        elif database_url.startswith("sqlite"):
+            # SQLite-specific settings (single shared connection)
             self.engine = create_engine(
                 database_url,
                 connect_args={"check_same_thread": False},
                 poolclass=StaticPool
             )
+            self.read_engine = self.engine
         else:
             self.engine = create_engine(database_url)
+            self.read_engine = self.engine
         
-        # Create session factory
+        # Create session factories
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.read_engine)
+        
+        # Async read engine for the FastAPI endpoints
+        self.async_engine = None
+        self.AsyncReadSessionLocal = None
+        if async_mode and (self.wal_mode or not database_url.startswith("sqlite")):
+            self._create_async_engine(database_url, read_pool_size, busy_timeout_ms)
+        
+        # Keep contact_tags/company_tags in sync with every ORM write
+        event.listen(self.SessionLocal, "after_flush", self._sync_tags_after_flush)
+        event.listen(self.SessionLocal, "before_flush", self._set_company_keys_before_flush)
+        
+        # Cached row counts for list endpoints: {(table, filter_key): (count, expires_at)}
+        self._count_cache: Dict[tuple, tuple] = {}
+        self._count_cache_lock = threading.Lock()
+        event.listen(self.SessionLocal, "after_flush", self._invalidate_counts_after_flush)
+        
+        # crm_stats rollup follows every ORM contact insert/update/delete
+        event.listen(self.SessionLocal, "before_flush", self._update_stats_before_flush)
         
-        # Create tables
-        self.create_tables()
+        # change_log outbox: one row per contact/company/job posting write
+        event.listen(self.SessionLocal, "after_flush", self._record_changes_after_flush)
         
-        logger.info(f"Database initialized: {database_url}")
+        # Bring the schema up to date (a single schema_version read when current)
+        if run_migrations:
+            self.migrate()
+        self.fts_enabled = has_search_index(self.engine)
+        
+        logger.info(f"Database initialized: {database_url} (wal_mode={self.wal_mode}, "
+                    f"async={self.async_enabled})")
+    
+    @staticmethod
+    def _is_sqlite_memory(database_url: str) -> bool:
+        """In-memory SQLite databases can't be shared across connections"""
+        return database_url in ("sqlite://", "sqlite:///") or ":memory:" in database_url \
+            or "mode=memory" in database_url
+    
+    @staticmethod
+    def _configure_sqlite(engine, busy_timeout_ms: int, read_only: bool):
+        """Apply WAL pragmas to every new connection in the engine's pool"""
+        @event.listens_for(engine, "connect")
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute(f"PRAGMA busy_timeout = {int(busy_timeout_ms)}")
+            if not read_only:
+                # journal_mode is persistent in the database file, so setting it on
+                # the writer is enough for readers to pick it up
+                cursor.execute("PRAGMA journal_mode = WAL")
+            cursor.execute("PRAGMA synchronous = NORMAL")
+            if read_only:
+                cursor.execute("PRAGMA query_only = ON")
+            cursor.close()
+    
+    def _create_async_engine(self, database_url: str, pool_size: int, busy_timeout_ms: int):
+        """Create the asyncio read engine, or leave it unset if no async driver is available"""
+        scheme, _, rest = database_url.partition("://")
+        driver = ASYNC_DRIVERS.get(scheme.split("+")[0])
+        if not driver:
+            return
+
+        try:
+            if driver.startswith("sqlite"):
+                self.async_engine = create_async_engine(
+                    f"{driver}://{rest}",
+                    poolclass=AsyncAdaptedQueuePool,
+                    pool_size=pool_size,
+                    max_overflow=0
+                )
+                # Pragmas are applied through the sync facade of the async engine
+                self._configure_sqlite(self.async_engine.sync_engine, busy_timeout_ms, read_only=True)
+            else:
+                self.async_engine = create_async_engine(f"{driver}://{rest}", pool_size=pool_size)
+        except ImportError as e:
+            logger.warning(f"⚠️  Async database access disabled ({driver} driver not installed): {e}")
+            self.async_engine = None
+            return
+
+        self.AsyncReadSessionLocal = async_sessionmaker(
+            self.async_engine, autoflush=False, expire_on_commit=False
+        )
+    
+    async def dispose_async_engine(self):
+        """Close pooled async connections - call from the app's shutdown hook"""
+        if self.async_engine is not None:
+            await self.async_engine.dispose()
+    
+    @property
+    def async_enabled(self) -> bool:
+        """True when read endpoints can use a non-blocking async session"""
+        return self.async_engine is not None
     
     def create_tables(self):
-        """Create all tables if they don't exist"""
+        """Create all tables (and the SQLite full-text index) if they don't exist"""
         Base.metadata.create_all(bind=self.engine)
+        self.fts_enabled = create_search_index(self.engine)
         logger.info("Database tables created/verified")
     
+    def migrate(self) -> List[int]:
+        """
+        Apply pending versioned migrations.
+
+        Returns:
+            Versions applied (empty when the schema was already current)
+        """
+        from database.migrations import run_migrations
+        applied = run_migrations(self)
+        if applied:
+            logger.info(f"Applied migrations: {', '.join(f'{v:04d}' for v in applied)}")
+        return applied
+    
     def get_session(self) -> Session:
-        """Get a new database session"""
+        """
+        Get a new database session (uses the writer connection in WAL mode).
+        Don't hold it across network I/O - see write_session() and release_connection().
+        """
         return self.SessionLocal()
+
+    @contextmanager
+    def write_session(self) -> Iterator[Session]:
+        """
+        Short writer transaction: committed when the block exits, rolled back if
+        it raises, and always closed.
+
+        Long workflows should read on get_read_session(), do their network I/O
+        with no session open, and only then save in a write_session() - the
+        writer connection is then held for the save alone. Objects stay readable
+        after the block (expire_on_commit=False).
+        """
+        session = self.SessionLocal(expire_on_commit=False)
+        try:
+            yield session
+            session.commit()
+        except BaseException:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+    
+    def get_read_session(self) -> Session:
+        """
+        Get a new read-only database session.
+        In WAL mode this comes from the reader pool, so it keeps working while a
+        long write transaction holds the writer connection.
+        """
+        return self.ReadSessionLocal()
+    
+    def get_async_read_session(self):
+        """
+        Get a read-only session for async code, to be used as `async with`.
+        Returns an AsyncSession on the async engine, or - when no async driver is
+        available - a BlockingAsyncSession over a normal read session.
+        """
+        if self.AsyncReadSessionLocal is not None:
+            return self.AsyncReadSessionLocal()
+        return BlockingAsyncSession(self.get_read_session())
     
     # ==================== Company Operations ====================
     
     def create_company(self, session: Session, **kwargs) -> Company:
         """Create a new company"""
+        kwargs.setdefault('name_key', company_name_key(kwargs.get('name')))
         company = Company(**kwargs)
         session.add(company)
         session.commit()
@@ -72,9 +437,21 @@ class DatabaseManager:
         logger.info(f"Created company: {company.name}")
         return company
     
-    def get_company_by_name(self, session: Session, name: str) -> Optional[Company]:
-        """Get company by name"""
-        return session.query(Company).filter(Company.name == name).first()
+    def get_company_by_name(self, session: Session, name: str,
+                            website: Optional[str] = None) -> Optional[Company]:
+        """
+        Get company by canonical name key, falling back to the key implied by its website.
+        "ACME, Inc." finds "Acme"; website="https://acme.com" finds "Acme" too.
+        """
+        name_key = company_name_key(name)
+        candidates = [k for k in (name_key, website_name_key(website)) if k]
+        if not candidates:
+            return session.query(Company).filter(Company.name == name).first()
+
+        matches = session.query(Company).filter(Company.name_key.in_(candidates)).all()
+        # Prefer the exact name match over the website match
+        matches.sort(key=lambda c: c.name_key != name_key)
+        return matches[0] if matches else None
     
     def get_company_by_apollo_id(self, session: Session, apollo_id: str) -> Optional[Company]:
         """Get company by Apollo ID"""
@@ -82,18 +459,115 @@ class DatabaseManager:
     
     def get_or_create_company(self, session: Session, name: str, **kwargs) -> tuple[Company, bool]:
         """
-        Get existing company or create new one
+        Get existing company (matched on name_key) or create new one
         
         Returns:
             (company, created) tuple where created is True if new company was created
         """
-        company = self.get_company_by_name(session, name)
+        company = self.get_company_by_name(session, name, website=kwargs.get('website'))
         if company:
             return company, False
         
-        company = self.create_company(session, name=name, **kwargs)
+        try:
+            company = self.create_company(session, name=name, **kwargs)
+        except IntegrityError:
+            # Another writer created the same company between our lookup and insert
+            session.rollback()
+            company = self.get_company_by_name(session, name, website=kwargs.get('website'))
+            if company is None:
+                raise
+            return company, False
         return company, True
     
+    def _set_company_keys_before_flush(self, session: Session, flush_context, instances):
+        """Derive Company.name_key for new companies and renamed ones"""
+        for obj in list(session.new) + list(session.dirty):
+            if isinstance(obj, Company) and (obj.name_key is None or
+                                             inspect(obj).attrs.name.history.has_changes()):
+                obj.name_key = company_name_key(obj.name)
+    
+    def merge_duplicate_companies(self, session: Session) -> Dict[str, int]:
+        """
+        Fold companies that share a name_key into one row. Backfills missing
+        name_keys first. The survivor is the Apollo-matched / enriched / oldest
+        row; it inherits blank fields and tags from the
+        duplicates, and their contacts and job postings are re-pointed to it.
+        Commits.
+
+        Returns:
+            {'groups': int, 'merged': int}
+        """
+        connection = session.connection()
+
+        # Backfill keys for rows created before name_key existed
+        missing = connection.execute(
+            select(Company.id, Company.name).where(Company.name_key.is_(None))
+        ).all()
+        for row in missing:
+            connection.execute(
+                Company.__table__.update().where(Company.id == row.id)
+                .values(name_key=company_name_key(row.name))
+            )
+        self._write_changes(connection, 'company', [row.id for row in missing], 'update', ['name_key'])
+
+        duplicate_keys = connection.execute(
+            select(Company.name_key)
+            .where(Company.name_key.is_not(None))
+            .group_by(Company.name_key)
+            .having(func.count(Company.id) > 1)
+        ).scalars().all()
+
+        merged = 0
+        fill_fields = ('website', 'industry', 'description', 'employee_count', 'location',
+                       'apollo_id', 'linkedin_url', 'founded_year', 'funding_stage',
+                       'total_funding', 'technologies', 'relationship_stage', 'match_score',
+                       'match_reasoning', 'industry_analysis', 'pain_points',
+                       'value_proposition', 'enrichment_notes', 'last_enriched_at')
+
+        for name_key in duplicate_keys:
+            group = session.query(Company).filter(Company.name_key == name_key).all()
+            group.sort(key=lambda c: (c.apollo_id is None, c.last_enriched_at is None, c.id))
+            survivor, duplicates = group[0], group[1:]
+            duplicate_ids = [c.id for c in duplicates]
+
+            values = {}
+            tags = normalize_tags(survivor.tags)
+            for duplicate in duplicates:
+                for field in fill_fields:
+                    if getattr(survivor, field) is None and values.get(field) is None:
+                        values[field] = getattr(duplicate, field)
+                tags += [t for t in normalize_tags(duplicate.tags) if t not in tags]
+
+            # Re-point children with plain UPDATEs - deleting through the ORM would
+            # cascade-delete them via Company.contacts / Company.job_postings
+            for model, entity_type in ((Contact, 'contact'), (JobPosting, 'job_posting')):
+                child_ids = connection.execute(
+                    select(model.id).where(model.company_id.in_(duplicate_ids))
+                ).scalars().all()
+                connection.execute(model.__table__.update()
+                                   .where(model.company_id.in_(duplicate_ids))
+                                   .values(company_id=survivor.id))
+                self._write_changes(connection, entity_type, child_ids, 'update', ['company_id'])
+            connection.execute(delete(CompanyTag).where(CompanyTag.company_id.in_(duplicate_ids)))
+            for duplicate in duplicates:
+                session.expunge(duplicate)
+            connection.execute(delete(Company).where(Company.id.in_(duplicate_ids)))
+            self._write_changes(connection, 'company', duplicate_ids, 'delete')
+
+            # Copy unique fields (apollo_id) only once the duplicates are gone
+            for field, value in values.items():
+                if value is not None:
+                    setattr(survivor, field, value)
+            if tags != normalize_tags(survivor.tags):
+                survivor.tags = tags
+            session.flush()
+
+            merged += len(duplicates)
+            logger.info(f"Merged {len(duplicates)} duplicate(s) into company {survivor.id} ({survivor.name})")
+
+        session.commit()
+        return {'groups': len(duplicate_keys), 'merged': merged}
+    
     def update_company_match_score(self, session: Session, company_id: int, 
                                    score: float, reasoning: str):
         """Update company's AI match score"""
@@ -150,8 +624,8 @@ class DatabaseManager:
             # Update existing contact with new tags and source_reason if provided
             if 'tags' in kwargs and kwargs['tags']:
                 # Merge new tags with existing tags (avoid duplicates)
-                existing_tags = contact.tags or []
-                new_tags = kwargs['tags']
+                existing_tags = normalize_tags(contact.tags)
+                new_tags = normalize_tags(kwargs['tags'])
                 merged_tags = list(set(existing_tags + new_tags))
                 contact.tags = merged_tags
 
@@ -165,10 +639,524 @@ class DatabaseManager:
         contact = self.create_contact(session, email=email, linkedin_url=linkedin_url, **kwargs)
         return contact, True
     
+    def bulk_upsert_contacts(self, session: Session, rows: List[Dict[str, Any]],
+                             update_existing: bool = True) -> Dict[str, Any]:
+        """
+        Insert or update many contacts with set-based queries instead of per-row lookups.
+        Matches existing contacts by email, then LinkedIn URL (same rules as
+        get_or_create_contact), merges tags in memory and inserts new rows with
+        a single executemany. Does not commit - caller should commit.
+
+        Args:
+            rows: List of contact field dicts (email, linkedin_url, name, tags, ...)
+            update_existing: Merge rows into the contacts they match. When False,
+                             matching rows (including repeats within rows) are
+                             skipped and the existing contact is left untouched
+
+        Returns:
+            {'contacts': List[Contact] in input order, 'created': int, 'updated': int,
+             'skipped': int}
+        """
+        emails = {row['email'] for row in rows if row.get('email')}
+        linkedin_urls = {row['linkedin_url'] for row in rows if row.get('linkedin_url')}
+
+        by_email: Dict[str, Any] = {}
+        by_linkedin: Dict[str, Any] = {}
+        for contact in self._query_in(session, Contact, Contact.email, emails):
+            by_email.setdefault(contact.email, contact)
+        for contact in self._query_in(session, Contact, Contact.linkedin_url, linkedin_urls):
+            by_linkedin.setdefault(contact.linkedin_url, contact)
+
+        updated_ids = set()
+        skipped = 0
+        new_rows: List[Dict[str, Any]] = []
+        # Per input row: either an existing Contact or an index into new_rows
+        resolved: List[Any] = []
+
+        for row in rows:
+            email = row.get('email')
+            linkedin_url = row.get('linkedin_url')
+
+            match = None
+            if email:
+                match = by_email.get(email)
+            if match is None and linkedin_url:
+                match = by_linkedin.get(linkedin_url)
+
+            if match is None:
+                # New contact - register it so later duplicates in the batch merge into it
+                new_row = dict(row)
+                new_row['tags'] = normalize_tags(new_row.get('tags')) or None
+                match = len(new_rows)
+                new_rows.append(new_row)
+                if email:
+                    by_email[email] = match
+                if linkedin_url:
+                    by_linkedin.setdefault(linkedin_url, match)
+            elif not update_existing:
+                skipped += 1
+            elif isinstance(match, int):
+                self._merge_contact_fields(new_rows[match], row)
+            else:
+                self._merge_contact_fields(match, row)
+                updated_ids.add(match.id)
+
+            resolved.append(match)
+
+        created_contacts = []
+        if new_rows:
+            created_contacts = session.scalars(
+                insert(Contact).returning(Contact, sort_by_parameter_order=True),
+                new_rows
+            ).all()
+
+        # ORM bulk inserts skip flush events, so index, count and log them explicitly
+        self._write_tag_rows(session.connection(), ContactTag.__table__.c.contact_id,
+                             {c.id: c.tags for c in created_contacts if c.tags}, [])
+        delta = Counter()
+        for row in new_rows:
+            delta.update(contact_stat_keys(row))
+        self._apply_stat_deltas(session.connection(), delta)
+        self._write_changes(session.connection(), 'contact', [c.id for c in created_contacts], 'insert')
+        if created_contacts or updated_ids:
+            self.invalidate_counts(Contact.__tablename__, filtered_only=not created_contacts)
+
+        session.flush()
+
+        contacts = [created_contacts[m] if isinstance(m, int) else m for m in resolved]
+        logger.info(f"Bulk upserted contacts: {len(created_contacts)} created, {len(updated_ids)} updated, "
+                    f"{skipped} skipped")
+
+        return {
+            'contacts': contacts,
+            'created': len(created_contacts),
+            'updated': len(updated_ids),
+            'skipped': skipped
+        }
+
+    def _merge_contact_fields(self, target: Any, row: Dict[str, Any]):
+        """Merge tags and source_reason from row into an existing Contact or pending row dict"""
+        is_dict = isinstance(target, dict)
+
+        if row.get('tags'):
+            existing_tags = normalize_tags(target.get('tags') if is_dict else target.tags)
+            new_tags = [t for t in normalize_tags(row['tags']) if t not in existing_tags]
+            if new_tags:
+                if is_dict:
+                    target['tags'] = existing_tags + new_tags
+                else:
+                    target.tags = existing_tags + new_tags
+
+        if row.get('source_reason'):
+            if is_dict:
+                target['source_reason'] = row['source_reason']
+            else:
+                target.source_reason = row['source_reason']
+
+    @staticmethod
+    def _query_in(session: Session, model, column, values) -> List[Any]:
+        """Fetch rows where column is in values, chunked to stay under the bound-parameter limit"""
+        values = list(values)
+        results = []
+        for i in range(0, len(values), IN_CLAUSE_CHUNK_SIZE):
+            chunk = values[i:i + IN_CLAUSE_CHUNK_SIZE]
+            results.extend(session.query(model).filter(column.in_(chunk)).all())
+        return results
+
     def get_contacts_by_company(self, session: Session, company_id: int) -> List[Contact]:
         """Get all contacts for a company"""
         return session.query(Contact).filter(Contact.company_id == company_id).all()
     
+    # ==================== Tag Index ====================
+    
+    def _sync_tags_after_flush(self, session: Session, flush_context):
+        """Mirror Contact.tags / Company.tags into the normalized tag tables"""
+        connection = session.connection()
+        for model, fk_column in ((Contact, ContactTag.__table__.c.contact_id),
+                                 (Company, CompanyTag.__table__.c.company_id)):
+            changed = {}
+            for obj in session.new:
+                if isinstance(obj, model):
+                    changed[obj.id] = obj.tags
+            for obj in session.dirty:
+                if isinstance(obj, model) and inspect(obj).attrs.tags.history.has_changes():
+                    changed[obj.id] = obj.tags
+            deleted_ids = [obj.id for obj in session.deleted if isinstance(obj, model)]
+
+            if changed or deleted_ids:
+                self._write_tag_rows(connection, fk_column, changed, deleted_ids)
+    
+    @staticmethod
+    def _write_tag_rows(connection, fk_column, tags_by_id: Dict[int, Any], deleted_ids: List[int]):
+        """Replace the tag rows for tags_by_id and drop rows for deleted_ids"""
+        table = fk_column.table
+        stale_ids = list(tags_by_id.keys()) + list(deleted_ids)
+        for i in range(0, len(stale_ids), IN_CLAUSE_CHUNK_SIZE):
+            chunk = stale_ids[i:i + IN_CLAUSE_CHUNK_SIZE]
+            connection.execute(delete(table).where(fk_column.in_(chunk)))
+
+        rows = [
+            {'tag': tag, fk_column.name: entity_id}
+            for entity_id, tags in tags_by_id.items()
+            for tag in tag_keys(tags)
+        ]
+        if rows:
+            connection.execute(insert(table), rows)
+    
+    def rebuild_tag_index(self, session: Session, batch_size: int = 5000) -> Dict[str, int]:
+        """
+        Rebuild contact_tags/company_tags from the JSON tag columns in batches.
+        Used by the backfill migration; safe to re-run.
+        """
+        counts = {}
+        connection = session.connection()
+        for model, fk_column in ((Contact, ContactTag.__table__.c.contact_id),
+                                 (Company, CompanyTag.__table__.c.company_id)):
+            last_id = 0
+            total = 0
+            while True:
+                batch = connection.execute(
+                    select(model.id, model.tags)
+                    .where(model.id > last_id)
+                    .order_by(model.id)
+                    .limit(batch_size)
+                ).all()
+                if not batch:
+                    break
+                self._write_tag_rows(connection, fk_column, {row.id: row.tags for row in batch}, [])
+                session.commit()
+                connection = session.connection()
+                last_id = batch[-1].id
+                total += len(batch)
+            counts[model.__tablename__] = total
+            logger.info(f"Rebuilt tag index for {total} {model.__tablename__}")
+        return counts
+    
+    def filter_by_tags(self, query, model, tags: List[str], match_all: bool = True):
+        """
+        Restrict an ORM query on Contact or Company to rows carrying the given tags.
+        Resolved through the (tag, entity_id) index rather than scanning JSON columns.
+
+        Args:
+            query: Query over model
+            model: Contact or Company
+            tags: Tags to match (case-insensitive)
+            match_all: True = entity must have every tag (AND), False = any tag (OR)
+        """
+        keys = tag_keys(tags)
+        if not keys:
+            return query
+
+        if model is Contact:
+            tag_model, fk = ContactTag, ContactTag.contact_id
+        elif model is Company:
+            tag_model, fk = CompanyTag, CompanyTag.company_id
+        else:
+            raise ValueError(f"Tag filtering not supported for {model.__name__}")
+
+        matching_ids = select(fk).where(tag_model.tag.in_(keys))
+        if match_all and len(keys) > 1:
+            matching_ids = matching_ids.group_by(fk).having(func.count(tag_model.tag) == len(keys))
+
+        return query.filter(model.id.in_(matching_ids))
+    
+    # ==================== Pagination & Counts ====================
+    
+    @staticmethod
+    def encode_cursor(sort: str, values: List[Any]) -> str:
+        """Opaque keyset cursor for the last row of a page"""
+        payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+        raw = json.dumps({'s': sort, 'k': payload}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+    
+    @staticmethod
+    def decode_cursor(cursor: str, sort: str) -> List[Any]:
+        """Decode a cursor from encode_cursor; raises ValueError if it is malformed"""
+        try:
+            data = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+            cursor_sort, values = data['s'], data['k']
+            if sort == 'updated_at':
+                updated_at, row_id = values
+                values = [datetime.fromisoformat(updated_at) if updated_at else None, int(row_id)]
+            else:
+                values = [int(values[0])]
+        except Exception:
+            raise ValueError("Invalid cursor")
+        if cursor_sort != sort:
+            raise ValueError("Cursor was issued for a different sort order")
+        return values
+    
+    def keyset_paginate(self, session: Session, stmt, model, limit: int,
+                        cursor: Optional[str] = None, sort: str = 'id'):
+        """
+        Fetch one page of a select() over model using keyset (seek) pagination,
+        so deep pages cost the same as the first one.
+
+        Args:
+            stmt: select() of the columns to return; must include model.id
+                  (and model.updated_at when sort='updated_at')
+            model: Mapped class the statement selects from
+            limit: Page size
+            cursor: next_cursor from the previous page
+            sort: 'id' (oldest first) or 'updated_at' (most recently updated first)
+
+        Returns:
+            (rows, next_cursor) - next_cursor is None on the last page
+        """
+        page_stmt = self._keyset_statement(stmt, model, limit, cursor, sort)
+        return self._keyset_page(session.execute(page_stmt).all(), model, limit, sort)
+    
+    async def keyset_paginate_async(self, session: AsyncSession, stmt, model, limit: int,
+                                    cursor: Optional[str] = None, sort: str = 'id'):
+        """Async version of keyset_paginate"""
+        page_stmt = self._keyset_statement(stmt, model, limit, cursor, sort)
+        result = await session.execute(page_stmt)
+        return self._keyset_page(result.all(), model, limit, sort)
+    
+    def _keyset_statement(self, stmt, model, limit: int, cursor: Optional[str], sort: str):
+        """Add the seek predicate, ordering and limit for one keyset page"""
+        if sort == 'id':
+            if cursor:
+                (last_id,) = self.decode_cursor(cursor, sort)
+                stmt = stmt.where(model.id > last_id)
+            stmt = stmt.order_by(model.id)
+        elif sort == 'updated_at':
+            if cursor:
+                last_updated, last_id = self.decode_cursor(cursor, sort)
+                # NULL updated_at sorts last in DESC order
+                if last_updated is None:
+                    stmt = stmt.where(and_(model.updated_at.is_(None), model.id < last_id))
+                else:
+                    stmt = stmt.where(or_(
+                        model.updated_at < last_updated,
+                        and_(model.updated_at == last_updated, model.id < last_id),
+                        model.updated_at.is_(None)
+                    ))
+            stmt = stmt.order_by(model.updated_at.desc(), model.id.desc())
+        else:
+            raise ValueError("sort must be 'id' or 'updated_at'")
+
+        # One extra row tells us whether there is another page
+        return stmt.limit(limit + 1)
+    
+    def _keyset_page(self, rows, model, limit: int, sort: str):
+        """Trim the look-ahead row and build next_cursor"""
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]._mapping
+            keys = [last[model.id]] if sort == 'id' else [last[model.updated_at], last[model.id]]
+            next_cursor = self.encode_cursor(sort, keys)
+        return rows, next_cursor
+    
+    def cached_count(self, session: Session, stmt, table: str, filter_key: Any = None) -> int:
+        """
+        Row count for a select(), cached per (table, filter_key) for COUNT_CACHE_TTL
+        seconds. Entries are dropped as soon as an ORM write touches the table.
+
+        Args:
+            stmt: select() whose rows should be counted
+            table: Table name used for invalidation
+            filter_key: Hashable description of the filters applied (None = unfiltered)
+        """
+        key = (table, filter_key)
+        count = self._get_cached_count(key)
+        if count is None:
+            count = session.execute(self._count_statement(stmt)).scalar_one()
+            self._store_count(key, count)
+        return count
+    
+    async def cached_count_async(self, session: AsyncSession, stmt, table: str,
+                                 filter_key: Any = None) -> int:
+        """Async version of cached_count"""
+        key = (table, filter_key)
+        count = self._get_cached_count(key)
+        if count is None:
+            count = (await session.execute(self._count_statement(stmt))).scalar_one()
+            self._store_count(key, count)
+        return count
+    
+    @staticmethod
+    def _count_statement(stmt):
+        return select(func.count()).select_from(stmt.order_by(None).subquery())
+    
+    def _get_cached_count(self, key: tuple) -> Optional[int]:
+        with self._count_cache_lock:
+            cached = self._count_cache.get(key)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+        return None
+    
+    def _store_count(self, key: tuple, count: int):
+        with self._count_cache_lock:
+            self._count_cache[key] = (count, time.monotonic() + COUNT_CACHE_TTL)
+    
+    def invalidate_counts(self, table: str, filtered_only: bool = False):
+        """Drop cached counts for a table (filtered_only keeps the unfiltered total)"""
+        with self._count_cache_lock:
+            for key in list(self._count_cache):
+                if key[0] == table and (key[1] is not None or not filtered_only):
+                    del self._count_cache[key]
+    
+    def _invalidate_counts_after_flush(self, session: Session, flush_context):
+        """Inserts/deletes change every count; updates can only move rows between filters"""
+        for model in (Contact, Company):
+            if any(isinstance(obj, model) for obj in session.new) or \
+                    any(isinstance(obj, model) for obj in session.deleted):
+                self.invalidate_counts(model.__tablename__)
+            elif any(isinstance(obj, model) for obj in session.dirty):
+                self.invalidate_counts(model.__tablename__, filtered_only=True)
+    
+    # ==================== CRM Stats Rollup ====================
+    
+    @staticmethod
+    def _stat_values(obj: Contact, previous: bool = False) -> Dict[str, Any]:
+        """Current (or pre-change) values of the attributes crm_stats is keyed on"""
+        state = inspect(obj)
+        values = {}
+        for attr in STATS_ATTRIBUTES:
+            if previous:
+                history = state.attrs[attr].history
+                if history.added or history.deleted:
+                    values[attr] = history.deleted[0] if history.deleted else None
+                    continue
+            values[attr] = getattr(obj, attr)
+        return values
+    
+    def _update_stats_before_flush(self, session: Session, flush_context, instances):
+        """Turn pending contact inserts/updates/deletes into crm_stats count deltas"""
+        delta = Counter()
+        for obj in session.new:
+            if isinstance(obj, Contact):
+                delta.update(contact_stat_keys(self._stat_values(obj)))
+        for obj in session.deleted:
+            if isinstance(obj, Contact):
+                delta.subtract(contact_stat_keys(self._stat_values(obj, previous=True)))
+        for obj in session.dirty:
+            if isinstance(obj, Contact) and obj not in session.deleted:
+                state = inspect(obj)
+                if any(state.attrs[attr].history.has_changes() for attr in STATS_ATTRIBUTES):
+                    delta.subtract(contact_stat_keys(self._stat_values(obj, previous=True)))
+                    delta.update(contact_stat_keys(self._stat_values(obj)))
+        self._apply_stat_deltas(session.connection(), delta)
+    
+    @staticmethod
+    def _apply_stat_deltas(connection, delta: Counter):
+        """Add deltas to crm_stats in the current transaction, dropping rows that reach zero"""
+        rows = [{'dimension': d, 'value': v, 'count': n} for (d, v), n in delta.items() if n]
+        if not rows:
+            return
+
+        dialect = {'sqlite': sqlite, 'postgresql': postgresql}.get(connection.dialect.name)
+        if dialect is None:
+            logger.warning("crm_stats deltas need SQLite or Postgres upserts - run reconcile_stats()")
+            return
+
+        stmt = dialect.insert(CrmStat)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['dimension', 'value'],
+            set_={'count': CrmStat.__table__.c.count + stmt.excluded['count']}
+        )
+        connection.execute(stmt, rows)
+
+        if any(row['count'] < 0 for row in rows):
+            connection.execute(delete(CrmStat).where(CrmStat.count <= 0))
+    
+    def reconcile_stats(self, session: Session) -> Dict[str, int]:
+        """
+        Recompute crm_stats from the contacts and contact_tags tables and replace
+        the rollup in one transaction. Fixes drift from writes that bypass the ORM
+        (raw SQL, query.delete()). Commits.
+
+        Returns:
+            {'rows': rollup rows written, 'drift': rows whose count was wrong}
+        """
+        counts = {('total', ''): session.query(func.count(Contact.id)).scalar()}
+
+        for tag, count in session.query(ContactTag.tag, func.count()).group_by(ContactTag.tag):
+            counts[('tag', tag)] = count
+
+        for dimension, attr in STATS_DIMENSIONS.items():
+            value = func.substr(func.trim(getattr(Contact, attr)), 1, 255)
+            for key, count in session.query(value, func.count()).filter(value != '').group_by(value):
+                counts[(dimension, key)] = count
+
+        existing = {(row.dimension, row.value): row.count for row in session.query(CrmStat)}
+        drift = sum(1 for key in set(counts) | set(existing) if counts.get(key, 0) != existing.get(key, 0))
+
+        rows = [{'dimension': d, 'value': v, 'count': n} for (d, v), n in counts.items() if n]
+        session.execute(delete(CrmStat))
+        if rows:
+            session.execute(insert(CrmStat), rows)
+        session.commit()
+
+        if drift:
+            logger.warning(f"crm_stats reconciled: {drift} counts were out of date")
+        return {'rows': len(rows), 'drift': drift}
+    
+    # ==================== Change Feed ====================
+    
+    def _record_changes_after_flush(self, session: Session, flush_context):
+        """Append a change_log row for every flushed contact/company/job posting write"""
+        rows = []
+        for obj in session.new:
+            entity_type = CHANGE_FEED_MODELS.get(type(obj))
+            if entity_type:
+                rows.append({'entity_type': entity_type, 'entity_id': obj.id, 'operation': 'insert'})
+        for obj in session.deleted:
+            entity_type = CHANGE_FEED_MODELS.get(type(obj))
+            if entity_type:
+                rows.append({'entity_type': entity_type, 'entity_id': obj.id, 'operation': 'delete'})
+        for obj in session.dirty:
+            entity_type = CHANGE_FEED_MODELS.get(type(obj))
+            if not entity_type or obj in session.deleted:
+                continue
+            state = inspect(obj)
+            changed = [attr.key for attr in state.mapper.column_attrs
+                       if state.attrs[attr.key].history.has_changes()]
+            if changed:
+                rows.append({'entity_type': entity_type, 'entity_id': obj.id,
+                             'operation': 'update', 'changed_fields': changed})
+        if rows:
+            session.connection().execute(insert(ChangeLog), rows)
+    
+    @staticmethod
+    def _write_changes(connection, entity_type: str, entity_ids: List[int], operation: str,
+                       changed_fields: Optional[List[str]] = None):
+        """Record change_log rows for writes made with core statements (no flush events)"""
+        rows = [
+            {'entity_type': entity_type, 'entity_id': entity_id,
+             'operation': operation, 'changed_fields': changed_fields}
+            for entity_id in entity_ids
+        ]
+        if rows:
+            connection.execute(insert(ChangeLog), rows)
+    
+    # ==================== Full-Text Search ====================
+    
+    def search(self, session: Session, query: str, limit: int = 20, offset: int = 0,
+               entity_types: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Ranked full-text search over contacts, companies and job postings.
+
+        Args:
+            query: Free text (words are ANDed, last word is prefix-matched)
+            limit: Page size
+            offset: Number of hits to skip
+            entity_types: Subset of 'contact', 'company', 'job_posting' (default: all)
+
+        Returns:
+            {'hits': [...], 'has_more': bool}
+        """
+        if not self.fts_enabled:
+            raise SearchUnavailable("Full-text search requires SQLite with FTS5")
+
+        unknown = set(entity_types or []) - set(SEARCH_INDEXES)
+        if unknown:
+            raise ValueError(f"Unknown search types: {', '.join(sorted(unknown))}")
+
+        return search_index(session, query, limit=limit, offset=offset, entity_types=entity_types)
+    
     # ==================== Job Posting Operations ====================
     
     def create_job_posting(self, session: Session, **kwargs) -> JobPosting:
@@ -183,7 +1171,16 @@ class DatabaseManager:
     def get_job_posting_by_id(self, session: Session, job_id: str) -> Optional[JobPosting]:
         """Get job posting by external job ID"""
         return session.query(JobPosting).filter(JobPosting.job_id == job_id).first()
-    
+
+    def get_known_job_ids(self, session: Session, job_ids: List[str]) -> set:
+        """The external job IDs in job_ids that are already saved (one query per 500 IDs)"""
+        job_ids = list(job_ids)
+        known = set()
+        for i in range(0, len(job_ids), IN_CLAUSE_CHUNK_SIZE):
+            chunk = job_ids[i:i + IN_CLAUSE_CHUNK_SIZE]
+            known.update(session.execute(select(JobPosting.job_id).where(JobPosting.job_id.in_(chunk))).scalars())
+        return known
+
     def get_or_create_job_posting(self, session: Session, job_id: str, **kwargs) -> tuple[JobPosting, bool]:
         """Get existing job posting or create new one"""
         job = self.get_job_posting_by_id(session, job_id)
@@ -253,6 +1250,34 @@ class DatabaseManager:
         return history
 
 
+class BlockingAsyncSession:
+    """
+    Awaitable stand-in for AsyncSession over a sync Session, used when no async
+    driver is installed. Queries still run on (and block) the event loop.
+    """
+
+    def __init__(self, session: Session):
+        self._session = session
+
+    async def execute(self, statement, params=None):
+        return self._session.execute(statement, params)
+
+    async def scalar(self, statement, params=None):
+        return self._session.scalar(statement, params)
+
+    async def scalars(self, statement, params=None):
+        return self._session.scalars(statement, params)
+
+    async def close(self):
+        self._session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._session.close()
+
+
 # Global database manager instance
 db_manager = None
 
@@ -0,0 +1,6 @@
+"""Versioned schema migrations - applied automatically by DatabaseManager on startup"""
+
+from database.migrations.runner import run_migrations, current_version, migration_status
+from database.migrations.ops import backfill_in_batches
+
+__all__ = ['run_migrations', 'current_version', 'migration_status', 'backfill_in_batches']
@@ -0,0 +1,31 @@
+"""
+Show and apply schema migrations.
+
+Usage:
+    python -m database.migrations           # apply pending migrations
+    python -m database.migrations status    # list migrations and when they ran
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from database.db_manager import DatabaseManager
+from database.migrations.runner import migration_status
+
+
+def main():
+    # DatabaseManager applies pending migrations on construction
+    db_manager = DatabaseManager()
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'status':
+        for m in migration_status(db_manager.engine):
+            applied = m['applied_at'].strftime('%Y-%m-%d %H:%M') if m['applied_at'] else 'pending'
+            print(f"{m['version']:04d}  {m['name']:<40} {applied}")
+    else:
+        print("✅ Database schema is up to date")
+
+
+if __name__ == '__main__':
+    main()
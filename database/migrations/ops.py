@@ -0,0 +1,101 @@
+"""
+Schema operations for versioned migrations.
+Every helper is idempotent so migrations can also bring legacy databases
+(created before schema_version existed) up to date.
+"""
+
+import time
+import logging
+from typing import Callable
+
+from sqlalchemy import inspect, text
+
+logger = logging.getLogger(__name__)
+
+
+def has_table(connection, table: str) -> bool:
+    """True if the table exists"""
+    return inspect(connection).has_table(table)
+
+
+def has_column(connection, table: str, column: str) -> bool:
+    """True if table has the column"""
+    return any(c['name'] == column for c in inspect(connection).get_columns(table))
+
+
+def add_column(connection, table: str, column: str, ddl_type: str) -> bool:
+    """
+    ALTER TABLE ... ADD COLUMN unless the column is already there.
+
+    Args:
+        ddl_type: Column type and options, e.g. "VARCHAR(50) DEFAULT 'new'"
+
+    Returns:
+        True if the column was added
+    """
+    if has_column(connection, table, column):
+        return False
+    connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
+    logger.info(f"✅ Added column {table}.{column}")
+    return True
+
+
+def create_table(connection, model) -> bool:
+    """Create the table for a mapped model (with its indexes) if it doesn't exist"""
+    if has_table(connection, model.__tablename__):
+        return False
+    model.__table__.create(bind=connection)
+    logger.info(f"✅ Created table {model.__tablename__}")
+    return True
+
+
+def create_index(connection, model, index_name: str) -> bool:
+    """Create one of the model's declared indexes if it doesn't exist"""
+    for index in model.__table__.indexes:
+        if index.name == index_name:
+            existing = {i['name'] for i in inspect(connection).get_indexes(model.__tablename__)}
+            if index_name in existing:
+                return False
+            index.create(bind=connection)
+            logger.info(f"✅ Created index {index_name}")
+            return True
+    raise ValueError(f"{model.__name__} declares no index named {index_name}")
+
+
+def backfill_in_batches(engine, table: str, process_batch: Callable,
+                        batch_size: int = 10000, pause_seconds: float = 0.05,
+                        id_column: str = 'id') -> int:
+    """
+    Rewrite a large table online, one primary-key range at a time.
+
+    Each range [lo, hi) runs in its own short transaction, so the write lock is
+    released between batches and the app's writer can get in (pause_seconds
+    gives it a window). Ranges are walked by id rather than by matching rows,
+    so every batch costs about the same however sparse the matches are.
+
+    Args:
+        engine: Writer engine
+        table: Table to walk
+        process_batch: fn(connection, lo, hi) -> rows changed in that id range
+        batch_size: Width of each id range
+        pause_seconds: Sleep between batches
+
+    Returns:
+        Total rows changed
+    """
+    with engine.connect() as conn:
+        bounds = conn.execute(text(f"SELECT min({id_column}), max({id_column}) FROM {table}")).one()
+    if bounds[0] is None:
+        return 0
+
+    lo, max_id = bounds
+    changed = 0
+    while lo <= max_id:
+        hi = lo + batch_size
+        with engine.begin() as conn:
+            changed += process_batch(conn, lo, hi) or 0
+        logger.info(f"Backfill {table}: ids < {hi} done ({changed} rows changed)")
+        lo = hi
+        if pause_seconds and lo <= max_id:
+            time.sleep(pause_seconds)
+    return changed
@@ -0,0 +1,121 @@
+"""
+Versioned migration runner.
+
+Migrations live in database/migrations/versions as NNNN_description.py, each
+exposing upgrade(db_manager). Applied versions are recorded in schema_version,
+so startup only has to read one row when the schema is current.
+
+A database without schema_version (new, or created by the old ad-hoc scripts)
+is bootstrapped with create_all for any missing tables, then every migration
+runs - they are idempotent, so already-present columns and indexes are skipped.
+"""
+
+import re
+import time
+import logging
+import importlib.util
+from pathlib import Path
+from typing import List, NamedTuple, Callable
+
+from sqlalchemy import inspect, select, func
+from sqlalchemy.exc import IntegrityError
+
+from database.models import Base, SchemaVersion
+
+logger = logging.getLogger(__name__)
+
+VERSIONS_DIR = Path(__file__).parent / "versions"
+_FILENAME_RE = re.compile(r"^(\d{4})_(\w+)\.py$")
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    upgrade: Callable
+
+
+def discover_migrations() -> List[Migration]:
+    """Load every versions/NNNN_name.py in version order"""
+    migrations = []
+    for path in sorted(VERSIONS_DIR.glob("*.py")):
+        match = _FILENAME_RE.match(path.name)
+        if not match:
+            continue
+        spec = importlib.util.spec_from_file_location(f"database.migrations.versions.m{path.stem}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        migrations.append(Migration(int(match.group(1)), match.group(2), module.upgrade))
+
+    versions = [m.version for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"Duplicate migration versions in {VERSIONS_DIR}")
+    return migrations
+
+
+def current_version(engine) -> int:
+    """Highest applied version (0 if schema_version doesn't exist yet)"""
+    with engine.connect() as conn:
+        if not inspect(conn).has_table(SchemaVersion.__tablename__):
+            return 0
+        return conn.execute(select(func.max(SchemaVersion.version))).scalar() or 0
+
+
+def run_migrations(db_manager) -> List[int]:
+    """
+    Apply pending migrations in order.
+
+    Returns:
+        Versions applied by this call
+    """
+    engine = db_manager.engine
+    migrations = discover_migrations()
+    latest = migrations[-1].version if migrations else 0
+
+    version = current_version(engine)
+    if version >= latest:
+        return []
+
+    if version == 0:
+        # Bootstrap: create missing tables at the current model schema
+        logger.info("📝 No schema_version found - creating tables")
+        Base.metadata.create_all(bind=engine)
+
+    applied = []
+    for migration in migrations:
+        if migration.version <= version:
+            continue
+
+        logger.info(f"🔄 Applying migration {migration.version:04d}_{migration.name}...")
+        started = time.perf_counter()
+        migration.upgrade(db_manager)
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        try:
+            with engine.begin() as conn:
+                conn.execute(SchemaVersion.__table__.insert().values(
+                    version=migration.version, name=migration.name, duration_ms=duration_ms
+                ))
+        except IntegrityError:
+            # Another process applied it concurrently - migrations are idempotent
+            logger.info(f"Migration {migration.version:04d} already recorded")
+        applied.append(migration.version)
+        logger.info(f"✅ Migration {migration.version:04d}_{migration.name} applied ({duration_ms:.0f} ms)")
+
+    return applied
+
+
+def migration_status(engine) -> List[dict]:
+    """Every known migration with whether/when it was applied"""
+    with engine.connect() as conn:
+        applied = {}
+        if inspect(conn).has_table(SchemaVersion.__tablename__):
+            applied = {row.version: row for row in conn.execute(select(SchemaVersion))}
+
+    return [
+        {
+            'version': m.version,
+            'name': m.name,
+            'applied_at': applied[m.version].applied_at if m.version in applied else None,
+        }
+        for m in discover_migrations()
+    ]
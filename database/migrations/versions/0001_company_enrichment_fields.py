@@ -0,0 +1,16 @@
+"""
+Company AI enrichment fields and the company_profile table
+"""
+
+from database.models import CompanyProfile
+from database.migrations.ops import add_column, create_table
+
+
+def upgrade(db_manager):
+    with db_manager.engine.begin() as conn:
+        add_column(conn, 'companies', 'industry_analysis', 'TEXT')
+        add_column(conn, 'companies', 'pain_points', 'TEXT')
+        add_column(conn, 'companies', 'value_proposition', 'TEXT')
+        add_column(conn, 'companies', 'enrichment_notes', 'TEXT')
+        add_column(conn, 'companies', 'last_enriched_at', 'DATETIME')
+        create_table(conn, CompanyProfile)
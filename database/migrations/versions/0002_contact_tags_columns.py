@@ -0,0 +1,12 @@
+"""
+tags, source_reason and search_query on contacts
+"""
+
+from database.migrations.ops import add_column
+
+
+def upgrade(db_manager):
+    with db_manager.engine.begin() as conn:
+        add_column(conn, 'contacts', 'tags', 'TEXT')
+        add_column(conn, 'contacts', 'source_reason', 'VARCHAR(500)')
+        add_column(conn, 'contacts', 'search_query', 'VARCHAR(500)')
@@ -0,0 +1,15 @@
+"""
+LinkedIn automation workflow columns on contacts
+"""
+
+from database.migrations.ops import add_column
+
+
+def upgrade(db_manager):
+    with db_manager.engine.begin() as conn:
+        add_column(conn, 'contacts', 'workflow_stage', "VARCHAR(50) DEFAULT 'new'")
+        add_column(conn, 'contacts', 'last_action', 'VARCHAR(100)')
+        add_column(conn, 'contacts', 'last_action_date', 'DATETIME')
+        add_column(conn, 'contacts', 'next_action', 'VARCHAR(100)')
+        add_column(conn, 'contacts', 'next_action_date', 'DATETIME')
+        add_column(conn, 'contacts', 'automation_notes', 'TEXT')
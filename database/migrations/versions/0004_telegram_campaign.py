@@ -0,0 +1,12 @@
+"""
+Telegram campaign support: integrations.phone_number and telegram_messages
+"""
+
+from database.models import TelegramMessage
+from database.migrations.ops import add_column, create_table
+
+
+def upgrade(db_manager):
+    with db_manager.engine.begin() as conn:
+        add_column(conn, 'integrations', 'phone_number', 'VARCHAR(50)')
+        create_table(conn, TelegramMessage)
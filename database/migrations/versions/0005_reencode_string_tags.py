@@ -0,0 +1,47 @@
+"""
+Re-encode tags stored as strings into real JSON arrays.
+
+Older code wrote json.dumps(tags) into the JSON tags columns (double-encoded)
+and the legacy TEXT column could hold comma-separated tags. Rows are rewritten
+10k ids at a time so the write lock is never held for long. Runs before the
+tag index rebuild (0006), which reads these columns as JSON.
+"""
+
+import json
+
+from sqlalchemy import text
+
+from database.db_manager import normalize_tags
+from database.migrations.ops import backfill_in_batches
+
+
+def _decode(raw: str):
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        value = raw
+    return normalize_tags(value)
+
+
+def _reencode(table: str):
+    def process_batch(conn, lo: int, hi: int) -> int:
+        rows = conn.execute(text(
+            f"""SELECT id, tags FROM {table}
+                WHERE id >= :lo AND id < :hi AND tags IS NOT NULL
+                  AND (json_valid(tags) = 0 OR json_type(tags) != 'array')"""
+        ), {'lo': lo, 'hi': hi}).all()
+        for row in rows:
+            tags = _decode(row.tags)
+            conn.execute(
+                text(f"UPDATE {table} SET tags = :tags WHERE id = :id"),
+                {'tags': json.dumps(tags) if tags else None, 'id': row.id}
+            )
+        return len(rows)
+    return process_batch
+
+
+def upgrade(db_manager):
+    if db_manager.engine.dialect.name != 'sqlite':
+        return
+    for table in ('contacts', 'companies'):
+        backfill_in_batches(db_manager.engine, table, _reencode(table), batch_size=10000)
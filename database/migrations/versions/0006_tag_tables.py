@@ -0,0 +1,18 @@
+"""
+Normalized contact_tags / company_tags tables, backfilled from the JSON tag columns
+"""
+
+from database.models import ContactTag, CompanyTag
+from database.migrations.ops import create_table
+
+
+def upgrade(db_manager):
+    with db_manager.engine.begin() as conn:
+        create_table(conn, ContactTag)
+        create_table(conn, CompanyTag)
+
+    session = db_manager.get_session()
+    try:
+        db_manager.rebuild_tag_index(session)
+    finally:
+        session.close()
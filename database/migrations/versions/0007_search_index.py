@@ -0,0 +1,10 @@
+"""
+SQLite FTS5 full-text index over contacts, companies and job postings
+(previously re-created by create_tables on every startup)
+"""
+
+from database.search_index import create_search_index
+
+
+def upgrade(db_manager):
+    create_search_index(db_manager.engine)
@@ -0,0 +1,11 @@
+"""
+contacts(updated_at, id) index for keyset pagination
+"""
+
+from database.models import Contact
+from database.migrations.ops import create_index
+
+
+def upgrade(db_manager):
+    with db_manager.engine.begin() as conn:
+        create_index(conn, Contact, 'ix_contacts_updated_at_id')
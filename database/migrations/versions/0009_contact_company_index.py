@@ -0,0 +1,11 @@
+"""
+contacts.company_id index for the per-company contact counts
+"""
+
+from database.models import Contact
+from database.migrations.ops import create_index
+
+
+def upgrade(db_manager):
+    with db_manager.engine.begin() as conn:
+        create_index(conn, Contact, 'ix_contacts_company_id')
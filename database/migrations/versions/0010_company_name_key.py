@@ -0,0 +1,21 @@
+"""
+Canonical companies.name_key: add the column, merge existing duplicates,
+then enforce uniqueness
+"""
+
+from database.models import Company
+from database.migrations.ops import add_column, create_index
+
+
+def upgrade(db_manager):
+    with db_manager.engine.begin() as conn:
+        add_column(conn, 'companies', 'name_key', 'VARCHAR(255)')
+
+    session = db_manager.get_session()
+    try:
+        db_manager.merge_duplicate_companies(session)
+    finally:
+        session.close()
+
+    with db_manager.engine.begin() as conn:
+        create_index(conn, Company, 'ix_companies_name_key')
@@ -0,0 +1,17 @@
+"""
+crm_stats rollup table behind /api/stats, populated from the existing contacts
+"""
+
+from database.models import CrmStat
+from database.migrations.ops import create_table
+
+
+def upgrade(db_manager):
+    with db_manager.engine.begin() as conn:
+        create_table(conn, CrmStat)
+
+    session = db_manager.get_session()
+    try:
+        db_manager.reconcile_stats(session)
+    finally:
+        session.close()
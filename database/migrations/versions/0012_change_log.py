@@ -0,0 +1,12 @@
+"""
+change_log outbox table behind /api/changes. Starts empty - consumers do one
+full read, then follow the feed from the latest seq.
+"""
+
+from database.models import ChangeLog
+from database.migrations.ops import create_table
+
+
+def upgrade(db_manager):
+    with db_manager.engine.begin() as conn:
+        create_table(conn, ChangeLog)
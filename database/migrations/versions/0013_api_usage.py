@@ -0,0 +1,12 @@
+"""
+api_usage credit ledger for Apollo calls (see scrapers/apollo_usage.py),
+behind the daily credit budget and GET /api/usage.
+"""
+
+from database.models import ApiUsage
+from database.migrations.ops import create_table
+
+
+def upgrade(db_manager):
+    with db_manager.engine.begin() as conn:
+        create_table(conn, ApiUsage)
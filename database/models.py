@@ -3,7 +3,7 @@ Database models for LeadOn CRM
 Supports both Companies and People with job postings enrichment
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey, Boolean, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -17,6 +17,7 @@ class Company(Base):
     
     id = Column(Integer, primary_key=True)
     name = Column(String(255), nullable=False, index=True)
+    name_key = Column(String(255), unique=True, index=True)  # Canonical name for dedupe (see company_name_key)
     website = Column(String(500))
     industry = Column(String(255))
     description = Column(Text)
@@ -69,7 +70,7 @@ class Contact(Base):
     title = Column(String(255))
     
     # Company relationship
-    company_id = Column(Integer, ForeignKey('companies.id'), nullable=True)
+    company_id = Column(Integer, ForeignKey('companies.id'), nullable=True, index=True)
     company = relationship("Company", back_populates="contacts")
     company_name = Column(String(255))  # Denormalized for quick access
     
@@ -102,10 +103,51 @@ class Contact(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        Index('ix_contacts_updated_at_id', 'updated_at', 'id'),  # Keyset pagination by recency
+    )
+    
     def __repr__(self):
         return f"<Contact(id={self.id}, name='{self.name}', title='{self.title}')>"
 
 
+class ContactTag(Base):
+    """
+    Normalized contact tags for indexed filtering.
+    Mirrors Contact.tags (lowercased); kept in sync by DatabaseManager.
+    """
+    __tablename__ = 'contact_tags'
+
+    # Composite primary key doubles as the (tag, contact_id) lookup index
+    tag = Column(String(255), primary_key=True)
+    contact_id = Column(Integer, ForeignKey('contacts.id', ondelete='CASCADE'), primary_key=True)
+
+    __table_args__ = (
+        Index('ix_contact_tags_contact_id', 'contact_id'),
+    )
+
+    def __repr__(self):
+        return f"<ContactTag(contact_id={self.contact_id}, tag='{self.tag}')>"
+
+
+class CompanyTag(Base):
+    """
+    Normalized company tags for indexed filtering.
+    Mirrors Company.tags (lowercased); kept in sync by DatabaseManager.
+    """
+    __tablename__ = 'company_tags'
+
+    tag = Column(String(255), primary_key=True)
+    company_id = Column(Integer, ForeignKey('companies.id', ondelete='CASCADE'), primary_key=True)
+
+    __table_args__ = (
+        Index('ix_company_tags_company_id', 'company_id'),
+    )
+
+    def __repr__(self):
+        return f"<CompanyTag(company_id={self.company_id}, tag='{self.tag}')>"
+
+
 class JobPosting(Base):
     """Job posting model - scraped from LinkedIn, Indeed, etc."""
     __tablename__ = 'job_postings'
@@ -292,3 +334,83 @@ class SearchHistory(Base):
     def __repr__(self):
         return f"<SearchHistory(id={self.id}, query='{self.user_query[:50]}...')>"
 
+
+
+class SchemaVersion(Base):
+    """Applied schema migrations (see database/migrations)"""
+    __tablename__ = 'schema_version'
+
+    version = Column(Integer, primary_key=True)
+    name = Column(String(255), nullable=False)
+    applied_at = Column(DateTime, default=datetime.utcnow)
+    duration_ms = Column(Float)
+
+    def __repr__(self):
+        return f"<SchemaVersion(version={self.version}, name='{self.name}')>"
+
+
+class CrmStat(Base):
+    """
+    Contact count rollup for /api/stats, one row per (dimension, value).
+    Maintained incrementally by DatabaseManager; reconcile_stats() recomputes it.
+    """
+    __tablename__ = 'crm_stats'
+
+    dimension = Column(String(50), primary_key=True)  # 'total', 'tag', 'title', 'company', 'workflow_stage', 'source'
+    value = Column(String(255), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index('ix_crm_stats_dimension_count', 'dimension', 'count'),  # Top-N per dimension
+    )
+
+    def __repr__(self):
+        return f"<CrmStat(dimension='{self.dimension}', value='{self.value}', count={self.count})>"
+
+
+class ChangeLog(Base):
+    """
+    Append-only feed of contact/company/job posting writes, recorded in the same
+    transaction as the write. Consumers poll GET /api/changes?since=<seq>.
+    """
+    __tablename__ = 'change_log'
+
+    seq = Column(Integer, primary_key=True, autoincrement=True)  # Monotonic, never reused
+    entity_type = Column(String(30), nullable=False)  # 'contact', 'company', 'job_posting'
+    entity_id = Column(Integer, nullable=False)
+    operation = Column(String(10), nullable=False)  # 'insert', 'update', 'delete'
+    changed_fields = Column(JSON)  # Columns an update touched
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('ix_change_log_entity_type_seq', 'entity_type', 'seq'),  # ?since= filtered by type
+        {'sqlite_autoincrement': True},
+    )
+
+    def __repr__(self):
+        return f"<ChangeLog(seq={self.seq}, {self.operation} {self.entity_type} {self.entity_id})>"
+
+
+class ApiUsage(Base):
+    """
+    Apollo credit ledger: one row per API request sent or answered from the cache.
+    Written by ApolloUsageLedger; summarized by GET /api/usage.
+    """
+    __tablename__ = 'api_usage'
+
+    id = Column(Integer, primary_key=True)
+    provider = Column(String(30), nullable=False, default='apollo')
+    endpoint = Column(String(100), nullable=False)  # e.g. 'mixed_people/search', 'people/bulk_match'
+    caller = Column(String(100))  # usage_scope name, e.g. 'agentic_search'
+    credits = Column(Integer, nullable=False, default=0)
+    latency_ms = Column(Float)
+    cache_hit = Column(Boolean, nullable=False, default=False)
+    status_code = Column(Integer)  # None for cache hits and network errors
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('ix_api_usage_created_at', 'created_at'),  # Daily budget / usage windows
+    )
+
+    def __repr__(self):
+        return f"<ApiUsage({self.endpoint}, credits={self.credits}, caller='{self.caller}')>"
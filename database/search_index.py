@@ -0,0 +1,191 @@
+"""
+Full-text search index for LeadOn CRM
+SQLite FTS5 tables over contacts, companies and job postings, kept in sync by triggers
+"""
+
+import re
+import logging
+from typing import List, Dict, Any, Optional
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+
+class SearchUnavailable(RuntimeError):
+    """Full-text search was requested but this SQLite build has no FTS5"""
+
+
+# entity type -> index definition
+# columns are indexed in order; weights feed bm25() (higher = more important)
+SEARCH_INDEXES = {
+    'contact': {
+        'table': 'contacts',
+        'fts_table': 'contacts_fts',
+        'columns': ['name', 'title', 'company_name'],
+        'weights': [10.0, 5.0, 3.0],
+        'label': 'name',
+        'fields': ['name', 'title', 'company_name', 'email'],
+        'snippet_column': 1,
+    },
+    'company': {
+        'table': 'companies',
+        'fts_table': 'companies_fts',
+        'columns': ['name', 'description', 'industry_analysis'],
+        'weights': [10.0, 2.0, 1.0],
+        'label': 'name',
+        'fields': ['name', 'industry', 'website'],
+        'snippet_column': 1,
+    },
+    'job_posting': {
+        'table': 'job_postings',
+        'fts_table': 'job_postings_fts',
+        'columns': ['job_title', 'job_description'],
+        'weights': [5.0, 1.0],
+        'label': 'job_title',
+        'fields': ['job_title', 'company_name', 'location', 'url'],
+        'snippet_column': 1,
+    },
+}
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _ddl_for(spec: Dict[str, Any]) -> List[str]:
+    """CREATE statements for one external-content FTS5 table and its sync triggers"""
+    table = spec['table']
+    fts = spec['fts_table']
+    cols = ", ".join(spec['columns'])
+    new_vals = ", ".join(f"new.{c}" for c in spec['columns'])
+    old_vals = ", ".join(f"old.{c}" for c in spec['columns'])
+
+    return [
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                {cols},
+                content='{table}', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            )""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_vals});
+            END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+                INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_vals});
+            END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN
+                INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_vals});
+                INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_vals});
+            END""",
+    ]
+
+
+def create_search_index(engine) -> bool:
+    """
+    Create the FTS5 tables and triggers if missing, backfilling any newly created index.
+
+    Returns:
+        True if full-text search is available on this database
+    """
+    if engine.dialect.name != 'sqlite':
+        return False
+
+    try:
+        with engine.begin() as conn:
+            existing = {
+                row[0] for row in conn.execute(
+                    text("SELECT name FROM sqlite_master WHERE type = 'table'")
+                )
+            }
+            for spec in SEARCH_INDEXES.values():
+                for statement in _ddl_for(spec):
+                    conn.execute(text(statement))
+
+                if spec['fts_table'] not in existing:
+                    # New index over existing rows - populate it from the content table
+                    conn.execute(text(
+                        f"INSERT INTO {spec['fts_table']}({spec['fts_table']}) VALUES ('rebuild')"
+                    ))
+                    logger.info(f"Built full-text index {spec['fts_table']}")
+        return True
+
+    except Exception as e:
+        logger.warning(f"⚠️  Full-text search unavailable (FTS5 not supported?): {e}")
+        return False
+
+
+def has_search_index(engine) -> bool:
+    """True if every FTS table exists (created by migration 0007)"""
+    if engine.dialect.name != 'sqlite':
+        return False
+    with engine.connect() as conn:
+        existing = {
+            row[0] for row in conn.execute(
+                text("SELECT name FROM sqlite_master WHERE type = 'table'")
+            )
+        }
+    return all(spec['fts_table'] in existing for spec in SEARCH_INDEXES.values())
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 MATCH expression.
+    Every word must match (AND); the last word is a prefix so results
+    update as the user types.
+    """
+    tokens = _TOKEN_RE.findall(query or "")
+    if not tokens:
+        return None
+    terms = [f'"{t}"' for t in tokens[:-1]]
+    terms.append(f'"{tokens[-1]}"*')
+    return " ".join(terms)
+
+
+def search(session, query: str, limit: int = 20, offset: int = 0,
+           entity_types: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Ranked full-text search across contacts, companies and job postings.
+
+    Each index returns its best offset+limit hits; those are merged by bm25
+    score and the requested page is sliced out.
+
+    Returns:
+        {'hits': [...], 'has_more': bool}
+    """
+    match = build_match_query(query)
+    if not match:
+        return {'hits': [], 'has_more': False}
+
+    types = entity_types or list(SEARCH_INDEXES.keys())
+    window = offset + limit + 1  # one extra to know whether another page exists
+
+    hits = []
+    for entity_type in types:
+        spec = SEARCH_INDEXES[entity_type]
+        fts = spec['fts_table']
+        weights = ", ".join(str(w) for w in spec['weights'])
+        fields = ", ".join(f"t.{f}" for f in spec['fields'])
+
+        rows = session.execute(text(
+            f"""SELECT t.id AS id, {fields},
+                       bm25({fts}, {weights}) AS score,
+                       snippet({fts}, {spec['snippet_column']}, '<b>', '</b>', '…', 12) AS snippet
+                FROM {fts}
+                JOIN {spec['table']} t ON t.id = {fts}.rowid
+                WHERE {fts} MATCH :match
+                ORDER BY score
+                LIMIT :window"""
+        ), {'match': match, 'window': window}).mappings().all()
+
+        for row in rows:
+            hits.append({
+                'type': entity_type,
+                'id': row['id'],
+                'label': row[spec['label']],
+                'score': -row['score'],  # bm25() is lower-is-better; flip so higher = better
+                'snippet': row['snippet'] or None,
+                'fields': {f: row[f] for f in spec['fields']},
+            })
+
+    hits.sort(key=lambda h: h['score'], reverse=True)
+    page = hits[offset:offset + limit]
+
+    return {'hits': page, 'has_more': len(hits) > offset + limit}
@@ -1,8 +1,14 @@
+import asyncio
 import requests
-from bs4 import BeautifulSoup
+import httpx
 import urllib.parse as up
 import pandas as pd
-import time
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter, deque
+
+from scrapers.adaptive_rate import AdaptiveRateController, get_linkedin_rate_controller
+from scrapers.html_parsing import lexbor_tree, make_soup, only, resolve_backend
+from scrapers.html_cache import HtmlCache, get_html_cache
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/107.0.0.0 Safari/537.36"
@@ -15,8 +21,32 @@ def build_search_url(query, location, start=0, geo_id=None, current_job_id=None)
     if current_job_id: params["currentJobId"] = str(current_job_id)
     return f"{base}?{up.urlencode(params)}"
 
-def parse_job_ids(html):
-    soup = BeautifulSoup(html, "html.parser")
+# Elements the extractors below read - everything else on the page is skipped while parsing
+JOB_IDS_ONLY = only("li")
+JOB_DETAIL_ONLY = only(
+    "div.top-card-layout__card", "div.top-card-layout__entity-info", "ul.description__job-criteria-list",
+    "div.show-more-less-html__markup", "div.show-more-less-html", "div.description__text",
+    "section.description", "section.about-us__content", "div.jobs-unified-top-card__subtitle-primary-group",
+)
+JOB_DESCRIPTION_SELECTORS = [
+    "div.show-more-less-html__markup",              # inner markup
+    "div.show-more-less-html",                      # wrapper
+    "div.description__text",                        # legacy
+    "section.description",                          # fallback
+]
+COMPANY_DESCRIPTION_SELECTORS = [
+    "div.top-card-layout__card span.topcard__flavor",         # small about line
+    "div.top-card-layout__entity-info p",                     # short blurb
+    "section.about-us__content div",                          # rare variant
+    "div.jobs-unified-top-card__subtitle-primary-group",      # group text
+]
+
+def parse_job_ids(html, backend=None):
+    if resolve_backend(backend) == "selectolax":
+        return _job_ids_lexbor(html)
+    return job_ids_from_soup(make_soup(html, JOB_IDS_ONLY, backend))
+
+def job_ids_from_soup(soup):
     ids = []
     for li in soup.find_all("li"):
         card = li.find("div", {"class": "base-card"})
@@ -33,12 +63,42 @@ def extract_text(el):
     # Normalize whitespace and strip
     return " ".join(el.get_text(separator=" ", strip=True).split())
 
-def fetch_job_detail(job_id):
-    url = f"https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
-    resp = requests.get(url, headers=HEADERS, timeout=20)
+# Politeness: detail pages fetched at once per host. The request rate per host adapts
+# (scrapers/adaptive_rate.py), starting at LINKEDIN_REQUESTS_PER_SECOND
+MAX_CONCURRENCY_PER_HOST = 4
+
+# Search result pages a scrape may request before settling for fewer than n postings
+MAX_SEARCH_PAGES = 10
+
+def job_detail_url(job_id):
+    return f"https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
+
+def paced_get(url, headers=None, rate: AdaptiveRateController = None, **kwargs):
+    """requests.get paced by the host's adaptive rate, which the response then adjusts"""
+    rate = rate or get_linkedin_rate_controller()
+    rate.acquire(url)
+    resp = requests.get(url, headers={**HEADERS, **(headers or {})}, **kwargs)
+    rate.record(url, resp.status_code, empty=not resp.content.strip(), retry_after=resp.headers.get("Retry-After"))
+    return resp
+
+def fetch_job_detail(job_id, cache: HtmlCache = None):
+    url = job_detail_url(job_id)
+    resp = (cache or get_html_cache()).get(
+        url, "linkedin_job", lambda headers: paced_get(url, headers, timeout=20))
     resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
+    return parse_job_detail(job_id, resp.text)
+
+def reparse_cached_job_details(cache: HtmlCache = None, backend=None):
+    """parse_job_detail over every cached job detail page - re-extracts without refetching"""
+    return [parse_job_detail(url.rsplit("/", 1)[-1], html, backend)
+            for url, html in (cache or get_html_cache()).pages("linkedin_job")]
 
+def parse_job_detail(job_id, html, backend=None):
+    if resolve_backend(backend) == "selectolax":
+        return _job_detail_lexbor(job_id, html)
+    return job_detail_from_soup(job_id, make_soup(html, JOB_DETAIL_ONLY, backend))
+
+def job_detail_from_soup(job_id, soup):
     data = {"job_id": job_id}
 
     # Company name from logo alt
@@ -63,12 +123,7 @@ def fetch_job_detail(job_id):
     # Job description (expanded HTML container usually uses show-more-less-html)
     # Try multiple likely containers to be resilient
     jd_text = None
-    for selector in [
-        "div.show-more-less-html__markup",              # inner markup
-        "div.show-more-less-html",                      # wrapper
-        "div.description__text",                        # legacy
-        "section.description",                          # fallback
-    ]:
+    for selector in JOB_DESCRIPTION_SELECTORS:
         el = soup.select_one(selector)
         jd_text = extract_text(el)
         if jd_text: break
@@ -77,12 +132,7 @@ def fetch_job_detail(job_id):
     # Company description snippet (if present on job page)
     # Often appears near the company top card or aside as 'about' text
     comp_desc = None
-    for selector in [
-        "div.top-card-layout__card span.topcard__flavor",         # small about line
-        "div.top-card-layout__entity-info p",                     # short blurb
-        "section.about-us__content div",                          # rare variant
-        "div.jobs-unified-top-card__subtitle-primary-group",      # group text
-    ]:
+    for selector in COMPANY_DESCRIPTION_SELECTORS:
         el = soup.select_one(selector)
         comp_desc = extract_text(el)
         if comp_desc: break
@@ -90,31 +140,237 @@ def fetch_job_detail(job_id):
 
     return data
 
-def scrape_first_n_jobs(query, location, n=20, page_step=25, geo_id=None):
-    results, seen = [], set()
-    start = 0
-    while len(results) < n:
-        url = build_search_url(query, location, start=start, geo_id=geo_id)
-        r = requests.get(url, headers=HEADERS, timeout=20)
+# selectolax (lexbor) versions of the extractors above - same selectors, same results
+
+def _lexbor_text(node, separator=""):
+    return node.text(separator=separator, strip=True)
+
+def _extract_text_lexbor(node):
+    if not node: return None
+    return " ".join(_lexbor_text(node, " ").split())
+
+def _job_ids_lexbor(html):
+    ids = []
+    for li in lexbor_tree(html).css("li"):
+        card = li.css_first("div.base-card")
+        if not card: continue
+        urn = card.attributes.get("data-entity-urn")
+        if not urn or ":" not in urn: continue
+        parts = urn.split(":")
+        if len(parts) >= 4:
+            ids.append(parts[3])
+    return ids
+
+def _job_detail_lexbor(job_id, html):
+    tree = lexbor_tree(html)
+    data = {"job_id": job_id}
+
+    try:
+        data["company"] = tree.css_first("div.top-card-layout__card").css_first("a").css_first("img").attributes.get("alt")
+    except Exception:
+        data["company"] = None
+
+    try:
+        data["job_title"] = _lexbor_text(tree.css_first("div.top-card-layout__entity-info").css_first("a"))
+    except Exception:
+        data["job_title"] = None
+
+    try:
+        crit = tree.css_first("ul.description__job-criteria-list").css_first("li")
+        data["level"] = _lexbor_text(crit).replace("Seniority level", "").strip()
+    except Exception:
+        data["level"] = None
+
+    data["job_description"] = None
+    for selector in JOB_DESCRIPTION_SELECTORS:
+        data["job_description"] = _extract_text_lexbor(tree.css_first(selector))
+        if data["job_description"]: break
+
+    data["company_description"] = None
+    for selector in COMPANY_DESCRIPTION_SELECTORS:
+        data["company_description"] = _extract_text_lexbor(tree.css_first(selector))
+        if data["company_description"]: break
+
+    return data
+
+class AsyncJobScraper:
+    """
+    Fetches LinkedIn guest job pages over one pooled httpx client.
+
+    Requests are paced per host by an adaptive rate controller
+    (scrapers/adaptive_rate.py, shared with LinkedInScraper) that speeds up
+    while LinkedIn answers and backs off when it throttles, and at most
+    max_concurrency_per_host requests to a host are in flight at once. One
+    scraper can serve several scrape_first_n_jobs calls concurrently.
+
+    Detail pages go through the HTML cache (scrapers/html_cache.py); search
+    pages are always fetched.
+
+    Use as `async with AsyncJobScraper() as scraper:` or call aclose() when done.
+    """
+
+    def __init__(self, requests_per_second=None, max_concurrency_per_host=MAX_CONCURRENCY_PER_HOST,
+                 rate: AdaptiveRateController = None, timeout=20.0, cache: HtmlCache = None):
+        """
+        Args:
+            requests_per_second: Starting rate per host for a controller of this
+                                 scraper's own (default: the shared controller)
+            rate: Rate controller to pace with
+        """
+        if rate is None:
+            rate = (AdaptiveRateController(initial_rate=requests_per_second) if requests_per_second
+                    else get_linkedin_rate_controller())
+        self.rate = rate
+        self.max_concurrency_per_host = max_concurrency_per_host
+        self.cache = cache or get_html_cache()
+        self._host_slots = {}
+        # search_pages, detail_pages, known_skipped
+        self.stats = Counter()
+        self.client = httpx.AsyncClient(
+            headers=HEADERS,
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_concurrency_per_host * 2,
+                                max_keepalive_connections=max_concurrency_per_host * 2)
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def get(self, url, headers=None):
+        """GET a page once the host's rate and concurrency slots allow it"""
+        slots = self._host_slots.setdefault(up.urlsplit(url).hostname,
+                                            asyncio.Semaphore(self.max_concurrency_per_host))
+        # Reserve inside the slot so at most max_concurrency_per_host requests are queued
+        # ahead at a given rate - a rate change applies to everything after them
+        async with slots:
+            await self.rate.acquire_async(url)
+            resp = await self.client.get(url, headers=headers)
+        self.rate.record(url, resp.status_code, empty=not resp.content.strip(),
+                         retry_after=resp.headers.get("Retry-After"))
+        return resp
+
+    async def fetch_job_ids(self, query, location, start, geo_id=None):
+        """Job IDs on one search results page ([] at the end of the results, or on error)"""
+        try:
+            r = await self.get(build_search_url(query, location, start=start, geo_id=geo_id))
+        except httpx.HTTPError:
+            return []
+        self.stats["search_pages"] += 1
         if r.status_code != 200 or not r.text.strip():
-            break
-        ids = parse_job_ids(r.text)
-        if not ids:
-            break
-        for jid in ids:
-            if jid in seen: continue
-            seen.add(jid)
-            try:
-                detail = fetch_job_detail(jid)
-                results.append(detail)
-            except Exception:
-                continue
-            if len(results) >= n:
-                break
-            time.sleep(0.5)
-        start += page_step
-        time.sleep(0.8)
-    return results[:n]
+            return []
+        return parse_job_ids(r.text)
+
+    async def fetch_job_detail(self, job_id):
+        url = job_detail_url(job_id)
+
+        async def fetch(headers):
+            self.stats["detail_pages"] += 1
+            return await self.get(url, headers)
+
+        resp = await self.cache.get_async(url, "linkedin_job", fetch)
+        resp.raise_for_status()
+        return parse_job_detail(job_id, resp.text)
+
+    async def scrape_first_n_jobs(self, query, location, n=20, page_step=25, geo_id=None,
+                                  known=None, max_pages=MAX_SEARCH_PAGES):
+        """
+        First n job postings for a search, in search order, as fetch_job_detail dicts.
+
+        Detail pages are fetched concurrently, and the next search page is
+        requested while they're in flight whenever the IDs already found might
+        not yield n postings. Failed detail fetches are skipped and replaced by
+        the next ID.
+
+        Args:
+            known: Optional callable taking a page's new job IDs and returning the
+                   ones already saved - those are skipped without fetching their
+                   detail page, so the result is the first n *new* postings. It
+                   runs in a worker thread, so it may block (e.g. on a query)
+            max_pages: Search pages to request at most
+        """
+        results = {}            # discovery order -> detail
+        pending = deque()       # (discovery order, job ID) not fetched yet
+        seen = set()
+        discovered = 0
+        in_flight = {}          # detail task -> discovery order
+        start = 0
+        pages = 1
+        page_task = asyncio.ensure_future(self.fetch_job_ids(query, location, start, geo_id))
+        pages_exhausted = False
+
+        try:
+            while True:
+                while pending and len(results) + len(in_flight) < n:
+                    order, jid = pending.popleft()
+                    in_flight[asyncio.ensure_future(self.fetch_job_detail(jid))] = order
+
+                # Pipelining: next page while details are in flight, if they might fall short
+                if (page_task is None and not pages_exhausted and pages < max_pages
+                        and len(results) + len(in_flight) + len(pending) < n):
+                    pages += 1
+                    page_task = asyncio.ensure_future(self.fetch_job_ids(query, location, start, geo_id))
+
+                waiting = set(in_flight) | ({page_task} if page_task else set())
+                if not waiting:
+                    break
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    if task is page_task:
+                        page_task = None
+                        ids = task.result()
+                        if not ids:
+                            pages_exhausted = True
+                            continue
+                        start += page_step
+                        new_ids = [jid for jid in dict.fromkeys(ids) if jid not in seen]
+                        seen.update(new_ids)
+                        # known() usually queries the database - keep it off the event loop
+                        skip = await asyncio.to_thread(known, new_ids) if known and new_ids else set()
+                        self.stats["known_skipped"] += len(skip)
+                        for jid in new_ids:
+                            if jid in skip: continue
+                            discovered += 1
+                            pending.append((discovered, jid))
+                    else:
+                        order = in_flight.pop(task)
+                        if task.exception() is None:
+                            results[order] = task.result()
+        finally:
+            for task in [*in_flight, page_task]:
+                if task is not None and not task.done():
+                    task.cancel()
+
+        return [results[order] for order in sorted(results)][:n]
+
+
+async def scrape_first_n_jobs_async(query, location, n=20, page_step=25, geo_id=None, scraper=None,
+                                    known=None, max_pages=MAX_SEARCH_PAGES):
+    """Coroutine version of scrape_first_n_jobs (pass a scraper to share its connections)"""
+    if scraper is not None:
+        return await scraper.scrape_first_n_jobs(query, location, n, page_step, geo_id, known, max_pages)
+    async with AsyncJobScraper() as scraper:
+        return await scraper.scrape_first_n_jobs(query, location, n, page_step, geo_id, known, max_pages)
+
+def run_sync(coro):
+    """Run a coroutine to completion from sync code, even on a thread that has a running loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+def scrape_first_n_jobs(query, location, n=20, page_step=25, geo_id=None, known=None, max_pages=MAX_SEARCH_PAGES):
+    return run_sync(scrape_first_n_jobs_async(query, location, n, page_step, geo_id,
+                                              known=known, max_pages=max_pages))
 
 if __name__ == "__main__":
     query = "Software Engineer"              # change as needed
@@ -0,0 +1,211 @@
+"""
+Adaptive (AIMD) request pacing per host for the LinkedIn scrapers.
+
+Each host's rate starts at LINKEDIN_REQUESTS_PER_SECOND and, like TCP
+congestion control, grows additively while responses come back 200 with a
+body and is cut multiplicatively on a throttling signal - 429, LinkedIn's
+999 "request denied", a 503 or an empty page. Requests to a host are spaced
+1/rate apart on a schedule kept by the controller, so a rate change applies
+to the very next request. The state is per process: every scraper in the
+process shares one controller (get_linkedin_rate_controller()).
+
+Sync callers block in acquire(); async callers await acquire_async(), which
+never blocks the event loop.
+"""
+
+import os
+import time
+import asyncio
+import threading
+import urllib.parse as up
+from collections import Counter
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+from .apollo_retry import parse_retry_after
+
+
+# Requests per second per host: where each host starts, and the bounds it moves between
+INITIAL_RATE = float(os.getenv("LINKEDIN_REQUESTS_PER_SECOND", "2"))
+MAX_RATE = float(os.getenv("LINKEDIN_MAX_REQUESTS_PER_SECOND", "5"))
+MIN_RATE = 0.1
+
+# Additive increase: requests/second gained per second of successful responses
+ADDITIVE_INCREASE = 0.1
+# Multiplicative decrease on a throttling signal
+DECREASE_FACTOR = 0.5
+
+# Status codes that mean "slow down"
+THROTTLE_STATUSES = (429, 503, 999)
+
+
+class HostRate:
+    """AIMD state for one host"""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.next_at = 0.0  # Monotonic time the next request may be sent
+        self.last_decrease = 0.0
+        self.blocked_until = 0.0  # Retry-After from the last throttling response
+        self.counts: Counter = Counter()  # ok / throttled / other
+
+
+class AdaptiveRateController:
+    """Per-host AIMD request rate, with the pacing that enforces it"""
+
+    def __init__(self, initial_rate: Optional[float] = None, min_rate: float = MIN_RATE,
+                 max_rate: Optional[float] = None, additive_increase: float = ADDITIVE_INCREASE,
+                 decrease_factor: float = DECREASE_FACTOR):
+        """
+        Args:
+            initial_rate: Starting requests/second per host (defaults to LINKEDIN_REQUESTS_PER_SECOND)
+            min_rate: Floor the rate never drops below
+            max_rate: Ceiling (defaults to LINKEDIN_MAX_REQUESTS_PER_SECOND, at least initial_rate)
+            additive_increase: Requests/second gained per second of successes
+            decrease_factor: Rate multiplier on a throttling signal
+        """
+        self.initial_rate = initial_rate or INITIAL_RATE
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate or MAX_RATE, self.initial_rate)
+        self.additive_increase = additive_increase
+        self.decrease_factor = decrease_factor
+
+        self._hosts: Dict[str, HostRate] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host(url: str) -> str:
+        return up.urlsplit(url).hostname or url
+
+    def _state(self, host: str) -> HostRate:
+        """Host state, created on first use - call with the lock held"""
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = HostRate(self.initial_rate)
+        return state
+
+    def rate(self, url_or_host: str) -> float:
+        """Current requests/second for a host"""
+        with self._lock:
+            return self._state(self.host(url_or_host)).rate
+
+    def reserve(self, url: str) -> float:
+        """
+        Claim the next send slot for url's host.
+
+        Returns:
+            Seconds to wait before sending (0 if immediate)
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._state(self.host(url))
+            slot = max(now, state.next_at, state.blocked_until)
+            state.next_at = slot + 1.0 / state.rate
+        return slot - now
+
+    def acquire(self, url: str) -> float:
+        """
+        Block until a request to url's host may be sent (sync callers).
+
+        Returns:
+            Seconds waited
+        """
+        waited = 0.0
+        while True:
+            wait = self.reserve(url)
+            if wait > 0:
+                time.sleep(wait)
+            waited += wait
+            if not self._blocked(url):
+                return waited
+
+    async def acquire_async(self, url: str) -> float:
+        """
+        Wait until a request to url's host may be sent, without blocking the event loop.
+
+        Returns:
+            Seconds waited
+        """
+        waited = 0.0
+        while True:
+            wait = self.reserve(url)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            waited += wait
+            if not self._blocked(url):
+                return waited
+
+    def _blocked(self, url: str) -> bool:
+        """A Retry-After arrived while we waited - the slot we claimed is void"""
+        with self._lock:
+            return self._state(self.host(url)).blocked_until > time.monotonic()
+
+    def record(self, url: str, status_code: int, empty: bool = False, retry_after: Optional[str] = None):
+        """
+        Adjust the host's rate after a response.
+
+        Args:
+            url: Request URL
+            status_code: Response status
+            empty: The response had no body (LinkedIn's soft throttle)
+            retry_after: Retry-After header, if any
+        """
+        host = self.host(url)
+        throttled = status_code in THROTTLE_STATUSES or (status_code == 200 and empty)
+        now = time.monotonic()
+
+        with self._lock:
+            state = self._state(host)
+            if not throttled:
+                state.counts["ok" if status_code == 200 else "other"] += 1
+                if status_code == 200:
+                    # +additive_increase per second's worth of successes
+                    state.rate = min(self.max_rate, state.rate + self.additive_increase / state.rate)
+                return
+
+            state.counts["throttled"] += 1
+            wait = parse_retry_after(retry_after)
+            if wait:
+                state.blocked_until = max(state.blocked_until, now + wait)
+            # Requests already in flight were sent at the old rate - one cut per round trip
+            if now - state.last_decrease < max(1.0, 1.0 / state.rate):
+                return
+            state.rate = max(self.min_rate, state.rate * self.decrease_factor)
+            state.last_decrease = now
+            # Already-claimed slots were spaced at the old rate - push the next one out
+            state.next_at = max(state.next_at, now + 1.0 / state.rate)
+            rate = state.rate
+
+        reason = status_code if status_code in THROTTLE_STATUSES else "empty page"
+        logger.warning(f"🐢 {host} throttled ({reason}), slowing to {rate:.2f} req/s")
+
+    def stats(self) -> Dict[str, Any]:
+        """Current rate and response counts per host (this process)"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                host: {
+                    'requests_per_second': round(state.rate, 3),
+                    'min': self.min_rate,
+                    'max': self.max_rate,
+                    'ok': state.counts['ok'],
+                    'throttled': state.counts['throttled'],
+                    'other': state.counts['other'],
+                    'blocked_for_seconds': round(max(0.0, state.blocked_until - now), 1),
+                }
+                for host, state in self._hosts.items()
+            }
+
+
+_linkedin_rate: Optional[AdaptiveRateController] = None
+_linkedin_rate_lock = threading.Lock()
+
+
+def get_linkedin_rate_controller() -> AdaptiveRateController:
+    """Process-wide controller shared by the LinkedIn job and profile scrapers"""
+    global _linkedin_rate
+    with _linkedin_rate_lock:
+        if _linkedin_rate is None:
+            _linkedin_rate = AdaptiveRateController()
+        return _linkedin_rate
@@ -0,0 +1,198 @@
+"""
+Persistent cache for Apollo API responses.
+
+Raw JSON responses are stored in a SQLite file keyed by endpoint + a hash of
+the canonicalized request payload, with a per-endpoint TTL and LRU eviction
+once the cache holds more than max_entries. Shared by every process on the
+host, so a search or enrichment paid for once is not paid for again until
+it expires.
+"""
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "database" / "apollo_cache.db"
+
+# endpoint -> seconds a response stays fresh
+DEFAULT_TTLS = {
+    "mixed_people/search": 24 * 3600,
+    "mixed_companies/search": 7 * 24 * 3600,
+    "people/search": 24 * 3600,
+    "people/match": 30 * 24 * 3600,  # Enrichment spends credits - keep it longest
+    "organizations/enrich": 30 * 24 * 3600,
+}
+DEFAULT_TTL = 24 * 3600
+
+EVICT_EVERY = 100  # Check the size bound every N writes
+
+
+def apollo_endpoint(url: str) -> str:
+    """Endpoint path of an Apollo URL, e.g. .../api/v1/people/match -> people/match"""
+    path = url.split("?", 1)[0]
+    return path.split("/v1/", 1)[-1].strip("/")
+
+
+def canonical_key(endpoint: str, payload: Optional[Dict[str, Any]]) -> str:
+    """Cache key: endpoint + sha256 of the payload with sorted keys and no null fields"""
+    cleaned = {k: v for k, v in (payload or {}).items() if v is not None}
+    body = json.dumps(cleaned, sort_keys=True, separators=(",", ":"), default=str)
+    return f"{endpoint}:{hashlib.sha256(body.encode()).hexdigest()}"
+
+
+class ApolloResponseCache:
+    """SQLite-backed TTL + LRU cache of Apollo JSON responses"""
+
+    def __init__(self, db_path: Optional[str] = None, max_entries: int = 50000,
+                 ttls: Optional[Dict[str, int]] = None, enabled: Optional[bool] = None):
+        """
+        Args:
+            db_path: Cache file (defaults to APOLLO_CACHE_DB_PATH env var, then database/apollo_cache.db)
+            max_entries: Entries kept before least-recently-used ones are evicted
+            ttls: Per-endpoint TTL overrides in seconds
+            enabled: Turn the cache off entirely (defaults to APOLLO_CACHE_ENABLED, then on)
+        """
+        self.db_path = str(db_path or os.getenv("APOLLO_CACHE_DB_PATH") or DEFAULT_DB_PATH)
+        self.max_entries = max_entries
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        if enabled is None:
+            enabled = os.getenv("APOLLO_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+        self.enabled = enabled
+
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+        self._writes = 0
+
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Per-process connection (reopened after fork)"""
+        if self._conn is None or self._pid != os.getpid():
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS apollo_cache ("
+                "key TEXT PRIMARY KEY, endpoint TEXT NOT NULL, response TEXT NOT NULL, "
+                "created_at REAL NOT NULL, expires_at REAL NOT NULL, last_used_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_apollo_cache_last_used ON apollo_cache (last_used_at)")
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, endpoint: str, key_payload: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Cached response for a request, or None on a miss / expired entry.
+        Counts the hit or miss.
+        """
+        if not self.enabled:
+            return None
+
+        key = canonical_key(endpoint, key_payload)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT response, expires_at FROM apollo_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row and row[1] > now:
+                conn.execute("UPDATE apollo_cache SET last_used_at = ? WHERE key = ?", (now, key))
+                self.hits[endpoint] += 1
+                return json.loads(row[0])
+            if row:
+                conn.execute("DELETE FROM apollo_cache WHERE key = ?", (key,))
+
+        self.misses[endpoint] += 1
+        return None
+
+    def put(self, endpoint: str, key_payload: Optional[Dict[str, Any]], response: Dict[str, Any]):
+        """Store a response under the endpoint's TTL"""
+        if not self.enabled:
+            return
+
+        key = canonical_key(endpoint, key_payload)
+        now = time.time()
+        ttl = self.ttls.get(endpoint, DEFAULT_TTL)
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO apollo_cache "
+                "(key, endpoint, response, created_at, expires_at, last_used_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, endpoint, json.dumps(response), now, now + ttl, now)
+            )
+            self._writes += 1
+            if self._writes % EVICT_EVERY == 0:
+                self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop expired entries, then least-recently-used ones beyond max_entries"""
+        conn.execute("DELETE FROM apollo_cache WHERE expires_at <= ?", (time.time(),))
+        excess = conn.execute("SELECT count(*) FROM apollo_cache").fetchone()[0] - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM apollo_cache WHERE key IN "
+                "(SELECT key FROM apollo_cache ORDER BY last_used_at LIMIT ?)", (excess,)
+            )
+            logger.info(f"🧹 Evicted {excess} least-recently-used Apollo cache entries")
+
+    def clear(self):
+        """Remove every cached response"""
+        with self._lock:
+            self._connection().execute("DELETE FROM apollo_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process, plus the shared entry count"""
+        with self._lock:
+            entries = self._connection().execute("SELECT count(*) FROM apollo_cache").fetchone()[0]
+        hits, misses = sum(self.hits.values()), sum(self.misses.values())
+        return {
+            'enabled': self.enabled,
+            'entries': entries,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            'by_endpoint': {
+                endpoint: {'hits': self.hits[endpoint], 'misses': self.misses[endpoint]}
+                for endpoint in sorted(set(self.hits) | set(self.misses))
+            },
+        }
+
+
+def enrichment_cache_key(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    people/match cache key: the email (or LinkedIn URL) identifies the person,
+    so lookups that add name/domain hints still share one entry.
+    Falls back to the full payload for name-only lookups.
+    """
+    reveal = {k: payload.get(k) for k in ("reveal_personal_emails", "reveal_phone_number")}
+    if payload.get("email"):
+        return {"email": payload["email"].strip().lower(), **reveal}
+    if payload.get("linkedin_url"):
+        return {"linkedin_url": payload["linkedin_url"].strip().rstrip("/").lower(), **reveal}
+    return payload
+
+
+_apollo_cache: Optional[ApolloResponseCache] = None
+_apollo_cache_lock = threading.Lock()
+
+
+def get_apollo_cache() -> ApolloResponseCache:
+    """Process-wide cache instance (entries are shared between processes via SQLite)"""
+    global _apollo_cache
+    with _apollo_cache_lock:
+        if _apollo_cache is None:
+            _apollo_cache = ApolloResponseCache()
+        return _apollo_cache
@@ -0,0 +1,330 @@
+"""
+Error classification, retries and a circuit breaker for Apollo requests.
+
+Failed responses become ApolloError subclasses. Transient ones (429, 5xx,
+timeouts, dropped connections) are retried with exponential backoff and full
+jitter - or after Retry-After when Apollo sends one. Consecutive 5xx and
+connection failures open a process-wide circuit breaker; while it is open,
+requests fail fast with ApolloUnavailable instead of waiting on a dead API.
+"""
+
+import os
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from loguru import logger
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    Retrying,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+T = TypeVar("T")
+
+# Attempts per request, including the first
+MAX_ATTEMPTS = int(os.getenv("APOLLO_MAX_ATTEMPTS", "4"))
+
+# Exponential backoff with full jitter: up to 0.5s, 1s, 2s, ... capped at BACKOFF_MAX
+BACKOFF_INITIAL = 0.5
+BACKOFF_MAX = 20.0
+
+# A longer Retry-After gives up instead of holding the caller that long
+MAX_RETRY_AFTER = 60.0
+
+# Consecutive failures that open the breaker, and how long it stays open
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("APOLLO_CIRCUIT_FAILURES", "5"))
+CIRCUIT_RESET_SECONDS = float(os.getenv("APOLLO_CIRCUIT_RESET_SECONDS", "30"))
+
+
+class ApolloError(Exception):
+    """A failed Apollo request"""
+
+    def __init__(self, message: str, endpoint: Optional[str] = None,
+                 status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.endpoint = endpoint
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class ApolloRequestError(ApolloError):
+    """4xx - the request itself is wrong; retrying won't help"""
+
+
+class ApolloAuthError(ApolloRequestError):
+    """401/403 - missing or invalid API key, or the plan doesn't cover the endpoint"""
+
+
+class ApolloTransientError(ApolloError):
+    """Apollo couldn't answer right now; the same request may succeed later"""
+
+
+class ApolloRateLimited(ApolloTransientError):
+    """429 - Apollo's own rate limit"""
+
+
+class ApolloServerError(ApolloTransientError):
+    """5xx"""
+
+
+class ApolloConnectionError(ApolloTransientError):
+    """Timeout or dropped connection"""
+
+
+class ApolloUnavailable(ApolloTransientError):
+    """The circuit breaker is open - not sent"""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def error_for_response(response, endpoint: str) -> Optional[ApolloError]:
+    """The ApolloError for a requests or httpx response, or None if it succeeded"""
+    status = response.status_code
+    if status < 400:
+        return None
+
+    message = f"HTTP {status} from Apollo {endpoint}: {response.text[:200]}"
+    if status == 429:
+        return ApolloRateLimited(message, endpoint, status, parse_retry_after(response.headers.get("Retry-After")))
+    if status >= 500:
+        return ApolloServerError(message, endpoint, status, parse_retry_after(response.headers.get("Retry-After")))
+    if status in (401, 403):
+        return ApolloAuthError(message, endpoint, status)
+    return ApolloRequestError(message, endpoint, status)
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive 5xx/connection failures. While
+    open, calls fail fast; after `reset_timeout` one probe call is let through
+    (half-open) and its outcome closes or re-opens the circuit. 429s and 4xx
+    mean Apollo is up, so they don't count.
+
+    Every open or close starts a new generation. before_call() returns the
+    generation a call started in, and outcomes reported for an earlier one are
+    ignored - a slow request sent before the circuit opened can't pass for the
+    probe's result, and one sent before it closed can't count towards re-opening it.
+    """
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 reset_timeout: float = CIRCUIT_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_started: Optional[float] = None
+        self._generation = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def _state(self, now: float) -> str:
+        if self._opened_at is None:
+            return "closed"
+        return "half_open" if now - self._opened_at >= self.reset_timeout else "open"
+
+    def before_call(self, endpoint: str) -> int:
+        """
+        Returns:
+            The breaker generation the call starts in - pass it to record_success/record_failure
+
+        Raises:
+            ApolloUnavailable: While the circuit is open (or another call is probing it)
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._state(now)
+            if state == "closed":
+                return self._generation
+            # One probe at a time; a probe that never reported back is replaced after reset_timeout
+            if state == "half_open" and (self._probe_started is None
+                                         or now - self._probe_started >= self.reset_timeout):
+                self._probe_started = now
+                return self._generation
+            retry_in = max(0.0, self.reset_timeout - (now - self._opened_at))
+        retry_metrics.short_circuited[endpoint] += 1
+        raise ApolloUnavailable(f"Apollo circuit open after repeated failures - retry in {retry_in:.0f}s",
+                                endpoint, retry_after=retry_in)
+
+    def _stale(self, generation: Optional[int]) -> bool:
+        """The call started before the circuit last opened or closed - call with the lock held"""
+        return generation is not None and generation != self._generation
+
+    def record_success(self, generation: Optional[int] = None):
+        with self._lock:
+            if self._stale(generation):
+                return
+            if self._opened_at is not None:
+                logger.info("🔌 Apollo circuit closed")
+                self._generation += 1
+            self._failures = 0
+            self._opened_at = None
+            self._probe_started = None
+
+    def record_failure(self, generation: Optional[int] = None):
+        with self._lock:
+            if self._stale(generation):
+                return
+            self._failures += 1
+            probe_failed = self._opened_at is not None and self._probe_started is not None
+            if probe_failed or (self._opened_at is None and self._failures >= self.failure_threshold):
+                self._opened_at = time.monotonic()
+                self._probe_started = None
+                self._generation += 1
+                self.times_opened += 1
+                logger.warning(f"🔌 Apollo circuit open for {self.reset_timeout:.0f}s "
+                               f"after {self._failures} consecutive failures")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'state': self._state(time.monotonic()),
+                'consecutive_failures': self._failures,
+                'times_opened': self.times_opened,
+            }
+
+
+class RetryMetrics:
+    """Retry counters for this process"""
+
+    def __init__(self):
+        self.retries: Counter = Counter()  # (endpoint, reason) -> retries
+        self.gave_up: Counter = Counter()  # endpoint -> requests that failed after retrying
+        self.short_circuited: Counter = Counter()  # endpoint -> requests refused by the open breaker
+
+    def to_dict(self) -> Dict[str, Any]:
+        retries: Dict[str, Dict[str, int]] = {}
+        for (endpoint, reason), count in self.retries.items():
+            retries.setdefault(endpoint, {})[reason] = count
+        return {
+            'retries': retries,
+            'gave_up': dict(self.gave_up),
+            'short_circuited': dict(self.short_circuited),
+        }
+
+
+# Shared by every Apollo caller in the process
+breaker = CircuitBreaker()
+retry_metrics = RetryMetrics()
+
+
+def check_response(response, endpoint: str, generation: Optional[int] = None):
+    """
+    Raise the classified error for a failed response and tell the breaker how
+    the call went.
+
+    Args:
+        generation: What breaker.before_call() returned for this call
+
+    Returns:
+        The response, if it succeeded
+    """
+    error = error_for_response(response, endpoint)
+    if isinstance(error, ApolloServerError):
+        breaker.record_failure(generation)
+    elif not isinstance(error, ApolloRateLimited):
+        breaker.record_success(generation)
+    if error is not None:
+        raise error
+    return response
+
+
+def connection_error(error: Exception, endpoint: str, generation: Optional[int] = None) -> ApolloConnectionError:
+    """Classify a requests/httpx transport failure (and count it against the breaker)"""
+    breaker.record_failure(generation)
+    return ApolloConnectionError(f"Apollo {endpoint} request failed: {error}", endpoint)
+
+
+def _retryable(error: BaseException) -> bool:
+    return isinstance(error, ApolloTransientError) and not isinstance(error, ApolloUnavailable)
+
+
+class wait_retry_after:
+    """Wait Retry-After when Apollo sent one, else exponential backoff with full jitter"""
+
+    def __init__(self, initial: float = BACKOFF_INITIAL, maximum: float = BACKOFF_MAX):
+        self.backoff = wait_random_exponential(multiplier=initial, max=maximum)
+
+    def __call__(self, retry_state: RetryCallState) -> float:
+        retry_after = getattr(retry_state.outcome.exception(), "retry_after", None)
+        if retry_after is not None:
+            return retry_after
+        return self.backoff(retry_state)
+
+
+def _stop(max_attempts: int) -> Callable[[RetryCallState], bool]:
+    attempts = stop_after_attempt(max_attempts)
+
+    def stop(retry_state: RetryCallState) -> bool:
+        retry_after = getattr(retry_state.outcome.exception(), "retry_after", None)
+        return attempts(retry_state) or (retry_after is not None and retry_after > MAX_RETRY_AFTER)
+
+    return stop
+
+
+def _retry_policy(endpoint: str, max_attempts: Optional[int]) -> Dict[str, Any]:
+    def before_sleep(retry_state: RetryCallState):
+        error = retry_state.outcome.exception()
+        reason = str(error.status_code) if error.status_code else "connection"
+        retry_metrics.retries[(endpoint, reason)] += 1
+        logger.warning(f"🔁 Apollo {endpoint}: {reason}, retry {retry_state.attempt_number} "
+                       f"in {retry_state.next_action.sleep:.1f}s")
+
+    return {
+        'stop': _stop(max_attempts or MAX_ATTEMPTS),
+        'wait': wait_retry_after(),
+        'retry': retry_if_exception(_retryable),
+        'before_sleep': before_sleep,
+        'reraise': True,
+    }
+
+
+def call_with_retries(endpoint: str, attempt: Callable[[], T], max_attempts: Optional[int] = None) -> T:
+    """
+    Run attempt() until it succeeds, raises a non-transient error, or runs out
+    of attempts. attempt() should check the breaker and classify its own
+    failures (see check_response / connection_error).
+
+    Raises:
+        ApolloError: The last attempt's error
+    """
+    try:
+        return Retrying(**_retry_policy(endpoint, max_attempts))(attempt)
+    except ApolloTransientError as e:
+        if not isinstance(e, ApolloUnavailable):
+            retry_metrics.gave_up[endpoint] += 1
+        raise
+
+
+async def call_with_retries_async(endpoint: str, attempt: Callable[[], Awaitable[T]],
+                                  max_attempts: Optional[int] = None) -> T:
+    """Coroutine version of call_with_retries - backoff sleeps don't block the loop"""
+    try:
+        return await AsyncRetrying(**_retry_policy(endpoint, max_attempts))(attempt)
+    except ApolloTransientError as e:
+        if not isinstance(e, ApolloUnavailable):
+            retry_metrics.gave_up[endpoint] += 1
+        raise
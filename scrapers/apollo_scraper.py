@@ -1,18 +1,40 @@
 """
 Apollo.io API scraper for contact and company data.
 Implements the Apollo.io REST API for searching and enriching contacts.
+
+ApolloClient is the synchronous client used by the services; AsyncApolloClient
+exposes the same calls as coroutines over a pooled httpx connection so
+independent requests can run concurrently. Both share payload building and
+response parsing through ApolloClientBase.
 """
 
 import os
+import asyncio
+import importlib.util
 import requests
-from typing import Optional, List, Dict, Any
+import httpx
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, Tuple, Callable, Iterator, AsyncIterator
 from datetime import datetime
-from time import time, sleep
 
 from dotenv import load_dotenv
 from loguru import logger
 
 from .base_scraper import BaseScraper
+from .rate_limiter import TokenBucketLimiter, get_apollo_rate_limiter, apollo_bucket
+from .apollo_cache import ApolloResponseCache, get_apollo_cache, apollo_endpoint, enrichment_cache_key, canonical_key
+from .singleflight import SingleFlight, AsyncSingleFlight
+from .apollo_usage import ApolloUsageLedger, CreditBudgetExceeded, get_usage_ledger, scoped_submit
+from .apollo_retry import (
+    ApolloTransientError,
+    breaker,
+    call_with_retries,
+    call_with_retries_async,
+    check_response,
+    connection_error,
+    retry_metrics,
+)
+from .apollo_tags import person_tags
 from .schemas import (
     Contact,
     Organization,
@@ -25,29 +47,73 @@ from .schemas import (
 # Load environment variables
 load_dotenv()
 
+# httpx only speaks HTTP/2 when the h2 package is installed (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Apollo bills search API calls per page returned
+CREDITS_PER_SEARCH_PAGE = 1
+
+# Apollo stops paginating a search after 500 pages (50,000 records at per_page=100)
+MAX_SEARCH_PAGES = 500
+
+# Most records Apollo accepts in one bulk request
+BULK_MATCH_MAX = 10
+BULK_ORGANIZATION_ENRICH_MAX = 10
+
+# Identical requests in flight at the same time share one upstream call,
+# across every client instance in the process
+_flights = SingleFlight()
+_async_flights = AsyncSingleFlight()
+
+
+def coalesced_request_counts() -> Dict[str, int]:
+    """Requests per endpoint answered by another caller's identical in-flight request"""
+    return dict(_flights.coalesced + _async_flights.coalesced)
 
-class ApolloClient(BaseScraper):
+
+def normalize_domain(value: Optional[str]) -> Optional[str]:
+    """Bare lowercase domain of a website URL or domain, e.g. https://www.Acme.io/about -> acme.io"""
+    if not value:
+        return None
+    domain = value.strip().lower().split("://", 1)[-1].split("/", 1)[0].split(":", 1)[0]
+    if domain.startswith("www."):
+        domain = domain[4:]
+    return domain or None
+
+
+class ApolloClientBase:
     """
-    Apollo.io API client for searching and enriching contact data.
+    Configuration, rate limiting, payload building and response parsing shared
+    by ApolloClient and AsyncApolloClient. Subclasses only do the HTTP.
     """
-    
-    BASE_URL = "https://api.apollo.io/api/v1"
-    
+
+    # Override with APOLLO_BASE_URL (or base_url=) to point at a proxy or the offline stub
+    BASE_URL = os.getenv("APOLLO_BASE_URL", "https://api.apollo.io/api/v1")
+
+    # Run full pydantic validation on parsed people (slower; off for trusted Apollo data)
+    validate_responses = False
+
     def __init__(
         self,
         api_key: Optional[str] = None,
-        rate_limit_requests: int = 60,
-        rate_limit_window: int = 60
+        rate_limit_requests: Optional[int] = None,
+        rate_limit_window: int = 60,
+        rate_limiter: Optional[TokenBucketLimiter] = None,
+        cache: Optional[ApolloResponseCache] = None,
+        usage: Optional[ApolloUsageLedger] = None,
+        base_url: Optional[str] = None
     ):
         """
-        Initialize Apollo.io client.
-
         Args:
             api_key: Apollo.io API key (defaults to APOLLO_API_KEY env var)
-            rate_limit_requests: Max requests per time window
+            rate_limit_requests: Max requests per time window, per endpoint bucket
+                                 (defaults to APOLLO_REQUESTS_PER_MINUTE, then 60/min)
             rate_limit_window: Time window in seconds
+            rate_limiter: Limiter to draw from (defaults to the shared cross-process one)
+            cache: Response cache (defaults to the shared on-disk one)
+            usage: Credit ledger and budgets (defaults to the app-wide one)
+            base_url: API root (defaults to APOLLO_BASE_URL, then api.apollo.io)
         """
-        # Call parent class constructor
         super().__init__()
 
         # Get API key from parameter or environment
@@ -57,72 +123,83 @@ class ApolloClient(BaseScraper):
 
         # Set instance attributes
         self.api_key = api_key
-        self.rate_limit_requests = rate_limit_requests
-        self.rate_limit_window = rate_limit_window
-
-        # Create HTTP session
-        self.session = requests.Session()
-        self.session.headers.update({
+        if base_url:
+            self.BASE_URL = base_url.rstrip("/")
+        self.headers = {
             "Content-Type": "application/json",
             "Cache-Control": "no-cache",
             "X-Api-Key": self.api_key
-        })
+        }
 
-        # Rate limiting tracking
-        self.request_times = []
+        # Token buckets (search / match / other) shared by every Apollo caller on the host
+        self.rate_limiter = rate_limiter or get_apollo_rate_limiter(rate_limit_requests, rate_limit_window)
 
-        logger.info("Apollo.io client initialized")
+        # Responses already paid for, shared by every Apollo caller on the host
+        self.cache = cache or get_apollo_cache()
 
-    def _make_request(
-        self,
-        method: str,
-        url: str,
-        json_data: Optional[Dict[str, Any]] = None,
-        params: Optional[Dict[str, Any]] = None
-    ) -> requests.Response:
-        """
-        Make an HTTP request with rate limiting.
+        # Every request and cache hit is recorded in api_usage and checked against budgets
+        self.usage = usage or get_usage_ledger()
 
-        Args:
-            method: HTTP method (GET, POST, etc.)
-            url: Full URL to request
-            json_data: JSON data for POST requests
-            params: Query parameters for GET requests
+    def metrics(self) -> Dict[str, Any]:
+        """Response cache, request coalescing, retry and circuit breaker counters"""
+        return {
+            'cache': self.cache.stats(),
+            'coalesced': coalesced_request_counts(),
+            'retries': retry_metrics.to_dict(),
+            'circuit': breaker.stats(),
+        }
 
-        Returns:
-            Response object
-        """
-        # Rate limiting: ensure we don't exceed rate_limit_requests per rate_limit_window
-        current_time = time()
+    @staticmethod
+    def _flight_key(url: str, cache_key: Dict[str, Any], use_cache: bool) -> str:
+        """Requests with the same key are interchangeable and can share one call"""
+        return f"{canonical_key(apollo_endpoint(url), cache_key)}:{int(use_cache)}"
 
-        # Remove requests older than the time window
-        self.request_times = [t for t in self.request_times if current_time - t < self.rate_limit_window]
+    def _cached_response(self, url: str, cache_key: Dict[str, Any], use_cache: bool) -> Optional[Dict[str, Any]]:
+        """Fresh cached JSON for a request, or None if it has to be sent"""
+        if not use_cache:
+            return None
+        endpoint = apollo_endpoint(url)
+        data = self.cache.get(endpoint, cache_key)
+        if data is not None:
+            logger.info(f"💾 Apollo cache hit: {endpoint}")
+        return data
 
-        # If we've hit the rate limit, wait
-        if len(self.request_times) >= self.rate_limit_requests:
-            sleep_time = self.rate_limit_window - (current_time - self.request_times[0])
-            if sleep_time > 0:
-                logger.info(f"⏳ Rate limit reached, sleeping for {sleep_time:.1f}s")
-                sleep(sleep_time)
-                current_time = time()
-                self.request_times = [t for t in self.request_times if current_time - t < self.rate_limit_window]
+    def _next_page(self, data: Dict[str, Any], page: int, items: List[Any], yielded: int,
+                   credits: int, max_results: Optional[int], max_credits: Optional[int]) -> Optional[int]:
+        """
+        Page to prefetch after `page` when streaming a search, or None to stop there.
 
-        # Make the request
-        self.request_times.append(current_time)
+        Args:
+            data: Response for `page`
+            items: Parsed results of `page`
+            yielded: Results handed to the caller before `page`
+            credits: Credits spent so far, including `page`
+        """
+        total_pages = min((data.get("pagination") or {}).get("total_pages") or 0, MAX_SEARCH_PAGES)
+        if not items or page >= total_pages:
+            return None
+        if max_results is not None and yielded + len(items) >= max_results:
+            return None
+        if max_credits is not None and credits + CREDITS_PER_SEARCH_PAGE > max_credits:
+            logger.info(f"💳 Credit budget reached ({credits}/{max_credits}), stopping after page {page}")
+            return None
+        return page + 1
 
-        if method.upper() == "POST":
-            response = self.session.post(url, json=json_data)
-        elif method.upper() == "GET":
-            response = self.session.get(url, params=params)
-        else:
-            raise ValueError(f"Unsupported HTTP method: {method}")
+    def _handle_error(self, error: Exception, operation: str):
+        """
+        Log a failed API call (callers fall back to an empty result).
 
-        # Check for errors
-        response.raise_for_status()
+        Budget errors are re-raised - the workflow that set the budget has to
+        stop. So are transient errors that outlasted the retries (and an open
+        circuit): an empty result would look like a search that matched nobody.
+        """
+        if isinstance(error, (CreditBudgetExceeded, ApolloTransientError)):
+            raise error
+        logger.error(f"❌ Apollo {operation} failed: {error}")
 
-        return response
+    # ==================== Payloads ====================
 
-    def search_people(
+    def _people_search_payload(
         self,
         query: Optional[str] = None,
         titles: Optional[List[str]] = None,
@@ -134,28 +211,8 @@ class ApolloClient(BaseScraper):
         page: int = 1,
         per_page: int = 25,
         **kwargs
-    ) -> SearchResult:
-        """
-        Search for people using Apollo.io People Search API.
-        
-        Args:
-            query: General keyword search
-            titles: List of job titles (e.g., ["CEO", "CTO"])
-            locations: List of locations (e.g., ["San Francisco, CA, USA"])
-            seniorities: List of seniority levels (e.g., ["executive", "director"])
-            company_names: List of company names
-            industries: List of industries
-            employee_ranges: List of employee count ranges (e.g., ["11-50", "51-200"])
-            page: Page number (default 1)
-            per_page: Results per page (default 25, max 100)
-            **kwargs: Additional API parameters
-            
-        Returns:
-            SearchResult object with contacts
-        """
-        url = f"{self.BASE_URL}/mixed_people/search"
-        
-        # Build request payload
+    ) -> Dict[str, Any]:
+        """Request body for mixed_people/search (see search_people)"""
         payload = {
             "page": page,
             "per_page": min(per_page, 100)  # API max is 100
@@ -179,119 +236,9 @@ class ApolloClient(BaseScraper):
         
         # Add any additional parameters
         payload.update(kwargs)
-        
-        logger.info(f"Searching people with query: {query}, page: {page}")
-        
-        try:
-            response = self._make_request("POST", url, json_data=payload)
-            data = response.json()
+        return payload
 
-            # Debug: Log first person's raw data to see what Apollo returns
-            people = data.get("people", [])
-            if people and len(people) > 0:
-                logger.info(f"🔍 Sample raw data from Apollo (first contact):")
-                first_person = people[0]
-                logger.info(f"   Name: {first_person.get('name')}")
-                logger.info(f"   Title: {first_person.get('title')}")
-                logger.info(f"   Organization: {first_person.get('organization')}")
-
-            # Parse response
-            contacts = self._parse_people_response(data)
-            
-            # Build result
-            result = SearchResult(
-                contacts=contacts,
-                total_results=data.get("pagination", {}).get("total_entries", 0),
-                page=data.get("pagination", {}).get("page", page),
-                per_page=data.get("pagination", {}).get("per_page", per_page),
-                total_pages=data.get("pagination", {}).get("total_pages", 0),
-                query=query,
-                filters=payload
-            )
-            
-            logger.info(f"Found {len(contacts)} contacts (total: {result.total_results})")
-            return result
-            
-        except Exception as e:
-            self._handle_error(e, "search_people")
-            return SearchResult(contacts=[], total_results=0, page=page, per_page=per_page)
-    
-    def search(self, query: str, **kwargs) -> Dict[str, Any]:
-        """
-        Generic search method (implements abstract method from BaseScraper).
-        
-        Args:
-            query: Search query
-            **kwargs: Additional parameters
-            
-        Returns:
-            Search results as dict
-        """
-        result = self.search_people(query=query, **kwargs)
-        return result.model_dump()
-    
-    def enrich_person(
-        self,
-        email: Optional[str] = None,
-        first_name: Optional[str] = None,
-        last_name: Optional[str] = None,
-        domain: Optional[str] = None,
-        linkedin_url: Optional[str] = None,
-        reveal_personal_emails: bool = True,
-        reveal_phone_number: bool = True
-    ) -> Optional[Contact]:
-        """
-        Enrich a person's data using Apollo.io People Enrichment API.
-        
-        Args:
-            email: Person's email address
-            first_name: Person's first name
-            last_name: Person's last name
-            domain: Company domain
-            linkedin_url: LinkedIn profile URL
-            reveal_personal_emails: Whether to reveal personal emails (uses credits)
-            reveal_phone_number: Whether to reveal phone numbers (uses credits)
-            
-        Returns:
-            Contact object with enriched data, or None if not found
-        """
-        url = f"{self.BASE_URL}/people/match"
-        
-        payload = {
-            "reveal_personal_emails": reveal_personal_emails,
-            "reveal_phone_number": reveal_phone_number
-        }
-        
-        if email:
-            payload["email"] = email
-        if first_name:
-            payload["first_name"] = first_name
-        if last_name:
-            payload["last_name"] = last_name
-        if domain:
-            payload["domain"] = domain
-        if linkedin_url:
-            payload["linkedin_url"] = linkedin_url
-        
-        logger.info(f"Enriching person: {email or linkedin_url or f'{first_name} {last_name}'}")
-        
-        try:
-            response = self._make_request("POST", url, json_data=payload)
-            data = response.json()
-            
-            if data.get("person"):
-                contact = self._parse_person(data["person"])
-                logger.info(f"Successfully enriched: {contact.name}")
-                return contact
-            else:
-                logger.warning("No person found for enrichment")
-                return None
-                
-        except Exception as e:
-            self._handle_error(e, "enrich_person")
-            return None
-    
-    def search_organizations(
+    def _organization_search_payload(
         self,
         query: Optional[str] = None,
         locations: Optional[List[str]] = None,
@@ -302,26 +249,8 @@ class ApolloClient(BaseScraper):
         page: int = 1,
         per_page: int = 25,
         **kwargs
-    ) -> SearchResult:
-        """
-        Search for organizations using Apollo.io Organization Search API.
-        
-        Args:
-            query: Company name or keyword search
-            locations: List of locations
-            employee_ranges: List of employee count ranges
-            industries: List of industries
-            funding_stages: List of funding stages
-            technologies: List of technologies used
-            page: Page number
-            per_page: Results per page
-            **kwargs: Additional API parameters
-            
-        Returns:
-            SearchResult object with organizations
-        """
-        url = f"{self.BASE_URL}/mixed_companies/search"
-        
+    ) -> Dict[str, Any]:
+        """Request body for mixed_companies/search (see search_organizations)"""
         payload = {
             "page": page,
             "per_page": min(per_page, 100)
@@ -341,31 +270,96 @@ class ApolloClient(BaseScraper):
             payload["organization_technology_slugs"] = technologies
         
         payload.update(kwargs)
+        return payload
+
+    def _enrich_person_payload(
+        self,
+        email: Optional[str] = None,
+        first_name: Optional[str] = None,
+        last_name: Optional[str] = None,
+        domain: Optional[str] = None,
+        linkedin_url: Optional[str] = None,
+        reveal_personal_emails: bool = True,
+        reveal_phone_number: bool = True
+    ) -> Dict[str, Any]:
+        """Request body for people/match (see enrich_person)"""
+        payload = {
+            "reveal_personal_emails": reveal_personal_emails,
+            "reveal_phone_number": reveal_phone_number
+        }
         
-        logger.info(f"Searching organizations with query: {query}, page: {page}")
+        if email:
+            payload["email"] = email
+        if first_name:
+            payload["first_name"] = first_name
+        if last_name:
+            payload["last_name"] = last_name
+        if domain:
+            payload["domain"] = domain
+        if linkedin_url:
+            payload["linkedin_url"] = linkedin_url
+        return payload
+
+    # ==================== Responses ====================
+
+    def _people_search_result(self, data: Dict[str, Any], payload: Dict[str, Any],
+                              query: Optional[str], page: int, per_page: int) -> SearchResult:
+        """Build the SearchResult for a mixed_people/search response"""
+        # Debug: Log first person's raw data to see what Apollo returns
+        people = data.get("people", [])
+        if people and len(people) > 0:
+            logger.info(f"🔍 Sample raw data from Apollo (first contact):")
+            first_person = people[0]
+            logger.info(f"   Name: {first_person.get('name')}")
+            logger.info(f"   Title: {first_person.get('title')}")
+            logger.info(f"   Organization: {first_person.get('organization')}")
+
+        # Parse response
+        contacts = self._parse_people_response(data)
         
-        try:
-            response = self._make_request("POST", url, json_data=payload)
-            data = response.json()
-            
-            organizations = self._parse_organizations_response(data)
-            
-            result = SearchResult(
-                organizations=organizations,
-                total_results=data.get("pagination", {}).get("total_entries", 0),
-                page=data.get("pagination", {}).get("page", page),
-                per_page=data.get("pagination", {}).get("per_page", per_page),
-                total_pages=data.get("pagination", {}).get("total_pages", 0),
-                query=query,
-                filters=payload
-            )
-            
-            logger.info(f"Found {len(organizations)} organizations (total: {result.total_results})")
-            return result
-            
-        except Exception as e:
-            self._handle_error(e, "search_organizations")
-            return SearchResult(organizations=[], total_results=0, page=page, per_page=per_page)
+        # Build result
+        result = SearchResult(
+            contacts=contacts,
+            total_results=data.get("pagination", {}).get("total_entries", 0),
+            page=data.get("pagination", {}).get("page", page),
+            per_page=data.get("pagination", {}).get("per_page", per_page),
+            total_pages=data.get("pagination", {}).get("total_pages", 0),
+            query=query,
+            filters=payload
+        )
+        
+        logger.info(f"Found {len(contacts)} contacts (total: {result.total_results})")
+        return result
+
+    def _organizations_search_result(self, data: Dict[str, Any], payload: Dict[str, Any],
+                                     query: Optional[str], page: int, per_page: int) -> SearchResult:
+        """Build the SearchResult for a mixed_companies/search response"""
+        organizations = self._parse_organizations_response(data)
+        
+        result = SearchResult(
+            organizations=organizations,
+            total_results=data.get("pagination", {}).get("total_entries", 0),
+            page=data.get("pagination", {}).get("page", page),
+            per_page=data.get("pagination", {}).get("per_page", per_page),
+            total_pages=data.get("pagination", {}).get("total_pages", 0),
+            query=query,
+            filters=payload
+        )
+        
+        logger.info(f"Found {len(organizations)} organizations (total: {result.total_results})")
+        return result
+
+    def _enrich_person_result(self, data: Dict[str, Any]) -> Optional[Contact]:
+        """Parse a people/match response (None if Apollo found no one)"""
+        if data.get("person"):
+            contact = self._parse_person(data["person"])
+            logger.info(f"Successfully enriched: {contact.name}")
+            return contact
+        else:
+            logger.warning("No person found for enrichment")
+            return None
+
+    # ==================== Parsing ====================
 
     def _parse_people_response(self, data: Dict[str, Any]) -> List[Contact]:
         """
@@ -394,103 +388,45 @@ class ApolloClient(BaseScraper):
         """
         Parse a single person object into a Contact.
 
+        Apollo's own records are trusted, so unless validate_responses is set
+        the Contact is built with model_construct and skips pydantic
+        validation (including the EmailStr check) - that was most of the cost
+        of parsing a large page.
+
         Args:
             person_data: Raw person data from API
 
         Returns:
             Contact object
         """
-        # Extract organization info
-        org = person_data.get("organization", {}) or {}
+        org = person_data.get("organization") or {}
         company_name = org.get("name")
 
-        # Extract industry from SIC/NAICS codes
-        sic_codes = org.get("sic_codes", [])
-        naics_codes = org.get("naics_codes", [])
-
-        # Generate tags based on title, seniority, and industry
-        tags = []
-        title = person_data.get("title", "").lower()
-        seniority = person_data.get("seniority", "").lower()
-
-        # Add role-based tags with more descriptive names
-        if any(word in title for word in ["ceo", "chief executive", "founder", "co-founder"]):
-            tags.append("role:ceo_founder")
-        if any(word in title for word in ["cto", "chief technology"]):
-            tags.append("role:cto")
-        if any(word in title for word in ["cfo", "chief financial"]):
-            tags.append("role:cfo")
-        if any(word in title for word in ["coo", "chief operating"]):
-            tags.append("role:coo")
-        if any(word in title for word in ["vp", "vice president"]):
-            tags.append("role:vp")
-        if "director" in title and "managing" not in title:
-            tags.append("role:director")
-        if "head of" in title or "head " in title:
-            tags.append("role:head")
-        if "engineer" in title:
-            tags.append("dept:engineering")
-        if any(word in title for word in ["sales", "revenue", "business development"]):
-            tags.append("dept:sales")
-        if "product" in title:
-            tags.append("dept:product")
-        if any(word in title for word in ["marketing", "growth"]):
-            tags.append("dept:marketing")
-
-        # Add seniority tag with better formatting
-        if seniority:
-            # Map Apollo seniority to readable tags
-            seniority_map = {
-                "c_suite": "C-Suite Executive",
-                "vp": "VP Level",
-                "director": "Director Level",
-                "manager": "Manager Level",
-                "senior": "Senior Level",
-                "entry": "Entry Level"
-            }
-            readable_seniority = seniority_map.get(seniority, seniority.title())
-            tags.append(f"seniority:{readable_seniority}")
-
-        # Add industry tags from codes (simplified mapping)
-        if "7372" in sic_codes or "541511" in naics_codes:
-            tags.append("industry:software")
-        if "7375" in sic_codes or "518" in naics_codes or "519" in naics_codes:
-            tags.append("industry:saas")
-        if "6282" in sic_codes or "523" in naics_codes:
-            tags.append("industry:fintech")
-        if "5045" in sic_codes or "334" in naics_codes:
-            tags.append("industry:hardware")
-        if "7371" in sic_codes or "541512" in naics_codes:
-            tags.append("industry:consulting")
-
-        # Debug: Log raw data for first contact to see what Apollo returns
-        person_name = person_data.get("name", "Unknown")
-        logger.debug(f"📋 Parsing contact: {person_name}")
-        logger.debug(f"   Title: {person_data.get('title')}")
-        logger.debug(f"   Tags generated: {tags}")
-        logger.debug(f"   Company name extracted: {company_name}")
-
         # Warn if company name is missing
         if not company_name:
-            logger.warning(f"⚠️  No company name for {person_name}")
+            logger.warning(f"⚠️  No company name for {person_data.get('name', 'Unknown')}")
+
+        phone_numbers = person_data.get("phone_numbers")
 
         # Build contact with only attributes that exist in the Contact schema
-        contact = Contact(
+        fields = dict(
             apollo_id=person_data.get("id"),
-            name=person_data.get("name", ""),
+            name=person_data.get("name") or "",
             title=person_data.get("title"),
             company=company_name,  # Contact schema uses 'company', not 'company_name'
             email=person_data.get("email"),
             linkedin_url=person_data.get("linkedin_url"),
-            phone=person_data.get("phone_numbers", [{}])[0].get("raw_number") if person_data.get("phone_numbers") else None,
+            phone=(phone_numbers[0] or {}).get("raw_number") if phone_numbers else None,
             city=person_data.get("city"),
             state=person_data.get("state"),
             country=person_data.get("country"),
-            tags=tags,  # Add generated tags
+            tags=person_tags(person_data),  # Title, seniority and industry tags
             source="apollo"  # Use "apollo" not "apollo.io"
         )
 
-        return contact
+        if self.validate_responses:
+            return Contact(**fields)
+        return Contact.model_construct(**fields)
 
     def _parse_organizations_response(self, data: Dict[str, Any]) -> List[Organization]:
         """
@@ -548,18 +484,716 @@ class ApolloClient(BaseScraper):
 
         return organization
 
-    def get_contact_details(self, contact_id: str) -> Dict[str, Any]:
+
+class ApolloClient(ApolloClientBase, BaseScraper):
+    """
+    Apollo.io API client for searching and enriching contact data.
+    """
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        rate_limit_requests: Optional[int] = None,
+        rate_limit_window: int = 60,
+        rate_limiter: Optional[TokenBucketLimiter] = None,
+        cache: Optional[ApolloResponseCache] = None,
+        usage: Optional[ApolloUsageLedger] = None,
+        base_url: Optional[str] = None,
+        timeout: float = 30.0
+    ):
         """
-        Get detailed information about a contact by ID.
+        Initialize Apollo.io client.
 
         Args:
-            contact_id: Apollo contact ID
-
-        Returns:
-            Dictionary with contact details
+            api_key: Apollo.io API key (defaults to APOLLO_API_KEY env var)
+            rate_limit_requests: Max requests per time window, per endpoint bucket
+            rate_limit_window: Time window in seconds
+            rate_limiter: Limiter to draw from (defaults to the shared cross-process one)
+            cache: Response cache (defaults to the shared on-disk one)
+            usage: Credit ledger and budgets (defaults to the app-wide one)
+            base_url: API root (defaults to APOLLO_BASE_URL, then api.apollo.io)
+            timeout: Per-request timeout in seconds
         """
-        # This method is required by BaseScraper but not currently used
-        # Can be implemented later if needed for enrichment
-        logger.warning(f"get_contact_details not implemented yet for contact_id: {contact_id}")
-        return {}
+        super().__init__(api_key, rate_limit_requests, rate_limit_window, rate_limiter, cache, usage, base_url)
+
+        self.timeout = timeout
 
+        # Create HTTP session
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+
+        logger.info("Apollo.io client initialized")
+
+    def _make_request(
+        self,
+        method: str,
+        url: str,
+        json_data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> requests.Response:
+        """
+        Make an HTTP request with rate limiting.
+
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            url: Full URL to request
+            json_data: JSON data for POST requests
+            params: Query parameters for GET requests
+
+        Returns:
+            Response object
+
+        Raises:
+            ApolloError: Classified failure; transient ones are raised only
+                         after the retries run out
+        """
+        if method.upper() not in ("GET", "POST"):
+            raise ValueError(f"Unsupported HTTP method: {method}")
+        endpoint = apollo_endpoint(url)
+
+        def attempt() -> requests.Response:
+            generation = breaker.before_call(endpoint)
+
+            # Budget check up front; endpoint, credits and latency recorded in api_usage
+            with self.usage.track(url, json_data, caller=type(self).__name__) as call:
+                # Rate limiting: every attempt draws from the endpoint's shared token bucket
+                # (after the budget check, so a refused request doesn't use up a token)
+                self.rate_limiter.acquire(apollo_bucket(url))
+                call.start()
+                try:
+                    if method.upper() == "POST":
+                        response = self.session.post(url, json=json_data, timeout=self.timeout)
+                    else:
+                        response = self.session.get(url, params=params, timeout=self.timeout)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    raise connection_error(e, endpoint, generation) from e
+                call.done(response)
+
+            return check_response(response, endpoint, generation)
+
+        return call_with_retries(endpoint, attempt)
+
+    def _fetch_json(self, url: str, payload: Dict[str, Any], cache_key: Optional[Dict[str, Any]] = None,
+                    use_cache: bool = True) -> Tuple[Dict[str, Any], bool]:
+        """
+        POST a request and return its JSON body, served from the response cache
+        while a fresh copy exists. Fresh responses are always written back.
+
+        Args:
+            cache_key: What identifies the request in the cache (defaults to the payload)
+            use_cache: False skips the cache lookup (the result is still stored)
+
+        Identical requests made concurrently from other threads wait for this
+        one and share its response.
+
+        Returns:
+            (JSON body, True if it cost nothing - served from the cache or shared)
+        """
+        cache_key = payload if cache_key is None else cache_key
+
+        def fetch():
+            data = self._cached_response(url, cache_key, use_cache)
+            if data is not None:
+                return data, True
+            data = self._make_request("POST", url, json_data=payload).json()
+            self.cache.put(apollo_endpoint(url), cache_key, data)
+            return data, False
+
+        (data, cached), shared = _flights.do(
+            self._flight_key(url, cache_key, use_cache), fetch, label=apollo_endpoint(url)
+        )
+        if cached or shared:
+            self.usage.record_cache_hit(url, caller=type(self).__name__)
+        return data, cached or shared
+
+    def _post_json(self, url: str, payload: Dict[str, Any], cache_key: Optional[Dict[str, Any]] = None,
+                   use_cache: bool = True) -> Dict[str, Any]:
+        """JSON body of a (possibly cached) POST - see _fetch_json"""
+        return self._fetch_json(url, payload, cache_key, use_cache)[0]
+
+    def _iter_search(self, url: str, build_payload: Callable[[int], Dict[str, Any]],
+                     parse: Callable[[Dict[str, Any]], List[Any]], max_results: Optional[int],
+                     max_credits: Optional[int], use_cache: bool) -> Iterator[Any]:
+        """Yield parsed results page by page, fetching the next page in the background"""
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="apollo-prefetch")
+        fetch = lambda page: self._fetch_json(url, build_payload(page), use_cache=use_cache)
+        yielded = credits = 0
+        page = 1
+        future = scoped_submit(executor, fetch, page)
+        try:
+            while future is not None:
+                data, cached = future.result()
+                credits += 0 if cached else CREDITS_PER_SEARCH_PAGE
+                items = parse(data)
+                logger.info(f"📄 Page {page}: {len(items)} results ({credits} credits used)")
+
+                next_page = self._next_page(data, page, items, yielded, credits, max_results, max_credits)
+                future = scoped_submit(executor, fetch, next_page) if next_page else None
+                page = next_page
+
+                for item in items:
+                    if max_results is not None and yielded >= max_results:
+                        return
+                    yield item
+                    yielded += 1
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def iter_people(self, max_results: Optional[int] = None, max_credits: Optional[int] = None,
+                    per_page: int = 100, use_cache: bool = True, **search_kwargs) -> Iterator[Contact]:
+        """
+        Stream people matching a search one Contact at a time, across pages.
+        Page N+1 is fetched in the background while the caller works through
+        page N, so memory stays at about two pages however many results there are.
+
+        Args:
+            max_results: Stop after this many contacts
+            max_credits: Don't request a page that would take spend past this (cached pages are free)
+            per_page: Page size (max 100)
+            use_cache: False forces fresh requests
+            **search_kwargs: Filters accepted by search_people (titles, locations, ...)
+
+        Raises:
+            ApolloError: If a page request fails (after retries, for transient errors)
+        """
+        url = f"{self.BASE_URL}/mixed_people/search"
+        return self._iter_search(
+            url, lambda page: self._people_search_payload(page=page, per_page=per_page, **search_kwargs),
+            self._parse_people_response, max_results, max_credits, use_cache
+        )
+
+    def iter_organizations(self, max_results: Optional[int] = None, max_credits: Optional[int] = None,
+                           per_page: int = 100, use_cache: bool = True, **search_kwargs) -> Iterator[Organization]:
+        """
+        Stream organizations matching a search one at a time, across pages
+        (see iter_people).
+
+        Args:
+            **search_kwargs: Filters accepted by search_organizations
+        """
+        url = f"{self.BASE_URL}/mixed_companies/search"
+        return self._iter_search(
+            url, lambda page: self._organization_search_payload(page=page, per_page=per_page, **search_kwargs),
+            self._parse_organizations_response, max_results, max_credits, use_cache
+        )
+
+    def search_people(
+        self,
+        query: Optional[str] = None,
+        titles: Optional[List[str]] = None,
+        locations: Optional[List[str]] = None,
+        seniorities: Optional[List[str]] = None,
+        company_names: Optional[List[str]] = None,
+        industries: Optional[List[str]] = None,
+        employee_ranges: Optional[List[str]] = None,
+        page: int = 1,
+        per_page: int = 25,
+        use_cache: bool = True,
+        **kwargs
+    ) -> SearchResult:
+        """
+        Search for people using Apollo.io People Search API.
+        
+        Args:
+            query: General keyword search
+            titles: List of job titles (e.g., ["CEO", "CTO"])
+            locations: List of locations (e.g., ["San Francisco, CA, USA"])
+            seniorities: List of seniority levels (e.g., ["executive", "director"])
+            company_names: List of company names
+            industries: List of industries
+            employee_ranges: List of employee count ranges (e.g., ["11-50", "51-200"])
+            page: Page number (default 1)
+            per_page: Results per page (default 25, max 100)
+            use_cache: False forces a fresh request (the response still refreshes the cache)
+            **kwargs: Additional API parameters
+            
+        Returns:
+            SearchResult object with contacts
+        """
+        url = f"{self.BASE_URL}/mixed_people/search"
+        payload = self._people_search_payload(
+            query, titles, locations, seniorities, company_names, industries,
+            employee_ranges, page, per_page, **kwargs
+        )
+        
+        logger.info(f"Searching people with query: {query}, page: {page}")
+        
+        try:
+            data = self._post_json(url, payload, use_cache=use_cache)
+            return self._people_search_result(data, payload, query, page, per_page)
+            
+        except Exception as e:
+            self._handle_error(e, "search_people")
+            return SearchResult(contacts=[], total_results=0, page=page, per_page=per_page)
+    
+    def search(self, query: str, **kwargs) -> Dict[str, Any]:
+        """
+        Generic search method (implements abstract method from BaseScraper).
+        
+        Args:
+            query: Search query
+            **kwargs: Additional parameters
+            
+        Returns:
+            Search results as dict
+        """
+        result = self.search_people(query=query, **kwargs)
+        return result.model_dump()
+    
+    def enrich_person(
+        self,
+        email: Optional[str] = None,
+        first_name: Optional[str] = None,
+        last_name: Optional[str] = None,
+        domain: Optional[str] = None,
+        linkedin_url: Optional[str] = None,
+        reveal_personal_emails: bool = True,
+        reveal_phone_number: bool = True,
+        use_cache: bool = True
+    ) -> Optional[Contact]:
+        """
+        Enrich a person's data using Apollo.io People Enrichment API.
+        
+        Args:
+            email: Person's email address
+            first_name: Person's first name
+            last_name: Person's last name
+            domain: Company domain
+            linkedin_url: LinkedIn profile URL
+            reveal_personal_emails: Whether to reveal personal emails (uses credits)
+            reveal_phone_number: Whether to reveal phone numbers (uses credits)
+            use_cache: False forces a fresh lookup. Otherwise results are reused
+                       by email / LinkedIn URL, so a person is only paid for once
+            
+        Returns:
+            Contact object with enriched data, or None if not found
+        """
+        url = f"{self.BASE_URL}/people/match"
+        payload = self._enrich_person_payload(
+            email, first_name, last_name, domain, linkedin_url,
+            reveal_personal_emails, reveal_phone_number
+        )
+        
+        logger.info(f"Enriching person: {email or linkedin_url or f'{first_name} {last_name}'}")
+        
+        try:
+            data = self._post_json(url, payload, enrichment_cache_key(payload), use_cache)
+            return self._enrich_person_result(data)
+                
+        except Exception as e:
+            self._handle_error(e, "enrich_person")
+            return None
+    
+    def search_organizations(
+        self,
+        query: Optional[str] = None,
+        locations: Optional[List[str]] = None,
+        employee_ranges: Optional[List[str]] = None,
+        industries: Optional[List[str]] = None,
+        funding_stages: Optional[List[str]] = None,
+        technologies: Optional[List[str]] = None,
+        page: int = 1,
+        per_page: int = 25,
+        use_cache: bool = True,
+        **kwargs
+    ) -> SearchResult:
+        """
+        Search for organizations using Apollo.io Organization Search API.
+        
+        Args:
+            query: Company name or keyword search
+            locations: List of locations
+            employee_ranges: List of employee count ranges
+            industries: List of industries
+            funding_stages: List of funding stages
+            technologies: List of technologies used
+            page: Page number
+            per_page: Results per page
+            use_cache: False forces a fresh request (the response still refreshes the cache)
+            **kwargs: Additional API parameters
+            
+        Returns:
+            SearchResult object with organizations
+        """
+        url = f"{self.BASE_URL}/mixed_companies/search"
+        payload = self._organization_search_payload(
+            query, locations, employee_ranges, industries, funding_stages,
+            technologies, page, per_page, **kwargs
+        )
+        
+        logger.info(f"Searching organizations with query: {query}, page: {page}")
+        
+        try:
+            data = self._post_json(url, payload, use_cache=use_cache)
+            return self._organizations_search_result(data, payload, query, page, per_page)
+            
+        except Exception as e:
+            self._handle_error(e, "search_organizations")
+            return SearchResult(organizations=[], total_results=0, page=page, per_page=per_page)
+
+    def bulk_enrich_organizations(self, domains: List[str], use_cache: bool = True,
+                                  max_workers: int = 4) -> Dict[str, Organization]:
+        """
+        Enrich organizations by domain through Apollo's bulk endpoint.
+
+        Domains are sent BULK_ORGANIZATION_ENRICH_MAX per request, with the
+        chunks in flight concurrently over the client's pooled session. Each
+        organization is cached on its own, so a domain is only paid for once
+        whichever batch it arrives in.
+
+        Args:
+            domains: Company domains or website URLs
+            use_cache: False forces fresh lookups (results still refresh the cache)
+            max_workers: Chunks sent at once
+
+        Returns:
+            {normalized domain: Organization} for the domains Apollo found.
+            Missing domains were not found, their chunk failed, or the credit
+            budget ran out before it was sent.
+        """
+        url = f"{self.BASE_URL}/organizations/bulk_enrich"
+        endpoint = "organizations/enrich"
+        found = {}
+        pending = []
+
+        for domain in dict.fromkeys(filter(None, map(normalize_domain, domains))):
+            cached = self.cache.get(endpoint, {"domain": domain}) if use_cache else None
+            if cached is None:
+                pending.append(domain)
+            elif cached.get("organization"):
+                found[domain] = self._parse_organization(cached["organization"])
+
+        if not pending:
+            return found
+
+        def fetch(chunk: List[str]) -> List[Optional[Dict[str, Any]]]:
+            data = self._make_request("POST", url, json_data={"domains": chunk}).json()
+            orgs = data.get("organizations") or []
+            if len(orgs) == len(chunk):
+                return orgs  # One entry (or null) per requested domain, in order
+            by_domain = {normalize_domain(o.get("primary_domain") or o.get("website_url")): o for o in orgs if o}
+            return [by_domain.get(domain) for domain in chunk]
+
+        chunks = [pending[i:i + BULK_ORGANIZATION_ENRICH_MAX]
+                  for i in range(0, len(pending), BULK_ORGANIZATION_ENRICH_MAX)]
+        logger.info(f"Bulk enriching {len(pending)} organizations in {len(chunks)} requests")
+
+        over_budget = None
+        budget_skipped = 0
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="apollo-bulk") as executor:
+            futures = [scoped_submit(executor, fetch, chunk) for chunk in chunks]
+            for chunk, future in zip(chunks, futures):
+                if future.cancelled():
+                    budget_skipped += len(chunk)
+                    continue
+                try:
+                    orgs = future.result()
+                except CreditBudgetExceeded as e:
+                    # Nothing was sent - and the chunks still queued would be refused too
+                    if over_budget is None:
+                        over_budget = e
+                        for queued in futures:
+                            queued.cancel()
+                    budget_skipped += len(chunk)
+                    continue
+                except ApolloTransientError as e:
+                    # Treated like not found - callers fall back to other lookups
+                    logger.error(f"❌ Apollo bulk_enrich_organizations failed: {e}")
+                    continue
+                except Exception as e:
+                    self._handle_error(e, "bulk_enrich_organizations")
+                    continue
+                for domain, org_data in zip(chunk, orgs):
+                    self.cache.put(endpoint, {"domain": domain}, {"organization": org_data})
+                    if org_data:
+                        found[domain] = self._parse_organization(org_data)
+
+        if over_budget is not None:
+            logger.warning(f"💳 {over_budget} - {budget_skipped} domains not looked up")
+        return found
+
+    def get_contact_details(self, contact_id: str) -> Dict[str, Any]:
+        """
+        Get detailed information about a contact by ID.
+
+        Args:
+            contact_id: Apollo contact ID
+
+        Returns:
+            Dictionary with contact details
+        """
+        # This method is required by BaseScraper but not currently used
+        # Can be implemented later if needed for enrichment
+        logger.warning(f"get_contact_details not implemented yet for contact_id: {contact_id}")
+        return {}
+
+
+
+class AsyncApolloClient(ApolloClientBase):
+    """
+    Async Apollo.io client. All coroutines share one keep-alive connection pool
+    (HTTP/2 when h2 is installed) and at most max_concurrency requests are in
+    flight at once, so callers can gather() independent searches freely.
+
+    Use as `async with AsyncApolloClient() as apollo:` or call aclose() when done.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        rate_limit_requests: Optional[int] = None,
+        rate_limit_window: int = 60,
+        rate_limiter: Optional[TokenBucketLimiter] = None,
+        cache: Optional[ApolloResponseCache] = None,
+        usage: Optional[ApolloUsageLedger] = None,
+        base_url: Optional[str] = None,
+        max_concurrency: int = 10,
+        timeout: float = 30.0
+    ):
+        """
+        Args:
+            api_key: Apollo.io API key (defaults to APOLLO_API_KEY env var)
+            rate_limit_requests: Max requests per time window, per endpoint bucket
+            rate_limit_window: Time window in seconds
+            rate_limiter: Limiter to draw from (defaults to the shared cross-process one)
+            cache: Response cache (defaults to the shared on-disk one)
+            usage: Credit ledger and budgets (defaults to the app-wide one)
+            base_url: API root (defaults to APOLLO_BASE_URL, then api.apollo.io)
+            max_concurrency: Max requests in flight (also the connection pool size)
+            timeout: Per-request timeout in seconds
+        """
+        super().__init__(api_key, rate_limit_requests, rate_limit_window, rate_limiter, cache, usage, base_url)
+
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            headers=self.headers,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_concurrency,
+                                max_keepalive_connections=max_concurrency)
+        )
+
+        logger.info(f"Async Apollo.io client initialized (max_concurrency={max_concurrency}, "
+                    f"http2={HTTP2_AVAILABLE})")
+
+    async def __aenter__(self) -> "AsyncApolloClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close pooled connections"""
+        await self.client.aclose()
+
+    async def _make_request(
+        self,
+        method: str,
+        url: str,
+        json_data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> httpx.Response:
+        """
+        Make an HTTP request with rate limiting and the concurrency bound.
+
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            url: Full URL to request
+            json_data: JSON data for POST requests
+            params: Query parameters for GET requests
+
+        Returns:
+            Response object
+
+        Raises:
+            ApolloError: Classified failure (see ApolloClient._make_request)
+        """
+        if method.upper() not in ("GET", "POST"):
+            raise ValueError(f"Unsupported HTTP method: {method}")
+        endpoint = apollo_endpoint(url)
+
+        async def attempt() -> httpx.Response:
+            # Today's spend is re-read off the loop, so track() below doesn't block on the database
+            await self.usage.refresh_daily_async()
+            generation = breaker.before_call(endpoint)
+
+            with self.usage.track(url, json_data, caller=type(self).__name__) as call:
+                # Rate limiting: wait for the endpoint's shared token bucket without blocking the loop
+                # (after the budget check, so a refused request doesn't use up a token)
+                await self.rate_limiter.acquire_async(apollo_bucket(url))
+                call.start()
+                try:
+                    async with self._semaphore:
+                        response = await self.client.request(method.upper(), url, json=json_data, params=params)
+                except httpx.TransportError as e:
+                    raise connection_error(e, endpoint, generation) from e
+                call.done(response)
+
+            return check_response(response, endpoint, generation)
+
+        # Backoff sleeps happen outside the semaphore, so they don't hold a connection slot
+        return await call_with_retries_async(endpoint, attempt)
+
+    async def _fetch_json(self, url: str, payload: Dict[str, Any], cache_key: Optional[Dict[str, Any]] = None,
+                          use_cache: bool = True) -> Tuple[Dict[str, Any], bool]:
+        """Coroutine version of ApolloClient._fetch_json"""
+        cache_key = payload if cache_key is None else cache_key
+
+        async def fetch():
+            # The cache is SQLite - read and write it off the event loop
+            data = await asyncio.to_thread(self._cached_response, url, cache_key, use_cache)
+            if data is not None:
+                return data, True
+            response = await self._make_request("POST", url, json_data=payload)
+            data = response.json()
+            await asyncio.to_thread(self.cache.put, apollo_endpoint(url), cache_key, data)
+            return data, False
+
+        (data, cached), shared = await _async_flights.do(
+            self._flight_key(url, cache_key, use_cache), fetch, label=apollo_endpoint(url)
+        )
+        if cached or shared:
+            self.usage.record_cache_hit(url, caller=type(self).__name__)
+        return data, cached or shared
+
+    async def _post_json(self, url: str, payload: Dict[str, Any], cache_key: Optional[Dict[str, Any]] = None,
+                         use_cache: bool = True) -> Dict[str, Any]:
+        """Coroutine version of ApolloClient._post_json"""
+        return (await self._fetch_json(url, payload, cache_key, use_cache))[0]
+
+    async def _iter_search(self, url: str, build_payload: Callable[[int], Dict[str, Any]],
+                           parse: Callable[[Dict[str, Any]], List[Any]], max_results: Optional[int],
+                           max_credits: Optional[int], use_cache: bool) -> AsyncIterator[Any]:
+        """Async version of ApolloClient._iter_search - the next page is fetched by a task"""
+        fetch = lambda page: self._fetch_json(url, build_payload(page), use_cache=use_cache)
+        yielded = credits = 0
+        page = 1
+        task = asyncio.ensure_future(fetch(page))
+        try:
+            while task is not None:
+                data, cached = await task
+                credits += 0 if cached else CREDITS_PER_SEARCH_PAGE
+                items = parse(data)
+                logger.info(f"📄 Page {page}: {len(items)} results ({credits} credits used)")
+
+                next_page = self._next_page(data, page, items, yielded, credits, max_results, max_credits)
+                task = asyncio.ensure_future(fetch(next_page)) if next_page else None
+                page = next_page
+
+                for item in items:
+                    if max_results is not None and yielded >= max_results:
+                        return
+                    yield item
+                    yielded += 1
+        finally:
+            if task is not None and not task.done():
+                task.cancel()
+
+    def iter_people(self, max_results: Optional[int] = None, max_credits: Optional[int] = None,
+                    per_page: int = 100, use_cache: bool = True, **search_kwargs) -> AsyncIterator[Contact]:
+        """Async version of ApolloClient.iter_people - use with `async for`"""
+        url = f"{self.BASE_URL}/mixed_people/search"
+        return self._iter_search(
+            url, lambda page: self._people_search_payload(page=page, per_page=per_page, **search_kwargs),
+            self._parse_people_response, max_results, max_credits, use_cache
+        )
+
+    def iter_organizations(self, max_results: Optional[int] = None, max_credits: Optional[int] = None,
+                           per_page: int = 100, use_cache: bool = True,
+                           **search_kwargs) -> AsyncIterator[Organization]:
+        """Async version of ApolloClient.iter_organizations - use with `async for`"""
+        url = f"{self.BASE_URL}/mixed_companies/search"
+        return self._iter_search(
+            url, lambda page: self._organization_search_payload(page=page, per_page=per_page, **search_kwargs),
+            self._parse_organizations_response, max_results, max_credits, use_cache
+        )
+
+    async def search_people(
+        self,
+        query: Optional[str] = None,
+        titles: Optional[List[str]] = None,
+        locations: Optional[List[str]] = None,
+        seniorities: Optional[List[str]] = None,
+        company_names: Optional[List[str]] = None,
+        industries: Optional[List[str]] = None,
+        employee_ranges: Optional[List[str]] = None,
+        page: int = 1,
+        per_page: int = 25,
+        use_cache: bool = True,
+        **kwargs
+    ) -> SearchResult:
+        """Coroutine version of ApolloClient.search_people"""
+        url = f"{self.BASE_URL}/mixed_people/search"
+        payload = self._people_search_payload(
+            query, titles, locations, seniorities, company_names, industries,
+            employee_ranges, page, per_page, **kwargs
+        )
+
+        logger.info(f"Searching people with query: {query}, page: {page}")
+
+        try:
+            data = await self._post_json(url, payload, use_cache=use_cache)
+            return self._people_search_result(data, payload, query, page, per_page)
+
+        except Exception as e:
+            self._handle_error(e, "search_people")
+            return SearchResult(contacts=[], total_results=0, page=page, per_page=per_page)
+
+    async def enrich_person(
+        self,
+        email: Optional[str] = None,
+        first_name: Optional[str] = None,
+        last_name: Optional[str] = None,
+        domain: Optional[str] = None,
+        linkedin_url: Optional[str] = None,
+        reveal_personal_emails: bool = True,
+        reveal_phone_number: bool = True,
+        use_cache: bool = True
+    ) -> Optional[Contact]:
+        """Coroutine version of ApolloClient.enrich_person"""
+        url = f"{self.BASE_URL}/people/match"
+        payload = self._enrich_person_payload(
+            email, first_name, last_name, domain, linkedin_url,
+            reveal_personal_emails, reveal_phone_number
+        )
+
+        logger.info(f"Enriching person: {email or linkedin_url or f'{first_name} {last_name}'}")
+
+        try:
+            data = await self._post_json(url, payload, enrichment_cache_key(payload), use_cache)
+            return self._enrich_person_result(data)
+
+        except Exception as e:
+            self._handle_error(e, "enrich_person")
+            return None
+
+    async def search_organizations(
+        self,
+        query: Optional[str] = None,
+        locations: Optional[List[str]] = None,
+        employee_ranges: Optional[List[str]] = None,
+        industries: Optional[List[str]] = None,
+        funding_stages: Optional[List[str]] = None,
+        technologies: Optional[List[str]] = None,
+        page: int = 1,
+        per_page: int = 25,
+        use_cache: bool = True,
+        **kwargs
+    ) -> SearchResult:
+        """Coroutine version of ApolloClient.search_organizations"""
+        url = f"{self.BASE_URL}/mixed_companies/search"
+        payload = self._organization_search_payload(
+            query, locations, employee_ranges, industries, funding_stages,
+            technologies, page, per_page, **kwargs
+        )
+
+        logger.info(f"Searching organizations with query: {query}, page: {page}")
+
+        try:
+            data = await self._post_json(url, payload, use_cache=use_cache)
+            return self._organizations_search_result(data, payload, query, page, per_page)
+
+        except Exception as e:
+            self._handle_error(e, "search_organizations")
+            return SearchResult(organizations=[], total_results=0, page=page, per_page=per_page)
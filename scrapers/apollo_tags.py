@@ -0,0 +1,114 @@
+"""
+Tag classification for Apollo people.
+
+Title keywords are matched by one precompiled regex in a single pass over the
+title, and SIC/NAICS codes are looked up in dicts, instead of scanning the
+title once per keyword for every person on every page.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+
+# Title tags in output order -> keywords (substring match on the lowercased title)
+TITLE_TAG_KEYWORDS = [
+    ("role:ceo_founder", ("ceo", "chief executive", "founder", "co-founder")),
+    ("role:cto", ("cto", "chief technology")),
+    ("role:cfo", ("cfo", "chief financial")),
+    ("role:coo", ("coo", "chief operating")),
+    ("role:vp", ("vp", "vice president")),
+    ("role:director", ("director",)),
+    ("role:head", ("head of", "head ")),
+    ("dept:engineering", ("engineer",)),
+    ("dept:sales", ("sales", "revenue", "business development")),
+    ("dept:product", ("product",)),
+    ("dept:marketing", ("marketing", "growth")),
+]
+
+# "Managing Director" is a general management title, not a director-level role
+DIRECTOR_EXCLUDE = "managing"
+
+SENIORITY_LABELS = {
+    "c_suite": "C-Suite Executive",
+    "vp": "VP Level",
+    "director": "Director Level",
+    "manager": "Manager Level",
+    "senior": "Senior Level",
+    "entry": "Entry Level"
+}
+
+# Industry tags in output order (simplified mapping)
+INDUSTRY_TAGS = [
+    "industry:software",
+    "industry:saas",
+    "industry:fintech",
+    "industry:hardware",
+    "industry:consulting",
+]
+
+SIC_INDUSTRY = {
+    "7372": "industry:software",
+    "7375": "industry:saas",
+    "6282": "industry:fintech",
+    "5045": "industry:hardware",
+    "7371": "industry:consulting",
+}
+
+NAICS_INDUSTRY = {
+    "541511": "industry:software",
+    "518": "industry:saas",
+    "519": "industry:saas",
+    "523": "industry:fintech",
+    "334": "industry:hardware",
+    "541512": "industry:consulting",
+}
+
+_KEYWORD_TAG = {keyword: tag for tag, keywords in TITLE_TAG_KEYWORDS for keyword in keywords}
+_TITLE_TAG_ORDER = [tag for tag, _ in TITLE_TAG_KEYWORDS]
+
+# Zero-width lookahead so overlapping keywords are all found ("director" also
+# contains "cto"); longest first so "head of" wins over "head " at one position.
+_TITLE_RE = re.compile(
+    "(?=(" + "|".join(
+        re.escape(k) for k in sorted([*_KEYWORD_TAG, DIRECTOR_EXCLUDE], key=len, reverse=True)
+    ) + "))"
+)
+
+
+def title_tags(title: Optional[str]) -> List[str]:
+    """role:/dept: tags for a job title"""
+    if not title:
+        return []
+
+    found = {_KEYWORD_TAG.get(m) or m for m in _TITLE_RE.findall(title.lower())}
+    if DIRECTOR_EXCLUDE in found:
+        found.discard("role:director")
+    return [tag for tag in _TITLE_TAG_ORDER if tag in found]
+
+
+def seniority_tag(seniority: Optional[str]) -> Optional[str]:
+    """seniority: tag for an Apollo seniority value"""
+    if not seniority:
+        return None
+    seniority = seniority.lower()
+    return f"seniority:{SENIORITY_LABELS.get(seniority, seniority.title())}"
+
+
+def industry_tags(sic_codes: Optional[Iterable[str]], naics_codes: Optional[Iterable[str]]) -> List[str]:
+    """industry: tags for an organization's SIC and NAICS codes"""
+    found = {SIC_INDUSTRY[c] for c in sic_codes or () if c in SIC_INDUSTRY}
+    found.update(NAICS_INDUSTRY[c] for c in naics_codes or () if c in NAICS_INDUSTRY)
+    if not found:
+        return []
+    return [tag for tag in INDUSTRY_TAGS if tag in found]
+
+
+def person_tags(person_data: Dict[str, Any]) -> List[str]:
+    """All tags for an Apollo person: title, then seniority, then industry"""
+    org = person_data.get("organization") or {}
+    tags = title_tags(person_data.get("title"))
+    seniority = seniority_tag(person_data.get("seniority"))
+    if seniority:
+        tags.append(seniority)
+    tags.extend(industry_tags(org.get("sic_codes"), org.get("naics_codes")))
+    return tags
@@ -0,0 +1,457 @@
+"""
+Apollo credit ledger and budgets.
+
+Every request an Apollo client sends, and every response it serves from the
+cache instead, goes through ApolloUsageLedger and becomes one api_usage row:
+endpoint, credits, latency, cache hit and caller. Rows are written in batches
+by a background thread, so a caller holding the database writer never waits
+on its own bookkeeping.
+
+Budgets are checked before a request goes out:
+- per request: usage_scope(caller, max_credits) around a workflow caps what
+  everything inside it may spend (threads started via scoped_submit and
+  asyncio tasks inherit the scope)
+- per day: APOLLO_DAILY_CREDIT_BUDGET caps the host's spend per UTC day
+"""
+
+import os
+import time
+import asyncio
+import atexit
+import threading
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from loguru import logger
+
+from .apollo_cache import apollo_endpoint
+
+
+FLUSH_INTERVAL = 1.0  # Seconds between ledger writes
+FLUSH_BATCH = 200  # Write sooner once this many rows are queued
+MAX_PENDING = 50000  # Rows kept for retry while the database is unavailable
+DAILY_REFRESH_INTERVAL = 60.0  # Seconds between re-reads of today's spend (other processes' share)
+
+# Bulk endpoint -> response list with one entry (or null) per requested record
+BULK_ENDPOINTS = {
+    "people/bulk_match": "matches",
+    "organizations/bulk_enrich": "organizations",
+}
+
+
+class CreditBudgetExceeded(Exception):
+    """An Apollo request would go over a per-request or per-day credit budget"""
+
+
+def estimate_credits(endpoint: str, payload: Optional[Dict[str, Any]]) -> int:
+    """Most credits a request can cost: one per record for bulk calls, otherwise one"""
+    payload = payload or {}
+    if endpoint == "people/bulk_match":
+        return len(payload.get("details") or [])
+    if endpoint == "organizations/bulk_enrich":
+        return len(payload.get("domains") or [])
+    return 1
+
+
+def charged_credits(endpoint: str, payload: Optional[Dict[str, Any]], data: Optional[Dict[str, Any]]) -> int:
+    """Credits a successful response cost (Apollo's own count when it reports one)"""
+    if isinstance(data, dict):
+        if data.get("credits_consumed") is not None:
+            return int(data["credits_consumed"])
+        key = BULK_ENDPOINTS.get(endpoint)
+        if key:
+            return sum(1 for item in data.get(key) or [] if item)
+    return estimate_credits(endpoint, payload)
+
+
+def default_request_budget() -> Optional[int]:
+    """Per-request credit cap for workflows that aren't given one (APOLLO_REQUEST_CREDIT_BUDGET)"""
+    value = os.getenv("APOLLO_REQUEST_CREDIT_BUDGET")
+    return int(value) if value else None
+
+
+class UsageScope:
+    """Credits spent by everything running inside one usage_scope(), with an optional cap"""
+
+    def __init__(self, caller: str, max_credits: Optional[int] = None,
+                 parent: Optional["UsageScope"] = None):
+        self.caller = caller
+        self.max_credits = max_credits
+        self.parent = parent
+        self.spent = 0
+        self.requests = 0
+        self.cache_hits = 0
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self) -> Optional[int]:
+        """Credits left under this scope and its parents (None if uncapped)"""
+        limits = [s.max_credits - s.spent for s in self._chain() if s.max_credits is not None]
+        return max(0, min(limits)) if limits else None
+
+    def can_spend(self, credits: int) -> bool:
+        """True if a request costing `credits` fits the budget"""
+        remaining = self.remaining
+        return remaining is None or credits <= remaining
+
+    def _chain(self) -> List["UsageScope"]:
+        scope, chain = self, []
+        while scope is not None:
+            chain.append(scope)
+            scope = scope.parent
+        return chain
+
+    def _reserve(self, credits: int):
+        """Count credits against every enclosing budget, or raise if one would be exceeded"""
+        chain = self._chain()
+        for scope in chain:
+            scope._lock.acquire()
+        try:
+            for scope in chain:
+                if scope.max_credits is not None and scope.spent + credits > scope.max_credits:
+                    raise CreditBudgetExceeded(
+                        f"{scope.caller}: {credits} more credits would exceed the budget "
+                        f"({scope.spent}/{scope.max_credits} spent)"
+                    )
+            for scope in chain:
+                scope.spent += credits
+                scope.requests += 1
+        finally:
+            for scope in chain:
+                scope._lock.release()
+
+    def _settle(self, reserved: int, credits: int):
+        """Replace a reservation with what the request actually cost"""
+        for scope in self._chain():
+            with scope._lock:
+                scope.spent += credits - reserved
+
+    def _cache_hit(self):
+        for scope in self._chain():
+            with scope._lock:
+                scope.cache_hits += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'caller': self.caller,
+            'credits_used': self.spent,
+            'max_credits': self.max_credits,
+            'requests': self.requests,
+            'cache_hits': self.cache_hits,
+        }
+
+
+_current_scope: contextvars.ContextVar[Optional[UsageScope]] = contextvars.ContextVar(
+    "apollo_usage_scope", default=None
+)
+
+
+@contextmanager
+def usage_scope(caller: str, max_credits: Optional[int] = None) -> Iterator[UsageScope]:
+    """
+    Attribute Apollo calls made inside the block to `caller` and cap their spend.
+
+    Args:
+        caller: Name recorded in the ledger, e.g. "agentic_search"
+        max_credits: Credits the block may spend (None = no cap). Enclosing
+                     scopes' caps still apply.
+    """
+    scope = UsageScope(caller, max_credits, parent=_current_scope.get())
+    token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_scope.reset(token)
+
+
+def current_scope() -> Optional[UsageScope]:
+    """The innermost active usage_scope, if any"""
+    return _current_scope.get()
+
+
+def scoped_submit(executor, fn: Callable, *args, **kwargs):
+    """executor.submit that carries the current usage scope into the worker thread"""
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+class UsageCall:
+    """One in-flight Apollo request being tracked (see ApolloUsageLedger.track)"""
+
+    def __init__(self, endpoint: str, payload: Optional[Dict[str, Any]]):
+        self.endpoint = endpoint
+        self.payload = payload
+        self.status_code: Optional[int] = None
+        self.credits = 0
+        self.started = time.perf_counter()
+
+    def start(self):
+        """Mark the request as sent (after any rate-limit wait), so the recorded latency is Apollo's"""
+        self.started = time.perf_counter()
+
+    def done(self, response):
+        """Record the HTTP response (requests or httpx) and what it cost"""
+        self.status_code = response.status_code
+        if 200 <= response.status_code < 300:
+            data = response.json() if self.endpoint in BULK_ENDPOINTS else None
+            self.credits = charged_credits(self.endpoint, self.payload, data)
+
+
+class ApolloUsageLedger:
+    """Writes the api_usage ledger and enforces credit budgets"""
+
+    def __init__(self, db_manager=None, daily_budget: Optional[int] = None,
+                 enabled: Optional[bool] = None):
+        """
+        Args:
+            db_manager: Database holding api_usage (defaults to the app's)
+            daily_budget: Credits the host may spend per UTC day (defaults to
+                          APOLLO_DAILY_CREDIT_BUDGET, then unlimited)
+            enabled: Record usage at all (defaults to APOLLO_USAGE_LEDGER_ENABLED, then on)
+        """
+        self._db = db_manager
+        if daily_budget is None and os.getenv("APOLLO_DAILY_CREDIT_BUDGET"):
+            daily_budget = int(os.getenv("APOLLO_DAILY_CREDIT_BUDGET"))
+        self.daily_budget = daily_budget
+        if enabled is None:
+            enabled = os.getenv("APOLLO_USAGE_LEDGER_ENABLED", "true").lower() not in ("0", "false", "no")
+        self.enabled = enabled
+
+        self._pending: List[Dict[str, Any]] = []
+        self._pending_credits = 0
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._writer = None
+
+        # Today's spend, kept in memory between re-reads of api_usage
+        self._daily_lock = threading.Lock()
+        self._day = None
+        self._day_loaded_at = 0.0
+        self._spent_today = 0
+        self._reserved_today = 0  # Credits held by requests in flight
+
+    @property
+    def db(self):
+        if self._db is None:
+            from database.db_manager import get_db_manager
+            self._db = get_db_manager()
+        return self._db
+
+    # ==================== Budgets ====================
+
+    def _load_spent_today(self) -> int:
+        """Credits recorded since midnight UTC, including rows not yet written"""
+        from sqlalchemy import select, func
+        from database.models import ApiUsage
+
+        midnight = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        with self._cond:
+            pending = self._pending_credits
+        with self.db.read_engine.connect() as conn:
+            stored = conn.execute(
+                select(func.coalesce(func.sum(ApiUsage.credits), 0)).where(ApiUsage.created_at >= midnight)
+            ).scalar()
+        return int(stored) + pending
+
+    def _daily_due(self) -> bool:
+        """True when the UTC day rolled over or the in-memory spend is older than DAILY_REFRESH_INTERVAL"""
+        return (self._day != datetime.utcnow().date()
+                or time.monotonic() - self._day_loaded_at >= DAILY_REFRESH_INTERVAL)
+
+    def _refresh_daily(self):
+        """
+        Re-read today's spend when it is due (picks up other processes' spend) -
+        call with _daily_lock held. In between, settled requests add to it in memory.
+        """
+        if self._daily_due():
+            self._spent_today = self._load_spent_today()
+            self._day = datetime.utcnow().date()
+            self._day_loaded_at = time.monotonic()
+
+    def _refresh_daily_locked(self):
+        with self._daily_lock:
+            self._refresh_daily()
+
+    async def refresh_daily_async(self):
+        """
+        Re-read today's spend in a worker thread if it is due, so the budget
+        check in track() finds it current and doesn't query the database on
+        the event loop. Async clients await this before each track().
+        """
+        if self.daily_budget is None or not self._daily_due():
+            return
+        await asyncio.to_thread(self._refresh_daily_locked)
+
+    def spent_today(self) -> int:
+        """Credits spent since midnight UTC"""
+        with self._daily_lock:
+            self._refresh_daily()
+            return self._spent_today
+
+    def remaining_today(self) -> Optional[int]:
+        """Credits left in today's budget, less what requests in flight hold (None if there is no daily budget)"""
+        if self.daily_budget is None:
+            return None
+        with self._daily_lock:
+            self._refresh_daily()
+            return max(0, self.daily_budget - self._spent_today - self._reserved_today)
+
+    def can_spend(self, credits: int = 1) -> bool:
+        """True if a request costing `credits` fits the current scope's and today's budgets"""
+        scope = current_scope()
+        if scope is not None and not scope.can_spend(credits):
+            return False
+        remaining = self.remaining_today()
+        return remaining is None or credits <= remaining
+
+    def _reserve_daily(self, credits: int) -> int:
+        """
+        Hold credits against today's budget, or raise if they don't fit.
+
+        Returns:
+            Credits held (0 without a daily budget)
+        """
+        if self.daily_budget is None:
+            return 0
+        with self._daily_lock:
+            self._refresh_daily()
+            committed = self._spent_today + self._reserved_today
+            if committed + credits > self.daily_budget:
+                raise CreditBudgetExceeded(
+                    f"Daily Apollo budget reached ({committed}/{self.daily_budget} credits spent or in flight today)"
+                )
+            self._reserved_today += credits
+        return credits
+
+    def _settle_daily(self, reserved: int, credits: int):
+        """Replace a daily reservation with what the request actually cost"""
+        with self._daily_lock:
+            self._reserved_today -= reserved
+            if self._day is not None:
+                self._spent_today += credits
+
+    # ==================== Recording ====================
+
+    @contextmanager
+    def track(self, url: str, payload: Optional[Dict[str, Any]] = None,
+              caller: str = "unknown") -> Iterator[UsageCall]:
+        """
+        Wrap one Apollo request: reserve its credits against the budgets before
+        it, record it after. Call .start() on the yielded UsageCall just before
+        sending and .done(response) once the response arrives; requests that
+        fail before that are recorded with no credits.
+
+        Args:
+            url: Request URL
+            payload: Request body (sizes bulk requests)
+            caller: Recorded caller when no usage_scope is active
+
+        Raises:
+            CreditBudgetExceeded: Before sending, if the request could go over budget
+        """
+        endpoint = apollo_endpoint(url)
+        reserved = estimate_credits(endpoint, payload)
+        reserved_daily = self._reserve_daily(reserved)
+        scope = current_scope()
+        if scope is not None:
+            try:
+                scope._reserve(reserved)
+            except CreditBudgetExceeded:
+                self._settle_daily(reserved_daily, 0)
+                raise
+
+        call = UsageCall(endpoint, payload)
+        try:
+            yield call
+        finally:
+            self._settle_daily(reserved_daily, call.credits)
+            if scope is not None:
+                scope._settle(reserved, call.credits)
+            self.record(endpoint, call.credits, (time.perf_counter() - call.started) * 1000,
+                        cache_hit=False, caller=scope.caller if scope else caller,
+                        status_code=call.status_code)
+
+    def record_cache_hit(self, url: str, caller: str = "unknown"):
+        """Record a response served from the cache (or shared from an identical in-flight call)"""
+        scope = current_scope()
+        if scope is not None:
+            scope._cache_hit()
+        self.record(apollo_endpoint(url), 0, 0.0, cache_hit=True,
+                    caller=scope.caller if scope else caller)
+
+    def record(self, endpoint: str, credits: int, latency_ms: float, cache_hit: bool,
+               caller: str, status_code: Optional[int] = None):
+        """Queue one ledger row"""
+        if not self.enabled:
+            return
+        row = {
+            'provider': 'apollo',
+            'endpoint': endpoint,
+            'caller': caller,
+            'credits': credits,
+            'latency_ms': round(latency_ms, 1),
+            'cache_hit': cache_hit,
+            'status_code': status_code,
+            'created_at': datetime.utcnow(),
+        }
+        with self._cond:
+            self._pending.append(row)
+            self._pending_credits += credits
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_loop, name="apollo-usage", daemon=True)
+                self._writer.start()
+            if len(self._pending) >= FLUSH_BATCH:
+                self._cond.notify()
+
+    def _write_loop(self):
+        while True:
+            with self._cond:
+                self._cond.wait(FLUSH_INTERVAL)
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write queued rows now.
+
+        Returns:
+            Rows written (0 if the write failed - they are retried next time)
+        """
+        from sqlalchemy import insert
+        from database.models import ApiUsage
+
+        with self._flush_lock:
+            with self._cond:
+                rows, self._pending = self._pending, []
+            if not rows:
+                return 0
+            try:
+                with self.db.engine.begin() as conn:
+                    conn.execute(insert(ApiUsage), rows)
+            except Exception as e:
+                logger.warning(f"⚠️  Could not write {len(rows)} Apollo usage rows, will retry: {e}")
+                with self._cond:
+                    self._pending[:0] = rows
+                    if len(self._pending) > MAX_PENDING:
+                        dropped = self._pending[:len(self._pending) - MAX_PENDING]
+                        del self._pending[:len(dropped)]
+                        self._pending_credits -= sum(row['credits'] for row in dropped)
+                        logger.error(f"❌ Dropped {len(dropped)} Apollo usage rows that could not be written")
+                return 0
+            with self._cond:
+                self._pending_credits -= sum(row['credits'] for row in rows)
+            return len(rows)
+
+
+_usage_ledger: Optional[ApolloUsageLedger] = None
+_usage_ledger_lock = threading.Lock()
+
+
+def get_usage_ledger() -> ApolloUsageLedger:
+    """Process-wide ledger instance (rows are written to the app database)"""
+    global _usage_ledger
+    with _usage_ledger_lock:
+        if _usage_ledger is None:
+            _usage_ledger = ApolloUsageLedger()
+            atexit.register(_usage_ledger.flush)
+        return _usage_ledger
@@ -0,0 +1,337 @@
+"""
+On-disk cache of raw scraped HTML.
+
+Page bodies are stored content-addressed (gzip blobs named by their sha256,
+so identical pages are stored once) and a SQLite index maps each URL to its
+latest blob, source, validators and expiry. Fresh pages are served without a
+request; expired ones are revalidated with If-None-Match / If-Modified-Since
+when the server sent an ETag or Last-Modified, so an unchanged page costs a
+304 instead of a download.
+
+Cached pages stay on disk after they expire, so extractors can be re-run over
+everything a source has fetched (pages()) when extraction logic changes.
+They are also the fallback when revalidation fails: if the request raises or
+comes back throttled or erroring (429, 999, 5xx...), the expired copy is
+served, flagged stale, rather than nothing.
+"""
+
+import os
+import gzip
+import asyncio
+import time
+import hashlib
+import sqlite3
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Tuple
+
+from loguru import logger
+
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / "database" / "html_cache"
+
+# source -> seconds a page stays fresh
+DEFAULT_TTLS = {
+    "linkedin_job": 7 * 24 * 3600,       # Job detail pages
+    "linkedin_profile": 30 * 24 * 3600,
+    "website": 7 * 24 * 3600,            # Prospect websites (company profiles)
+}
+DEFAULT_TTL = 24 * 3600
+
+# The page itself is gone - don't paper over that with the cached copy
+GONE_STATUSES = (404, 410)
+
+
+@dataclass
+class CachedPage:
+    """
+    A page served from the cache. Quacks like the requests/httpx responses
+    callers already handle (status_code, headers, content, text,
+    raise_for_status), so they don't need to know where it came from.
+    """
+    url: str
+    content: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    status_code: int = 200
+    revalidated: bool = False  # True when a 304 confirmed the cached copy
+    stale: bool = False  # True when served expired because revalidation failed
+
+    @property
+    def text(self) -> str:
+        content_type = self.headers.get("Content-Type", "")
+        charset = content_type.split("charset=", 1)[1].split(";")[0].strip() if "charset=" in content_type else "utf-8"
+        try:
+            return self.content.decode(charset, errors="replace")
+        except LookupError:
+            return self.content.decode("utf-8", errors="replace")
+
+    def raise_for_status(self):
+        pass
+
+
+class HtmlCache:
+    """Content-addressed HTML blobs plus a SQLite index keyed by URL"""
+
+    def __init__(self, cache_dir: Optional[str] = None, ttls: Optional[Dict[str, int]] = None,
+                 enabled: Optional[bool] = None):
+        """
+        Args:
+            cache_dir: Directory for the index and blobs (defaults to HTML_CACHE_DIR
+                       env var, then database/html_cache)
+            ttls: Per-source TTL overrides in seconds
+            enabled: Turn the cache off entirely (defaults to HTML_CACHE_ENABLED, then on)
+        """
+        self.cache_dir = Path(cache_dir or os.getenv("HTML_CACHE_DIR") or DEFAULT_CACHE_DIR)
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        if enabled is None:
+            enabled = os.getenv("HTML_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+        self.enabled = enabled
+
+        self.hits: Counter = Counter()         # source -> served fresh from the cache
+        self.revalidated: Counter = Counter()  # source -> served after a 304
+        self.misses: Counter = Counter()       # source -> downloaded
+        self.stale: Counter = Counter()        # source -> served expired after a failed revalidation
+
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Per-process connection (reopened after fork)"""
+        if self._conn is None or self._pid != os.getpid():
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.cache_dir / "index.db"), timeout=5,
+                                   isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS html_pages ("
+                "url TEXT PRIMARY KEY, source TEXT NOT NULL, digest TEXT NOT NULL, "
+                "content_type TEXT, etag TEXT, last_modified TEXT, "
+                "fetched_at REAL NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_html_pages_source ON html_pages (source)")
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.cache_dir / "blobs" / digest[:2] / f"{digest}.html.gz"
+
+    def _write_blob(self, content: bytes) -> str:
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._blob_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(gzip.compress(content, compresslevel=6))
+            os.replace(tmp, path)  # Atomic, so readers never see half a blob
+        return digest
+
+    def _read_blob(self, digest: str) -> Optional[bytes]:
+        try:
+            return gzip.decompress(self._blob_path(digest).read_bytes())
+        except (OSError, EOFError):
+            return None
+
+    def lookup(self, url: str) -> Optional[Tuple[CachedPage, bool, Dict[str, str]]]:
+        """
+        Cached copy of a URL.
+
+        Returns:
+            (page, fresh, validators) where validators are the conditional request
+            headers to revalidate with, or None if the URL isn't cached
+        """
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT digest, content_type, etag, last_modified, expires_at FROM html_pages WHERE url = ?",
+                (url,)
+            ).fetchone()
+        if not row:
+            return None
+        digest, content_type, etag, last_modified, expires_at = row
+        content = self._read_blob(digest)
+        if content is None:
+            return None
+
+        validators = {}
+        if etag:
+            validators["If-None-Match"] = etag
+        if last_modified:
+            validators["If-Modified-Since"] = last_modified
+        page = CachedPage(url, content, {"Content-Type": content_type} if content_type else {})
+        return page, expires_at > time.time(), validators
+
+    def store(self, url: str, source: str, response) -> None:
+        """Save a 200 response's body and validators under the source's TTL"""
+        digest = self._write_blob(response.content)
+        now = time.time()
+        headers = response.headers
+        with self._lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO html_pages "
+                "(url, source, digest, content_type, etag, last_modified, fetched_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, source, digest, headers.get("Content-Type"), headers.get("ETag"),
+                 headers.get("Last-Modified"), now, now + self.ttls.get(source, DEFAULT_TTL))
+            )
+
+    def _touch(self, url: str, source: str):
+        """A 304 confirmed the cached copy - it's fresh for another TTL"""
+        with self._lock:
+            self._connection().execute(
+                "UPDATE html_pages SET expires_at = ? WHERE url = ?",
+                (time.time() + self.ttls.get(source, DEFAULT_TTL), url)
+            )
+
+    def _before_fetch(self, url: str, source: str):
+        """(cached page or None, response to return without fetching or None, request headers)"""
+        cached = self.lookup(url) if self.enabled else None
+        if cached is None:
+            return None, None, {}
+        page, fresh, validators = cached
+        if fresh:
+            self.hits[source] += 1
+            return page, page, {}
+        return page, None, validators
+
+    def _after_fetch(self, url: str, source: str, page: Optional[CachedPage], response):
+        if page is not None:
+            if response.status_code == 304:
+                self._touch(url, source)
+                self.revalidated[source] += 1
+                page.revalidated = True
+                return page
+            if not 200 <= response.status_code < 300 and response.status_code not in GONE_STATUSES:
+                return self._serve_stale(url, source, page, f"HTTP {response.status_code}")
+        self.misses[source] += 1
+        if response.status_code == 200 and self.enabled:
+            self.store(url, source, response)
+        return response
+
+    def _serve_stale(self, url: str, source: str, page: CachedPage, reason: str) -> CachedPage:
+        """Revalidation failed - the expired copy beats no page at all"""
+        self.stale[source] += 1
+        page.stale = True
+        logger.warning(f"♻️ Serving stale cached page for {url} ({reason})")
+        return page
+
+    def get(self, url: str, source: str, fetch: Callable[[Dict[str, str]], Any]):
+        """
+        A page from the cache, or from fetch(headers) - a requests/httpx GET of url
+        with the given extra headers - if it's missing or stale.
+
+        Returns:
+            A CachedPage, or fetch's response (stored in the cache if it was a 200).
+            An expired CachedPage (stale=True) if revalidating it raised or failed.
+        """
+        page, ready, validators = self._before_fetch(url, source)
+        if ready is not None:
+            return ready
+        try:
+            response = fetch(validators)
+        except Exception as e:
+            if page is None:
+                raise
+            return self._serve_stale(url, source, page, str(e) or type(e).__name__)
+        return self._after_fetch(url, source, page, response)
+
+    async def get_async(self, url: str, source: str, fetch: Callable[[Dict[str, str]], Awaitable[Any]]):
+        """Coroutine version of get() for an async fetch - the index and blob I/O runs in a worker thread"""
+        page, ready, validators = await asyncio.to_thread(self._before_fetch, url, source)
+        if ready is not None:
+            return ready
+        try:
+            response = await fetch(validators)
+        except Exception as e:
+            if page is None:
+                raise
+            return self._serve_stale(url, source, page, str(e) or type(e).__name__)
+        return await asyncio.to_thread(self._after_fetch, url, source, page, response)
+
+    def pages(self, source: Optional[str] = None) -> Iterator[Tuple[str, str]]:
+        """
+        (url, html) for every cached page - expired ones included - optionally
+        just one source's. For re-running extractors offline.
+        """
+        with self._lock:
+            query = "SELECT url, digest, content_type FROM html_pages"
+            rows = self._connection().execute(
+                query + " WHERE source = ? ORDER BY url" if source else query + " ORDER BY url",
+                (source,) if source else ()
+            ).fetchall()
+        for url, digest, content_type in rows:
+            content = self._read_blob(digest)
+            if content is not None:
+                yield url, CachedPage(url, content, {"Content-Type": content_type or ""}).text
+
+    def prune(self, older_than_days: float) -> int:
+        """
+        Forget pages fetched more than older_than_days ago and delete blobs no
+        page points to any more.
+
+        Returns:
+            Number of pages removed
+        """
+        cutoff = time.time() - older_than_days * 86400
+        with self._lock:
+            conn = self._connection()
+            removed = conn.execute("DELETE FROM html_pages WHERE fetched_at < ?", (cutoff,)).rowcount
+            referenced = {row[0] for row in conn.execute("SELECT DISTINCT digest FROM html_pages")}
+        for path in (self.cache_dir / "blobs").glob("*/*.html.gz"):
+            if path.name.split(".", 1)[0] not in referenced:
+                path.unlink(missing_ok=True)
+        if removed:
+            logger.info(f"🧹 Pruned {removed} cached pages older than {older_than_days:g} days")
+        return removed
+
+    def clear(self):
+        """Remove every cached page"""
+        with self._lock:
+            self._connection().execute("DELETE FROM html_pages")
+        for path in (self.cache_dir / "blobs").glob("*/*.html.gz"):
+            path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/revalidation/miss/stale counters for this process, plus the shared page counts"""
+        with self._lock:
+            by_source = dict(self._connection().execute(
+                "SELECT source, count(*) FROM html_pages GROUP BY source"
+            ).fetchall())
+        hits, revalidated, misses = sum(self.hits.values()), sum(self.revalidated.values()), sum(self.misses.values())
+        requests_saved = hits + revalidated
+        return {
+            'enabled': self.enabled,
+            'pages': sum(by_source.values()),
+            'hits': hits,
+            'revalidated': revalidated,
+            'misses': misses,
+            'stale': sum(self.stale.values()),
+            'hit_rate': requests_saved / (requests_saved + misses) if requests_saved + misses else 0.0,
+            'by_source': {
+                source: {
+                    'pages': by_source.get(source, 0),
+                    'hits': self.hits[source],
+                    'revalidated': self.revalidated[source],
+                    'misses': self.misses[source],
+                    'stale': self.stale[source],
+                }
+                for source in sorted(set(by_source) | set(self.hits) | set(self.revalidated)
+                                     | set(self.misses) | set(self.stale))
+            },
+        }
+
+
+_html_cache: Optional[HtmlCache] = None
+_html_cache_lock = threading.Lock()
+
+
+def get_html_cache() -> HtmlCache:
+    """Process-wide cache instance (the index and blobs are shared between processes)"""
+    global _html_cache
+    with _html_cache_lock:
+        if _html_cache is None:
+            _html_cache = HtmlCache()
+        return _html_cache
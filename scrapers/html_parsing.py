@@ -0,0 +1,98 @@
+"""
+HTML parsing backends for the scrapers.
+
+Trees are built through make_soup(), which uses lxml's C tree builder when it
+is installed instead of the pure-Python html.parser, and can keep only the
+elements an extractor reads (a SoupStrainer built with only()) rather than the
+whole page. LinkedIn job pages also have selectolax (lexbor) extractors, used
+when selectolax is installed.
+
+HTML_PARSER=selectolax|lxml|html.parser forces a backend.
+"""
+
+import importlib.util
+import os
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+LXML_AVAILABLE = importlib.util.find_spec("lxml") is not None
+SELECTOLAX_AVAILABLE = importlib.util.find_spec("selectolax") is not None
+
+# Fastest first
+BACKENDS = ("selectolax", "lxml", "html.parser")
+
+_SELECTOR_RE = re.compile(r"([a-z][a-z0-9]*)(?:\.([\w-]+)|#([\w-]+)|\[([\w:-]+)=([^\]]+)\])?")
+
+
+def available_backends() -> List[str]:
+    """Installed backends, fastest first"""
+    installed = {"selectolax": SELECTOLAX_AVAILABLE, "lxml": LXML_AVAILABLE, "html.parser": True}
+    return [backend for backend in BACKENDS if installed[backend]]
+
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    """The backend to use: the one asked for, else HTML_PARSER, else the fastest installed"""
+    backend = backend or os.getenv("HTML_PARSER") or available_backends()[0]
+    if backend not in available_backends():
+        raise ValueError(f"HTML parser backend not available: {backend} (installed: {available_backends()})")
+    return backend
+
+
+def soup_features(backend: Optional[str] = None) -> str:
+    """BeautifulSoup tree builder for a backend (pages without selectolax extractors use lxml)"""
+    if resolve_backend(backend) == "html.parser" or not LXML_AVAILABLE:
+        return "html.parser"
+    return "lxml"
+
+
+def make_soup(markup, parse_only: Optional[SoupStrainer] = None, backend: Optional[str] = None) -> BeautifulSoup:
+    """
+    Parse HTML (str or bytes) with the backend's tree builder.
+
+    Args:
+        parse_only: Keep just these elements - see only()
+        backend: Parser backend (defaults to resolve_backend())
+    """
+    return BeautifulSoup(markup, soup_features(backend), parse_only=parse_only)
+
+
+def lexbor_tree(markup):
+    """selectolax (lexbor) tree for HTML - only call when selectolax is the backend"""
+    from selectolax.lexbor import LexborHTMLParser
+    return LexborHTMLParser(markup)
+
+
+def _selector_matcher(selector: str) -> Callable[[str, Dict[str, Any]], bool]:
+    match = _SELECTOR_RE.fullmatch(selector)
+    if not match:
+        raise ValueError(f"Unsupported selector for only(): {selector}")
+    tag, css_class, element_id, attr, value = match.groups()
+
+    def matches(name: str, attrs: Dict[str, Any]) -> bool:
+        if name != tag:
+            return False
+        if css_class:
+            classes = attrs.get("class") or []
+            return css_class in (classes.split() if isinstance(classes, str) else classes)
+        if element_id:
+            return attrs.get("id") == element_id
+        if attr:
+            return attrs.get(attr) == value
+        return True
+
+    return matches
+
+
+def only(*selectors: str) -> SoupStrainer:
+    """
+    SoupStrainer keeping just the elements matching any of the selectors, each
+    with its whole subtree, in document order. Selectors are a tag name plus at
+    most one of .class, #id or [attr=value], e.g. "div.base-card".
+
+    Extractors keep working unchanged as long as every element they look for is
+    one of these or inside one. Works with html.parser and lxml.
+    """
+    matchers = [_selector_matcher(selector) for selector in selectors]
+    return SoupStrainer(lambda name, attrs=None: any(m(name, attrs or {}) for m in matchers))
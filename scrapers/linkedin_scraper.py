@@ -2,15 +2,25 @@
 LinkedIn Profile Scraper
 
 Scrapes public LinkedIn profiles to extract company information.
-Uses requests + BeautifulSoup for simple HTML parsing.
+Uses requests + BeautifulSoup for simple HTML parsing (lxml when installed,
+parsing only the elements the extractors read - see scrapers/html_parsing.py).
 """
 
 import requests
 from bs4 import BeautifulSoup
 from typing import Optional, Dict
 from loguru import logger
-import time
-import random
+
+from .adaptive_rate import AdaptiveRateController, get_linkedin_rate_controller
+from .html_cache import HtmlCache, get_html_cache
+from .html_parsing import make_soup, only
+
+
+# Elements _extract_company_name and _extract_title read
+PROFILE_ONLY = only(
+    "section#experience-section", "meta[property=og:description]",
+    "script[type=application/ld+json]", "title", "h2",
+)
 
 
 class LinkedInScraper:
@@ -18,10 +28,14 @@ class LinkedInScraper:
     Simple LinkedIn profile scraper for extracting company names.
     
     Note: This scrapes public profile pages without authentication.
-    LinkedIn may rate-limit or block requests, so use sparingly.
+    LinkedIn may rate-limit or block requests, so use sparingly. Requests are
+    paced by the LinkedIn rate controller shared with the job scraper, which
+    slows down when LinkedIn throttles.
     """
     
-    def __init__(self):
+    def __init__(self, cache: Optional[HtmlCache] = None, rate: Optional[AdaptiveRateController] = None):
+        self.cache = cache or get_html_cache()
+        self.rate = rate or get_linkedin_rate_controller()
         self.session = requests.Session()
         # Use a realistic user agent to avoid being blocked
         self.session.headers.update({
@@ -45,22 +59,25 @@ class LinkedInScraper:
             Dict with 'company' and 'title' keys, or None if extraction fails
         """
         try:
-            # Add random delay to avoid rate limiting
-            time.sleep(random.uniform(1, 3))
-            
-            logger.debug(f"Scraping LinkedIn profile: {linkedin_url}")
+            def fetch(headers: Dict[str, str]) -> requests.Response:
+                # Wait for LinkedIn's current rate (cached profiles skip it)
+                self.rate.acquire(linkedin_url)
+                
+                logger.debug(f"Scraping LinkedIn profile: {linkedin_url}")
+                response = self.session.get(linkedin_url, headers=headers, timeout=10)
+                self.rate.record(linkedin_url, response.status_code, empty=not response.content.strip(),
+                                 retry_after=response.headers.get('Retry-After'))
+                return response
             
-            response = self.session.get(linkedin_url, timeout=10)
+            response = self.cache.get(linkedin_url, "linkedin_profile", fetch)
             
             if response.status_code != 200:
                 logger.warning(f"Failed to fetch LinkedIn profile: {response.status_code}")
                 return None
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Try to extract company name from various possible locations
-            company_name = self._extract_company_name(soup)
-            title = self._extract_title(soup)
+            profile = self.parse_profile(response.text)
+            company_name = profile['company']
+            title = profile['title']
             
             if company_name or title:
                 logger.info(f"✅ Extracted from LinkedIn: Company={company_name}, Title={title}")
@@ -79,6 +96,19 @@ class LinkedInScraper:
             logger.error(f"Error scraping LinkedIn profile: {e}")
             return None
     
+    def parse_profile(self, html: str, backend: Optional[str] = None) -> Dict[str, Optional[str]]:
+        """
+        Extract company name and title from profile page HTML.
+
+        Returns:
+            Dict with 'company' and 'title' keys (None when not found)
+        """
+        soup = make_soup(html, PROFILE_ONLY, backend)
+        return {
+            'company': self._extract_company_name(soup),
+            'title': self._extract_title(soup)
+        }
+
     def _extract_company_name(self, soup: BeautifulSoup) -> Optional[str]:
         """
         Extract company name from LinkedIn profile HTML.
@@ -217,9 +247,6 @@ class LinkedInScraper:
                     contact['title'] = linkedin_data['title']
             
             enriched.append(contact)
-            
-            # Rate limiting: don't scrape too fast
-            time.sleep(random.uniform(2, 4))
         
         return enriched
 
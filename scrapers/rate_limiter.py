@@ -0,0 +1,186 @@
+"""
+Token-bucket rate limiting shared across processes.
+
+Bucket state lives in a small SQLite file, so every ApolloClient, every
+ApolloPhoneEnrichment and every uvicorn worker on the host draws from the same
+buckets. Callers reserve tokens in one short transaction and then sleep (or
+await) until their reservation comes due - no polling, and waiting callers are
+served in the order they reserved.
+"""
+
+import os
+import time
+import asyncio
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from loguru import logger
+
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "database" / "rate_limits.db"
+
+
+class TokenBucketLimiter:
+    """
+    Named token buckets backed by SQLite.
+
+    Each bucket holds up to `capacity` tokens and refills at `refill_rate`
+    tokens per second. A reservation may drive the balance negative; the
+    caller then waits until the refill has paid the debt back.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, busy_timeout_ms: int = 5000):
+        """
+        Args:
+            db_path: SQLite file holding bucket state (defaults to RATE_LIMIT_DB_PATH
+                     env var, then database/rate_limits.db)
+            busy_timeout_ms: How long to wait for another process's reservation
+        """
+        self.db_path = str(db_path or os.getenv("RATE_LIMIT_DB_PATH") or DEFAULT_DB_PATH)
+        self.busy_timeout_ms = busy_timeout_ms
+        self.buckets: Dict[str, Tuple[float, float]] = {}  # name -> (capacity, refill_rate)
+
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+    def configure(self, bucket: str, capacity: float, refill_rate: float):
+        """
+        Set a bucket's size and refill rate for this process.
+
+        Args:
+            bucket: Bucket name, e.g. "apollo:search"
+            capacity: Max burst size in tokens
+            refill_rate: Tokens added per second
+        """
+        self.buckets[bucket] = (float(capacity), float(refill_rate))
+
+    def _connection(self) -> sqlite3.Connection:
+        """Per-process connection (reopened after fork)"""
+        if self._conn is None or self._pid != os.getpid():
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout_ms / 1000,
+                                   isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS token_buckets ("
+                "name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def reserve(self, bucket: str, tokens: float = 1.0) -> float:
+        """
+        Take tokens from a bucket.
+
+        Returns:
+            Seconds to wait before the reserved request may be sent (0 if immediate)
+        """
+        if bucket not in self.buckets:
+            raise KeyError(f"Rate limit bucket not configured: {bucket}")
+        capacity, refill_rate = self.buckets[bucket]
+
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()  # wall clock - shared between processes
+                row = conn.execute(
+                    "SELECT tokens, updated_at FROM token_buckets WHERE name = ?", (bucket,)
+                ).fetchone()
+                if row is None:
+                    available = capacity
+                else:
+                    available = min(capacity, row[0] + max(0.0, now - row[1]) * refill_rate)
+
+                remaining = available - tokens
+                conn.execute(
+                    "INSERT INTO token_buckets (name, tokens, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at",
+                    (bucket, remaining, now)
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+        return 0.0 if remaining >= 0 else -remaining / refill_rate
+
+    def acquire(self, bucket: str, tokens: float = 1.0) -> float:
+        """
+        Block until tokens are available (sync callers).
+
+        Returns:
+            Seconds waited
+        """
+        wait = self.reserve(bucket, tokens)
+        if wait > 0:
+            logger.info(f"⏳ Rate limit reached for {bucket}, sleeping for {wait:.1f}s")
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, bucket: str, tokens: float = 1.0) -> float:
+        """
+        Wait for tokens without blocking the event loop. The reservation
+        (thread lock plus a SQLite write) runs in a worker thread.
+
+        Returns:
+            Seconds waited
+        """
+        wait = await asyncio.to_thread(self.reserve, bucket, tokens)
+        if wait > 0:
+            logger.info(f"⏳ Rate limit reached for {bucket}, waiting {wait:.1f}s")
+            await asyncio.sleep(wait)
+        return wait
+
+
+# Apollo endpoints share a bucket per rate-limit class
+APOLLO_BUCKETS = ("search", "match", "bulk", "default")
+
+
+def apollo_bucket(url: str) -> str:
+    """Bucket name for an Apollo API URL"""
+    if "/bulk_" in url:
+        return "apollo:bulk"
+    if "/match" in url:
+        return "apollo:match"
+    if "search" in url:
+        return "apollo:search"
+    return "apollo:default"
+
+
+_rate_limiter: Optional[TokenBucketLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> TokenBucketLimiter:
+    """Process-wide limiter instance (state is shared between processes via SQLite)"""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = TokenBucketLimiter()
+        return _rate_limiter
+
+
+def get_apollo_rate_limiter(requests_per_window: Optional[int] = None,
+                            window_seconds: int = 60) -> TokenBucketLimiter:
+    """
+    Shared limiter with the Apollo buckets configured.
+
+    Args:
+        requests_per_window: Requests allowed per window for each Apollo bucket
+                             (defaults to APOLLO_REQUESTS_PER_MINUTE, then 60)
+        window_seconds: Window length in seconds
+    """
+    if requests_per_window is None:
+        requests_per_window = int(os.getenv("APOLLO_REQUESTS_PER_MINUTE", "60"))
+        window_seconds = 60
+
+    limiter = get_rate_limiter()
+    for name in APOLLO_BUCKETS:
+        limiter.configure(f"apollo:{name}", requests_per_window, requests_per_window / window_seconds)
+    return limiter
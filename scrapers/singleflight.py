@@ -0,0 +1,83 @@
+"""
+Single-flight request coalescing.
+
+While a call for a key is in flight, identical calls wait for it and share its
+result instead of issuing their own - so a burst of the same Apollo request
+costs one upstream call. Coalesced calls are counted per label for metrics.
+"""
+
+import asyncio
+import threading
+from collections import Counter
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+class SingleFlight:
+    """Coalesces identical calls made from different threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        self.coalesced: Counter = Counter()
+
+    def do(self, key: str, fn: Callable[[], Any], label: str = "") -> Tuple[Any, bool]:
+        """
+        Run fn() unless a call with the same key is already running, in which
+        case wait for that one. Exceptions are shared the same way.
+
+        Returns:
+            (result, True if it was shared from another caller's call)
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+            else:
+                self.coalesced[label] += 1
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+
+class AsyncSingleFlight:
+    """Coalesces identical coroutine calls on the same event loop"""
+
+    def __init__(self):
+        self._calls: Dict[tuple, asyncio.Task] = {}
+        self.coalesced: Counter = Counter()
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]], label: str = "") -> Tuple[Any, bool]:
+        """
+        Await fn() unless a call with the same key is already running, in which
+        case await that one. The shared call runs as its own task, so one
+        caller being cancelled doesn't cancel it for the others.
+
+        Returns:
+            (result, True if it was shared from another caller's call)
+        """
+        flight_key = (id(asyncio.get_running_loop()), key)
+        task = self._calls.get(flight_key)
+        shared = task is not None
+        if shared:
+            self.coalesced[label] += 1
+        else:
+            task = asyncio.ensure_future(fn())
+            self._calls[flight_key] = task
+            task.add_done_callback(lambda _: self._calls.pop(flight_key, None))
+
+        return await asyncio.shield(task), shared
@@ -14,7 +14,9 @@ from loguru import logger
 from anthropic import Anthropic
 import httpx
 
-from scrapers.apollo_scraper import ApolloClient
+from scrapers.apollo_scraper import ApolloClient, CREDITS_PER_SEARCH_PAGE
+from scrapers.apollo_usage import CreditBudgetExceeded, UsageScope, usage_scope, default_request_budget
+from scrapers.apollo_retry import ApolloTransientError, ApolloUnavailable
 from database.db_manager import DatabaseManager
 from database.models import Contact, Company
 
@@ -51,7 +53,8 @@ class AgenticSearchService:
         product_description: str = "",
         max_iterations: int = 3,
         min_results: int = 10,
-        max_results_per_query: int = 25
+        max_results_per_query: int = 25,
+        max_credits: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Run an agentic search workflow that iteratively improves searches.
@@ -61,16 +64,43 @@ class AgenticSearchService:
             product_description: Description of product/service being sold
             max_iterations: Maximum number of search iterations
             min_results: Minimum number of quality results to find
-            max_results_per_query: Max results per individual search
+            max_results_per_query: Max results per individual search. Each search
+                costs one credit whatever its size (up to 100), so larger pages
+                get more contacts per credit
+            max_credits: Apollo credits this search may spend (defaults to
+                APOLLO_REQUEST_CREDIT_BUDGET, then no cap). The search stops
+                early, with what it has found, once the next query won't fit.
         
         Returns:
             Dictionary with contacts, companies, and search metadata
         """
+        if max_credits is None:
+            max_credits = default_request_budget()
+        
+        with usage_scope("agentic_search", max_credits) as usage:
+            return self._run_agentic_search(
+                usage, user_query, product_description, max_iterations, min_results, max_results_per_query
+            )
+    
+    def _run_agentic_search(
+        self,
+        usage: UsageScope,
+        user_query: str,
+        product_description: str,
+        max_iterations: int,
+        min_results: int,
+        max_results_per_query: int
+    ) -> Dict[str, Any]:
+        """run_agentic_search inside its credit budget"""
         logger.info(f"🤖 Starting agentic search for: {user_query}")
         
         all_contacts = []
         all_companies = set()
         search_history = []
+        executed_queries = set()
+        budget_exhausted = False
+        apollo_unavailable = False
+        failed_queries = 0
         iteration = 0
         
         # Step 1: Generate initial search queries
@@ -83,15 +113,41 @@ class AgenticSearchService:
             if len(all_contacts) >= min_results:
                 break
             
+            # Expansions and refinements can repeat an earlier query - it would find nothing new
+            query_key = json.dumps(query_params, sort_keys=True, default=str)
+            if query_key in executed_queries:
+                continue
+            executed_queries.add(query_key)
+            
+            # Check the budget before paying for the search
+            if not self.apollo.usage.can_spend(CREDITS_PER_SEARCH_PAGE):
+                logger.warning(f"💳 Apollo credit budget reached after {usage.spent} credits - stopping search")
+                budget_exhausted = True
+                break
+            
             iteration += 1
             logger.info(f"\n--- Iteration {iteration}/{max_iterations} ---")
             logger.info(f"Searching with: {query_params}")
             
             # Execute search
-            contacts, companies = self._execute_apollo_search(
-                query_params,
-                max_results=max_results_per_query
-            )
+            try:
+                contacts, companies = self._execute_apollo_search(
+                    query_params,
+                    max_results=max_results_per_query
+                )
+            except CreditBudgetExceeded as e:
+                logger.warning(f"💳 {e} - stopping search")
+                budget_exhausted = True
+                break
+            except ApolloUnavailable as e:
+                logger.error(f"🔌 {e} - stopping search")
+                apollo_unavailable = True
+                break
+            except ApolloTransientError as e:
+                # Apollo failed, not the query - don't spend a Claude call refining it
+                logger.warning(f"⚠️  Apollo search failed after retries, skipping query: {e}")
+                failed_queries += 1
+                continue
             
             search_history.append({
                 "iteration": iteration,
@@ -142,6 +198,7 @@ class AgenticSearchService:
         logger.info(f"   Total iterations: {iteration}")
         logger.info(f"   Unique contacts: {len(unique_contacts)}")
         logger.info(f"   Companies: {len(all_companies)}")
+        logger.info(f"   Apollo credits: {usage.spent}")
         
         return {
             "contacts": unique_contacts,
@@ -152,8 +209,14 @@ class AgenticSearchService:
                 "total_contacts": len(unique_contacts),
                 "total_companies": len(all_companies),
                 "queries_executed": len(search_history),
-                "avg_results_per_query": len(all_contacts) / len(search_history) if search_history else 0
-            }
+                "avg_results_per_query": len(all_contacts) / len(search_history) if search_history else 0,
+                "credits_used": usage.spent,
+                "results_per_credit": len(unique_contacts) / usage.spent if usage.spent else None,
+                "budget_exhausted": budget_exhausted,
+                "failed_queries": failed_queries,
+                "apollo_unavailable": apollo_unavailable
+            },
+            "usage": usage.to_dict()
         }
     
     def _generate_search_queries(
@@ -253,6 +316,8 @@ Format:
             
             return contacts, companies
             
+        except (CreditBudgetExceeded, ApolloTransientError):
+            raise
         except Exception as e:
             logger.error(f"Apollo search failed: {e}")
             return [], []
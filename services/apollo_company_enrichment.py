@@ -1,9 +1,14 @@
 """Service for enriching companies using Apollo API"""
 import logging
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 from database.models import Company
-from scrapers.apollo_scraper import ApolloClient
+from database.db_manager import normalize_tags, release_connection
+from scrapers.apollo_scraper import ApolloClient, normalize_domain
+from scrapers.apollo_usage import CreditBudgetExceeded, scoped_submit
+from scrapers.apollo_retry import ApolloTransientError
+from scrapers.schemas import Organization
 
 logger = logging.getLogger(__name__)
 
@@ -26,119 +31,193 @@ class ApolloCompanyEnrichment:
             bool: Success status
         """
         try:
-            logger.info(f"🔍 Enriching company with Apollo: {company.name}")
+            name = company.name
+            logger.info(f"🔍 Enriching company with Apollo: {name}")
+            
+            # Don't hold the writer connection during the Apollo request
+            release_connection(session)
             
             # Search for the company in Apollo
             result = self.apollo.search_organizations(
-                query=company.name,
+                query=name,
                 per_page=1
             )
             
             if not result.organizations:
-                logger.warning(f"Company not found in Apollo: {company.name}")
+                logger.warning(f"Company not found in Apollo: {name}")
                 return False
             
             # Get the first (best match) organization
-            org = result.organizations[0]
-            
-            # Update company with Apollo data
-            if org.apollo_id:
-                company.apollo_id = org.apollo_id
-            
-            if org.website and not company.website:
-                company.website = org.website
-            
-            if org.linkedin_url and not company.linkedin_url:
-                company.linkedin_url = org.linkedin_url
-            
-            if org.industry and not company.industry:
-                company.industry = org.industry
-            
-            if org.description and not company.description:
-                company.description = org.description
-            
-            # Update employee count
-            if org.employee_count:
-                company.employee_count = self._format_employee_count(org.employee_count)
-            elif org.employee_count_range:
-                company.employee_count = org.employee_count_range
-            
-            # Update location
-            if org.city or org.state or org.country:
-                location_parts = []
-                if org.city:
-                    location_parts.append(org.city)
-                if org.state:
-                    location_parts.append(org.state)
-                if org.country:
-                    location_parts.append(org.country)
-                company.location = ", ".join(location_parts)
-            
-            # Add Apollo-specific fields
-            if org.founded_year:
-                company.founded_year = org.founded_year
-            
-            if org.funding_stage:
-                company.funding_stage = org.funding_stage
-            
-            if org.total_funding:
-                company.total_funding = org.total_funding
-            
-            if org.technologies:
-                company.technologies = json.dumps(org.technologies)
-            
-            # Generate tags based on Apollo data
-            tags = self._generate_tags(org)
-            if tags:
-                existing_tags = json.loads(company.tags) if company.tags else []
-                # Merge tags, avoiding duplicates
-                all_tags = list(set(existing_tags + tags))
-                company.tags = json.dumps(all_tags)
-            
-            # Set default relationship stage if not set
-            if not company.relationship_stage:
-                company.relationship_stage = "prospect"
-            
-            session.commit()
-            
-            logger.info(f"✅ Enriched company: {company.name}")
-            return True
+            return self._apply_organization(session, company, result.organizations[0])
             
         except Exception as e:
             logger.error(f"Error enriching company {company.name}: {e}")
             session.rollback()
             return False
     
-    def enrich_multiple_companies(self, session, companies: List[Company], limit: Optional[int] = None) -> Dict:
+    def _apply_organization(self, session, company: Company, org: Organization) -> bool:
+        """Copy Apollo organization data onto a company and commit"""
+        # Update company with Apollo data
+        if org.apollo_id:
+            company.apollo_id = org.apollo_id
+        
+        if org.website and not company.website:
+            company.website = org.website
+        
+        if org.linkedin_url and not company.linkedin_url:
+            company.linkedin_url = org.linkedin_url
+        
+        if org.industry and not company.industry:
+            company.industry = org.industry
+        
+        if org.description and not company.description:
+            company.description = org.description
+        
+        # Update employee count
+        if org.employee_count:
+            company.employee_count = self._format_employee_count(org.employee_count)
+        elif org.employee_count_range:
+            company.employee_count = org.employee_count_range
+        
+        # Update location
+        if org.city or org.state or org.country:
+            location_parts = []
+            if org.city:
+                location_parts.append(org.city)
+            if org.state:
+                location_parts.append(org.state)
+            if org.country:
+                location_parts.append(org.country)
+            company.location = ", ".join(location_parts)
+        
+        # Add Apollo-specific fields
+        if org.founded_year:
+            company.founded_year = org.founded_year
+        
+        if org.funding_stage:
+            company.funding_stage = org.funding_stage
+        
+        if org.total_funding:
+            company.total_funding = org.total_funding
+        
+        if org.technologies:
+            company.technologies = json.dumps(org.technologies)
+        
+        # Generate tags based on Apollo data
+        tags = self._generate_tags(org)
+        if tags:
+            existing_tags = normalize_tags(company.tags)
+            # Merge tags, avoiding duplicates
+            all_tags = list(set(existing_tags + tags))
+            company.tags = all_tags
+        
+        # Set default relationship stage if not set
+        if not company.relationship_stage:
+            company.relationship_stage = "prospect"
+        
+        session.commit()
+        
+        logger.info(f"✅ Enriched company: {company.name}")
+        return True
+    
+    def enrich_multiple_companies(self, session, companies: List[Company], limit: Optional[int] = None,
+                                  max_workers: int = 4) -> Dict:
         """
         Enrich multiple companies
         
+        Companies with a website are enriched in bulk by domain. The rest, and
+        any domain Apollo didn't return, fall back to a name search per
+        company; those searches run concurrently and only the database
+        updates happen one at a time on this thread. If the Apollo credit
+        budget runs out, no further lookups are sent; companies already
+        found are still updated and the rest are reported as skipped.
+        
         Args:
             session: Database session
             companies: List of Company objects
             limit: Maximum number of companies to enrich
+            max_workers: Apollo requests in flight at once
             
         Returns:
-            Dict with success/failure counts
+            Dict with success/failure/skipped counts
         """
         if limit:
             companies = companies[:limit]
         
+        # Don't hold the writer connection during the Apollo requests
+        domains = [normalize_domain(company.website) for company in companies]
+        ids = [company.id for company in companies]
+        names = [company.name for company in companies]
+        release_connection(session)
+        
+        organizations = self.apollo.bulk_enrich_organizations(
+            [d for d in domains if d], max_workers=max_workers
+        ) if any(domains) else {}
+        
+        # Fallback: best name match for companies the bulk lookup didn't cover
+        fallback = [i for i, domain in enumerate(domains) if domain not in organizations]
+        over_budget = None
+        budget_skipped = set()  # Company ids never looked up because the credit budget ran out
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="apollo-enrich") as executor:
+            futures = [scoped_submit(executor, self._best_match, names[i]) for i in fallback]
+            matches = {}
+            for i, future in zip(fallback, futures):
+                if future.cancelled():
+                    budget_skipped.add(ids[i])
+                    continue
+                try:
+                    matches[ids[i]] = future.result()
+                except CreditBudgetExceeded as e:
+                    # Nothing was sent - stop the lookups still queued, keep what came back
+                    if over_budget is None:
+                        over_budget = e
+                        for queued in futures:
+                            queued.cancel()
+                    budget_skipped.add(ids[i])
+                except ApolloTransientError as e:
+                    logger.error(f"Apollo lookup failed for {names[i]}: {e}")
+        
+        if over_budget is not None:
+            logger.warning(f"💳 {over_budget} - skipping {len(budget_skipped)} companies")
+        
         success_count = 0
         failure_count = 0
         
-        for company in companies:
-            if self.enrich_company(session, company):
+        for company, domain in zip(companies, domains):
+            org = organizations.get(domain) if domain else None
+            if org is None:
+                org = matches.get(company.id)
+            if org is None and company.id in budget_skipped:
+                continue
+            if org is None:
+                logger.warning(f"Company not found in Apollo: {company.name}")
+                failure_count += 1
+                continue
+            
+            try:
+                self._apply_organization(session, company, org)
                 success_count += 1
-            else:
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Error enriching company {company.name}: {e}")
                 failure_count += 1
         
+        logger.info(f"📊 Apollo company enrichment: {success_count} enriched "
+                    f"({len(organizations)} via bulk), {failure_count} failed, "
+                    f"{len(budget_skipped)} skipped (credit budget)")
+        
         return {
             'total': len(companies),
             'success': success_count,
-            'failure': failure_count
+            'failure': failure_count,
+            'skipped': len(budget_skipped)
         }
     
+    def _best_match(self, name: str) -> Optional[Organization]:
+        """First organization search hit for a company name"""
+        result = self.apollo.search_organizations(query=name, per_page=1)
+        return result.organizations[0] if result.organizations else None
+    
     def _format_employee_count(self, count: int) -> str:
         """
         Format employee count into a range string
@@ -8,8 +8,16 @@ This is useful for Telegram campaigns where phone numbers are required.
 import os
 import logging
 import requests
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+from scrapers.rate_limiter import TokenBucketLimiter, get_apollo_rate_limiter, apollo_bucket
+from scrapers.apollo_cache import ApolloResponseCache, get_apollo_cache, apollo_endpoint, enrichment_cache_key
+from scrapers.apollo_scraper import BULK_MATCH_MAX
+from scrapers.apollo_usage import ApolloUsageLedger, CreditBudgetExceeded, get_usage_ledger, scoped_submit
+from scrapers.apollo_retry import ApolloError, breaker, call_with_retries, check_response, connection_error
 
 load_dotenv()
 logger = logging.getLogger(__name__)
@@ -18,15 +26,39 @@ logger = logging.getLogger(__name__)
 class ApolloPhoneEnrichment:
     """Service to enrich contacts with phone numbers using Apollo API"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None,
+                 rate_limiter: Optional[TokenBucketLimiter] = None,
+                 cache: Optional[ApolloResponseCache] = None,
+                 usage: Optional[ApolloUsageLedger] = None,
+                 max_workers: int = 4,
+                 base_url: Optional[str] = None):
         """
         Initialize Apollo phone enrichment service
         
         Args:
             api_key: Apollo API key (defaults to env variable)
+            rate_limiter: Limiter to draw from (defaults to the shared Apollo buckets)
+            cache: Response cache - a person already looked up costs no credits
+            usage: Credit ledger and budgets (defaults to the app-wide one)
+            max_workers: Apollo requests in flight at once during batch enrichment
+            base_url: API root (defaults to APOLLO_BASE_URL, then api.apollo.io/v1)
         """
         self.api_key = api_key or os.getenv('APOLLO_API_KEY')
-        self.base_url = "https://api.apollo.io/v1"
+        self.base_url = (base_url or os.getenv('APOLLO_BASE_URL') or "https://api.apollo.io/v1").rstrip("/")
+        self.rate_limiter = rate_limiter or get_apollo_rate_limiter()
+        self.cache = cache or get_apollo_cache()
+        self.usage = usage or get_usage_ledger()
+        self.max_workers = max_workers
+        
+        # Keep-alive connections shared by every request (one per worker thread)
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=max_workers))
+        self.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=max_workers))
+        self.session.headers.update({
+            'Content-Type': 'application/json',
+            'Cache-Control': 'no-cache',
+            'X-Api-Key': self.api_key or ''
+        })
         
         if not self.api_key:
             logger.warning("⚠️  Apollo API key not found. Phone enrichment will not work.")
@@ -96,54 +128,98 @@ class ApolloPhoneEnrichment:
                 'error': str(e)
             }
     
+    def _post(self, url: str, data: Dict, cache_key: Dict) -> Tuple[Optional[Dict], bool, Optional[str]]:
+        """
+        POST to Apollo through the shared rate limiter and response cache.
+
+        Returns:
+            (response JSON or None, served from cache, error message)
+        """
+        endpoint = apollo_endpoint(url)
+        cached = self.cache.get(endpoint, cache_key)
+        if cached is not None:
+            logger.info(f"💾 Apollo cache hit: {endpoint} (no credits used)")
+            self.usage.record_cache_hit(url, caller=type(self).__name__)
+            return cached, True, None
+
+        result, error = self._send(url, data)
+        if error:
+            return None, False, error
+
+        self.cache.put(endpoint, cache_key, result)
+        return result, False, None
+
+    def _send(self, url: str, data: Dict) -> Tuple[Optional[Dict], Optional[str]]:
+        """
+        POST to Apollo through the shared rate limiter on a pooled connection.
+        429s, 5xx and dropped connections are retried with backoff (see
+        scrapers/apollo_retry.py).
+
+        Returns:
+            (response JSON or None, error message)
+        """
+        endpoint = apollo_endpoint(url)
+
+        def attempt() -> requests.Response:
+            generation = breaker.before_call(endpoint)
+            with self.usage.track(url, data, caller=type(self).__name__) as call:
+                self.rate_limiter.acquire(apollo_bucket(url))
+                call.start()
+                try:
+                    response = self.session.post(url, json=data, timeout=10)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    raise connection_error(e, endpoint, generation) from e
+                call.done(response)
+            return check_response(response, endpoint, generation)
+
+        try:
+            response = call_with_retries(endpoint, attempt)
+        except ApolloError as e:
+            logger.error(f"Apollo API error: {e}")
+            return None, f'Apollo API error: {e.status_code or type(e).__name__}'
+
+        return response.json(), None
+    
     def _search_by_email(self, email: str) -> Dict:
         """Search Apollo for person by email"""
         try:
             url = f"{self.base_url}/people/match"
-            headers = {
-                'Content-Type': 'application/json',
-                'Cache-Control': 'no-cache',
-                'X-Api-Key': self.api_key
-            }
-            
             data = {
                 'email': email,
                 'reveal_personal_emails': True,
                 'reveal_phone_number': True
             }
             
-            response = requests.post(url, json=data, headers=headers, timeout=10)
+            result, cached, error = self._post(url, data, enrichment_cache_key(data))
+            if error:
+                return {
+                    'success': False,
+                    'phone': None,
+                    'credits_used': 0,
+                    'error': error
+                }
+            credits_used = 0 if cached else 1
+
+            person = result.get('person') or {}
+            phone = person.get('phone_numbers', [])
             
-            if response.status_code == 200:
-                result = response.json()
-                person = result.get('person', {})
-                phone = person.get('phone_numbers', [])
+            if phone and len(phone) > 0:
+                # Get first phone number
+                phone_number = phone[0].get('raw_number') or phone[0].get('sanitized_number')
                 
-                if phone and len(phone) > 0:
-                    # Get first phone number
-                    phone_number = phone[0].get('raw_number') or phone[0].get('sanitized_number')
-                    
-                    logger.info(f"✅ Found phone for {email}: {phone_number}")
-                    return {
-                        'success': True,
-                        'phone': phone_number,
-                        'credits_used': 1,
-                        'error': None
-                    }
-                else:
-                    return {
-                        'success': False,
-                        'phone': None,
-                        'credits_used': 1,
-                        'error': 'No phone number found in Apollo'
-                    }
+                logger.info(f"✅ Found phone for {email}: {phone_number}")
+                return {
+                    'success': True,
+                    'phone': phone_number,
+                    'credits_used': credits_used,
+                    'error': None
+                }
             else:
-                logger.error(f"Apollo API error: {response.status_code} - {response.text}")
                 return {
                     'success': False,
                     'phone': None,
-                    'credits_used': 0,
-                    'error': f'Apollo API error: {response.status_code}'
+                    'credits_used': credits_used,
+                    'error': 'No phone number found in Apollo'
                 }
                 
         except Exception as e:
@@ -159,12 +235,6 @@ class ApolloPhoneEnrichment:
         """Search Apollo for person by name and company"""
         try:
             url = f"{self.base_url}/people/search"
-            headers = {
-                'Content-Type': 'application/json',
-                'Cache-Control': 'no-cache',
-                'X-Api-Key': self.api_key
-            }
-            
             data = {
                 'first_name': first_name,
                 'last_name': last_name,
@@ -174,47 +244,45 @@ class ApolloPhoneEnrichment:
                 'reveal_phone_number': True
             }
             
-            response = requests.post(url, json=data, headers=headers, timeout=10)
+            result, cached, error = self._post(url, data, data)
+            if error:
+                return {
+                    'success': False,
+                    'phone': None,
+                    'credits_used': 0,
+                    'error': error
+                }
+            credits_used = 0 if cached else 1
+
+            people = result.get('people', [])
             
-            if response.status_code == 200:
-                result = response.json()
-                people = result.get('people', [])
+            if people and len(people) > 0:
+                person = people[0]
+                phone = person.get('phone_numbers', [])
                 
-                if people and len(people) > 0:
-                    person = people[0]
-                    phone = person.get('phone_numbers', [])
+                if phone and len(phone) > 0:
+                    phone_number = phone[0].get('raw_number') or phone[0].get('sanitized_number')
                     
-                    if phone and len(phone) > 0:
-                        phone_number = phone[0].get('raw_number') or phone[0].get('sanitized_number')
-                        
-                        logger.info(f"✅ Found phone for {first_name} {last_name} at {company}: {phone_number}")
-                        return {
-                            'success': True,
-                            'phone': phone_number,
-                            'credits_used': 1,
-                            'error': None
-                        }
-                    else:
-                        return {
-                            'success': False,
-                            'phone': None,
-                            'credits_used': 1,
-                            'error': 'No phone number found in Apollo'
-                        }
+                    logger.info(f"✅ Found phone for {first_name} {last_name} at {company}: {phone_number}")
+                    return {
+                        'success': True,
+                        'phone': phone_number,
+                        'credits_used': credits_used,
+                        'error': None
+                    }
                 else:
                     return {
                         'success': False,
                         'phone': None,
-                        'credits_used': 1,
-                        'error': 'Person not found in Apollo'
+                        'credits_used': credits_used,
+                        'error': 'No phone number found in Apollo'
                     }
             else:
-                logger.error(f"Apollo API error: {response.status_code} - {response.text}")
                 return {
                     'success': False,
                     'phone': None,
-                    'credits_used': 0,
-                    'error': f'Apollo API error: {response.status_code}'
+                    'credits_used': credits_used,
+                    'error': 'Person not found in Apollo'
                 }
                 
         except Exception as e:
@@ -230,6 +298,12 @@ class ApolloPhoneEnrichment:
         """
         Enrich multiple contacts with phone numbers
         
+        Contacts are looked up with Apollo's bulk people match, BULK_MATCH_MAX
+        per request, with the requests sent concurrently. People already looked
+        up come from the cache. Contacts whose bulk request failed go through
+        enrich_contact_phone one by one, and ones matched by email without a
+        phone get the same name + company search fallback it would give them.
+        
         Args:
             contacts: List of contact dicts
             
@@ -253,11 +327,9 @@ class ApolloPhoneEnrichment:
             'results': []
         }
         
-        for contact in contacts:
-            result = self.enrich_contact_phone(contact)
-            
+        for contact, result in zip(contacts, self._lookup_phones(contacts)):
             if result['success']:
-                if result['credits_used'] == 0:
+                if contact.get('phone'):
                     results['already_had_phone'] += 1
                 else:
                     results['enriched'] += 1
@@ -277,4 +349,127 @@ class ApolloPhoneEnrichment:
                    f"{results['failed']} failed, {results['credits_used']} credits used")
         
         return results
+    
+    def _lookup_phones(self, contacts: List[Dict]) -> List[Dict]:
+        """enrich_contact_phone results for every contact, using bulk matches where possible"""
+        outcomes: List[Optional[Dict]] = [None] * len(contacts)
+        pending = []  # (index, people/match payload)
+        matched = set()  # Answered by a match lookup (cached or bulk)
+        
+        for i, contact in enumerate(contacts):
+            payload = self._match_payload(contact)
+            if not self.api_key or contact.get('phone') or payload is None:
+                outcomes[i] = self.enrich_contact_phone(contact)  # Answered without a request
+                continue
+            cached = self.cache.get('people/match', enrichment_cache_key(payload))
+            if cached is not None:
+                outcomes[i] = self._match_result(cached.get('person'), 0)
+                matched.add(i)
+            else:
+                pending.append((i, payload))
+        
+        chunks = [pending[i:i + BULK_MATCH_MAX] for i in range(0, len(pending), BULK_MATCH_MAX)]
+        if chunks:
+            logger.info(f"📞 Bulk matching {len(pending)} contacts in {len(chunks)} requests "
+                        f"({len(contacts) - len(pending)} answered without a request)")
+        
+        retry = []  # Contacts whose bulk request failed
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="apollo-phones") as executor:
+            for chunk, future in zip(chunks, [scoped_submit(executor, self._bulk_match, c) for c in chunks]):
+                try:
+                    matches = future.result()
+                except CreditBudgetExceeded as e:
+                    logger.warning(f"💳 {e} - skipping {len(chunk)} contacts")
+                    for i, _ in chunk:
+                        outcomes[i] = {'success': False, 'phone': None, 'credits_used': 0, 'error': str(e)}
+                    continue
+                except Exception as e:
+                    logger.warning(f"⚠️  Bulk match failed for {len(chunk)} contacts, retrying one by one: {e}")
+                    retry.extend(i for i, _ in chunk)
+                    continue
+                for (i, payload), person in zip(chunk, matches):
+                    self.cache.put('people/match', enrichment_cache_key(payload), {'person': person})
+                    outcomes[i] = self._match_result(person, 1 if person else 0)
+                    matched.add(i)
+            
+            # Same fallback as enrich_contact_phone: name + company search when email found no phone
+            fallback = [
+                i for i in sorted(matched)
+                if not outcomes[i]['success'] and contacts[i].get('email')
+                and contacts[i].get('first_name') and contacts[i].get('company')
+            ]
+            retried = [scoped_submit(executor, self.enrich_contact_phone, contacts[i]) for i in retry]
+            searched = [scoped_submit(
+                executor, self._search_by_name_company,
+                first_name=contacts[i]['first_name'],
+                last_name=contacts[i].get('last_name', ''),
+                company=contacts[i]['company']
+            ) for i in fallback]
+            
+            for i, future in zip(retry, retried):
+                outcomes[i] = future.result()
+            for i, future in zip(fallback, searched):
+                result = future.result()
+                outcomes[i] = {**result, 'credits_used': result['credits_used'] + outcomes[i]['credits_used']}
+        
+        return outcomes
+    
+    def _match_payload(self, contact: Dict) -> Optional[Dict]:
+        """people/match request for a contact, or None without an email or name + company"""
+        payload = {
+            'reveal_personal_emails': True,
+            'reveal_phone_number': True
+        }
+        if contact.get('email'):
+            payload['email'] = contact['email']
+        if contact.get('first_name'):
+            payload['first_name'] = contact['first_name']
+        if contact.get('last_name'):
+            payload['last_name'] = contact['last_name']
+        if contact.get('company'):
+            payload['organization_name'] = contact['company']
+        
+        if not payload.get('email') and not (payload.get('first_name') and payload.get('organization_name')):
+            return None
+        return payload
+    
+    def _bulk_match(self, chunk: List[Tuple[int, Dict]]) -> List[Optional[Dict]]:
+        """
+        One people/bulk_match request.
 
+        Returns:
+            The matched person (or None) for each entry of the chunk, in order
+        """
+        data = {
+            'details': [
+                {k: v for k, v in payload.items() if not k.startswith('reveal_')}
+                for _, payload in chunk
+            ],
+            'reveal_personal_emails': True,
+            'reveal_phone_number': True
+        }
+        result, error = self._send(f"{self.base_url}/people/bulk_match", data)
+        if error:
+            raise RuntimeError(error)
+        
+        matches = result.get('matches') or []
+        return matches + [None] * (len(chunk) - len(matches))
+    
+    def _match_result(self, person: Optional[Dict], credits_used: int) -> Dict:
+        """enrich_contact_phone-style result for a people/match person"""
+        phones = (person or {}).get('phone_numbers') or []
+        if phones:
+            phone_number = phones[0].get('raw_number') or phones[0].get('sanitized_number')
+            logger.info(f"✅ Found phone for {person.get('email') or person.get('name')}: {phone_number}")
+            return {
+                'success': True,
+                'phone': phone_number,
+                'credits_used': credits_used,
+                'error': None
+            }
+        return {
+            'success': False,
+            'phone': None,
+            'credits_used': credits_used,
+            'error': 'No phone number found in Apollo' if person else 'Person not found in Apollo'
+        }
@@ -9,6 +9,8 @@ from typing import Dict, List, Optional
 import json
 from datetime import datetime
 
+from database.db_manager import release_connection
+
 
 class CompanyEnrichmentService:
     """Service for enriching company data with AI-powered insights"""
@@ -133,6 +135,9 @@ Return ONLY valid JSON, no additional text."""
                 'location': company.location
             }
             
+            # Don't hold the writer connection while Claude works
+            release_connection(session)
+            
             # Enrich with AI
             enrichment = self.enrich_company(company_data, our_profile)
             
@@ -5,18 +5,21 @@ Analyzes user's website to create a company profile for AI-powered enrichment
 
 import anthropic
 import requests
-from bs4 import BeautifulSoup
 from loguru import logger
 from typing import Dict, List, Optional
 import json
 import os
 
+from scrapers.html_cache import HtmlCache, get_html_cache
+from scrapers.html_parsing import make_soup
+
 
 class CompanyProfileService:
     """Service for creating and managing company profiles"""
     
-    def __init__(self, anthropic_api_key: str):
+    def __init__(self, anthropic_api_key: str, cache: Optional[HtmlCache] = None):
         self.client = anthropic.Anthropic(api_key=anthropic_api_key)
+        self.cache = cache or get_html_cache()
         
     def scrape_website(self, url: str) -> str:
         """Scrape content from a website"""
@@ -27,25 +30,13 @@ class CompanyProfileService:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
             
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self.cache.get(
+                url, "website",
+                lambda validators: requests.get(url, headers={**headers, **validators}, timeout=10)
+            )
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style", "nav", "footer"]):
-                script.decompose()
-            
-            # Get text content
-            text = soup.get_text()
-            
-            # Clean up whitespace
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
-            
-            # Limit to first 10000 characters to avoid token limits
-            text = text[:10000]
+            text = self.extract_page_text(response.content)
             
             logger.info(f"✅ Scraped {len(text)} characters from {url}")
             return text
@@ -54,6 +45,26 @@ class CompanyProfileService:
             logger.error(f"Error scraping website {url}: {e}")
             return ""
     
+    @staticmethod
+    def extract_page_text(html, backend: Optional[str] = None) -> str:
+        """Visible text of a web page (str or bytes), whitespace-collapsed, first 10000 characters"""
+        soup = make_soup(html, backend=backend)
+        
+        # Remove script and style elements
+        for script in soup(["script", "style", "nav", "footer"]):
+            script.decompose()
+        
+        # Get text content
+        text = soup.get_text()
+        
+        # Clean up whitespace
+        lines = (line.strip() for line in text.splitlines())
+        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+        text = ' '.join(chunk for chunk in chunks if chunk)
+        
+        # Limit to first 10000 characters to avoid token limits
+        return text[:10000]
+    
     def analyze_website_with_ai(self, website_content: str, url: str) -> Dict:
         """Use Claude to analyze website and extract company profile"""
         try:
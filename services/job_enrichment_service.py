@@ -3,18 +3,23 @@ Job Enrichment Service
 Orchestrates job posting scraping, company extraction, Apollo enrichment, and AI matching
 """
 
+import asyncio
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
-from linkedin_scrape import scrape_first_n_jobs
-from scrapers.apollo_scraper import ApolloClient
+from linkedin_scrape import AsyncJobScraper, reparse_cached_job_details, run_sync, scrape_first_n_jobs_async
+from scrapers.apollo_scraper import ApolloClient, AsyncApolloClient
+from scrapers.apollo_usage import CreditBudgetExceeded, usage_scope, default_request_budget
 from ai_agent.intent_parser import IntentParser
-from database.db_manager import DatabaseManager
+from database.db_manager import DatabaseManager, release_connection
 from database.models import Company, Contact, JobPosting
 
 logger = logging.getLogger(__name__)
 
+# Focus on top decision makers only - CEO or Director level
+DEFAULT_TARGET_TITLES = ["CEO", "Chief Executive Officer", "Director", "Managing Director"]
+
 
 class JobEnrichmentService:
     """
@@ -29,8 +34,9 @@ class JobEnrichmentService:
     """
     
     def __init__(self, apollo_client: ApolloClient, intent_parser: IntentParser,
-                 db_manager: DatabaseManager):
+                 db_manager: DatabaseManager, apollo_async: Optional[AsyncApolloClient] = None):
         self.apollo = apollo_client
+        self.apollo_async = apollo_async  # Enables concurrent per-company searches
         self.claude = intent_parser
         self.db = db_manager
     
@@ -91,42 +97,69 @@ Keep locations broad (country or major city) unless user specified otherwise.
             return [{"query": "Business Development", "location": "United States"}]
     
     def scrape_job_postings(self, queries: List[Dict[str, str]], 
-                           jobs_per_query: int = 20) -> List[Dict[str, Any]]:
+                           jobs_per_query: int = 20, skip_known: bool = True) -> List[Dict[str, Any]]:
         """
         Scrape job postings from LinkedIn
         
         Args:
             queries: List of {query, location} dicts
             jobs_per_query: Number of jobs to scrape per query
+            skip_known: Skip postings already in the database (without fetching
+                        their detail pages) and keep paging for new ones
             
         Returns:
             List of job posting dicts
         """
+        return run_sync(self.scrape_job_postings_async(queries, jobs_per_query, skip_known))
+
+    async def scrape_job_postings_async(self, queries: List[Dict[str, str]],
+                                        jobs_per_query: int = 20, skip_known: bool = True) -> List[Dict[str, Any]]:
+        """
+        scrape_job_postings with every query scraped concurrently over one
+        pooled client (paced per host by the scraper's politeness limits)
+
+        Returns:
+            List of job posting dicts, grouped by query in query order
+        """
+        async def scrape(scraper: AsyncJobScraper, q: Dict[str, str]) -> List[Dict[str, Any]]:
+            logger.info(f"Scraping jobs: {q['query']} in {q['location']}")
+            jobs = await scrape_first_n_jobs_async(
+                query=q['query'],
+                location=q['location'],
+                n=jobs_per_query,
+                scraper=scraper,
+                known=self._known_job_ids if skip_known else None
+            )
+
+            # Add search metadata
+            for job in jobs:
+                job['search_query'] = q['query']
+                job['search_location'] = q['location']
+
+            logger.info(f"Found {len(jobs)} jobs for {q['query']}")
+            return jobs
+
+        async with AsyncJobScraper() as scraper:
+            results = await asyncio.gather(*[scrape(scraper, q) for q in queries], return_exceptions=True)
+
         all_jobs = []
-        
-        for q in queries:
-            try:
-                logger.info(f"Scraping jobs: {q['query']} in {q['location']}")
-                jobs = scrape_first_n_jobs(
-                    query=q['query'],
-                    location=q['location'],
-                    n=jobs_per_query
-                )
-                
-                # Add search metadata
-                for job in jobs:
-                    job['search_query'] = q['query']
-                    job['search_location'] = q['location']
-                
-                all_jobs.extend(jobs)
-                logger.info(f"Found {len(jobs)} jobs for {q['query']}")
-                
-            except Exception as e:
-                logger.error(f"Error scraping jobs for {q}: {e}")
+        for q, jobs in zip(queries, results):
+            if isinstance(jobs, Exception):
+                logger.error(f"Error scraping jobs for {q}: {jobs}")
                 continue
-        
-        logger.info(f"Total jobs scraped: {len(all_jobs)}")
+            all_jobs.extend(jobs)
+
+        logger.info(f"Total jobs scraped: {len(all_jobs)} ({scraper.stats['known_skipped']} already known skipped, "
+                    f"{scraper.stats['search_pages']} search pages, {scraper.stats['detail_pages']} detail pages)")
         return all_jobs
+
+    def _known_job_ids(self, job_ids: List[str]) -> set:
+        """The job IDs (from one search page) that are already saved"""
+        session = self.db.get_read_session()
+        try:
+            return self.db.get_known_job_ids(session, job_ids)
+        finally:
+            session.close()
     
     def save_job_postings_to_db(self, session, jobs: List[Dict[str, Any]]) -> List[JobPosting]:
         """
@@ -174,7 +207,31 @@ Keep locations broad (country or major city) unless user specified otherwise.
         
         logger.info(f"Saved {len(saved_jobs)} job postings to database")
         return saved_jobs
-    
+
+    def reextract_job_postings(self, session) -> Dict[str, int]:
+        """
+        Re-run the job detail extractor over every cached job page and update the
+        saved postings' fields - no requests are made. Use after changing
+        parse_job_detail.
+
+        Returns:
+            {'pages': cached pages parsed, 'updated': postings whose fields changed}
+        """
+        details = {d['job_id']: d for d in reparse_cached_job_details()}
+        updated = 0
+        for job in self.db._query_in(session, JobPosting, JobPosting.job_id, details):
+            detail = details[job.job_id]
+            changed = False
+            for field in ('job_title', 'job_description', 'level', 'company_description'):
+                if detail.get(field) and detail[field] != getattr(job, field):
+                    setattr(job, field, detail[field])
+                    changed = True
+            updated += changed
+        session.commit()
+
+        logger.info(f"Re-extracted {len(details)} cached job pages, updated {updated} job postings")
+        return {'pages': len(details), 'updated': updated}
+
     def _sanitize_text(self, text: str) -> str:
         """
         Sanitize text by removing control characters that break JSON parsing.
@@ -198,8 +255,9 @@ Keep locations broad (country or major city) unless user specified otherwise.
         Returns:
             {score: float, reasoning: str}
         """
-        # Get company's job postings
+        # Get company's job postings (then let the connection go while Claude works)
         jobs = self.db.get_job_postings_by_company(session, company.id)
+        release_connection(session)
 
         if not jobs:
             return {"score": 0, "reasoning": "No job postings available"}
@@ -273,24 +331,23 @@ Return ONLY a JSON object: {{"score": <0-100>, "reasoning": "<brief explanation>
             List of Contact objects
         """
         if target_titles is None:
-            # Focus on top decision makers only - CEO or Director level
-            target_titles = ["CEO", "Chief Executive Officer", "Director", "Managing Director"]
-
-        all_contacts = []
-
+            target_titles = DEFAULT_TARGET_TITLES
+        job_titles_by_company = self.load_job_titles(session, companies)
+        # Don't hold the writer connection during the Apollo searches
+        release_connection(session)
+        rows = self._search_company_contacts(companies, job_titles_by_company, target_titles,
+                                             max_contacts_per_company)
+        return self.save_contact_rows(session, rows)
+
+    def _search_company_contacts(self, companies: List[Company], job_titles_by_company: Dict[int, List[str]],
+                                 target_titles: List[str], max_contacts_per_company: int) -> List[Dict[str, Any]]:
+        """Search Apollo for each company in turn and build the contact rows"""
+        rows = []
+        budget_skipped = 0
         for company in companies:
             try:
                 logger.info(f"Enriching {company.name} with Apollo (max {max_contacts_per_company} contact)...")
 
-                # Get job postings for this company to add context
-                job_postings = session.query(JobPosting).filter(
-                    JobPosting.company_id == company.id
-                ).all()
-
-                # Build job context for tags
-                job_titles = [jp.job_title for jp in job_postings if jp.job_title]
-                job_context = f"recruiting for {', '.join(job_titles[:3])}" if job_titles else "has job openings"
-
                 # Search Apollo for contacts at this company
                 # Use per_page=25 to get options, but we'll only save the top ones
                 result = self.apollo.search_people(
@@ -298,92 +355,174 @@ Return ONLY a JSON object: {{"score": <0-100>, "reasoning": "<brief explanation>
                     titles=target_titles,
                     per_page=25  # Get options to choose from
                 )
+                rows.extend(self._contact_rows(company, result, job_titles_by_company.get(company.id, []),
+                                               max_contacts_per_company))
 
-                # Prioritize contacts: CEO > Director > others
-                # Only take the first max_contacts_per_company
-                contacts_to_save = []
-                for contact_obj in result.contacts[:max_contacts_per_company]:
-                    contacts_to_save.append(contact_obj)
-
-                if not contacts_to_save:
-                    logger.warning(f"No contacts found for {company.name}")
-                    continue
-
-                # Save contacts to database with job posting context
-                for contact_obj in contacts_to_save:
-                    # Extract tags from contact
-                    if isinstance(contact_obj, dict):
-                        existing_tags = contact_obj.get('tags', [])
-                    else:
-                        existing_tags = getattr(contact_obj, 'tags', [])
-
-                    # Add job posting context tag
-                    enhanced_tags = existing_tags.copy() if existing_tags else []
-                    enhanced_tags.append(f"job_posting:{job_titles[0][:30] if job_titles else 'unknown'}")
-
-                    # Build source reason with job context
-                    source_reason = f"Found via job enrichment: {company.name} is {job_context}"
-
-                    # contact_obj is already a Contact object from Apollo scraper
-                    # We need to check if it's a dict or object
-                    if isinstance(contact_obj, dict):
-                        # It's a dictionary
-                        contact, created = self.db.get_or_create_contact(
-                            session,
-                            email=contact_obj.get('email'),
-                            linkedin_url=contact_obj.get('linkedin_url'),
-                            name=contact_obj.get('name'),
-                            title=contact_obj.get('title'),
-                            company_id=company.id,
-                            company_name=company.name,
-                            phone=contact_obj.get('phone'),
-                            city=contact_obj.get('city'),
-                            state=contact_obj.get('state'),
-                            country=contact_obj.get('country'),
-                            seniority=contact_obj.get('seniority'),
-                            tags=enhanced_tags,
-                            source_reason=source_reason,
-                            source='apollo'
-                        )
-                    else:
-                        # It's a Contact object - access attributes safely with getattr
-                        contact, created = self.db.get_or_create_contact(
-                            session,
-                            email=getattr(contact_obj, 'email', None),
-                            linkedin_url=getattr(contact_obj, 'linkedin_url', None),
-                            name=getattr(contact_obj, 'name', ''),
-                            title=getattr(contact_obj, 'title', None),
-                            company_id=company.id,
-                            company_name=company.name,
-                            phone=getattr(contact_obj, 'phone', None),
-                            city=getattr(contact_obj, 'city', None),
-                            state=getattr(contact_obj, 'state', None),
-                            country=getattr(contact_obj, 'country', None),
-                            seniority=getattr(contact_obj, 'seniority', None),
-                            tags=enhanced_tags,
-                            source_reason=source_reason,
-                            source='apollo'
-                        )
-
-                    all_contacts.append(contact)
-
-                    if created:
-                        logger.info(f"✅ Added {contact.name} ({contact.title}) from {company.name}")
-                    else:
-                        logger.info(f"♻️  Updated {contact.name} from {company.name}")
-
-                logger.info(f"Saved {len(contacts_to_save)} contact(s) at {company.name} (found {len(result.contacts)} total)")
-
+            except CreditBudgetExceeded:
+                # Over budget: nothing was sent. Keep going - cached companies are still free
+                budget_skipped += 1
+                continue
             except Exception as e:
                 logger.error(f"Error enriching {company.name}: {e}")
                 continue
 
-        logger.info(f"Total contacts enriched: {len(all_contacts)}")
+        if budget_skipped:
+            logger.warning(f"💳 Apollo credit budget reached - skipped {budget_skipped} companies")
+        return rows
+
+    async def enrich_companies_with_apollo_async(self, session, companies: List[Company],
+                                                 target_titles: List[str] = None,
+                                                 max_contacts_per_company: int = 1) -> List[Contact]:
+        """
+        enrich_companies_with_apollo with the per-company searches issued
+        concurrently through the async Apollo client (bounded by its
+        max_concurrency). Falls back to the sequential version without one.
+
+        Returns:
+            List of Contact objects
+        """
+        if not self.apollo_async:
+            return self.enrich_companies_with_apollo(session, companies, target_titles,
+                                                     max_contacts_per_company)
+
+        job_titles_by_company = self.load_job_titles(session, companies)
+        # Don't hold the writer connection during the Apollo searches
+        release_connection(session)
+        rows = await self.search_company_contacts_async(companies, job_titles_by_company, target_titles,
+                                                        max_contacts_per_company)
+        return self.save_contact_rows(session, rows)
+
+    async def search_company_contacts_async(self, companies: List[Company],
+                                            job_titles_by_company: Dict[int, List[str]],
+                                            target_titles: List[str] = None,
+                                            max_contacts_per_company: int = 1) -> List[Dict[str, Any]]:
+        """
+        The Apollo half of enrich_companies_with_apollo_async: search every
+        company concurrently and build the contact rows. Needs no session, so
+        callers don't hold one across the round trips. Without the async
+        client the searches run sequentially in a worker thread.
+
+        Args:
+            companies: Company objects (may be detached)
+            job_titles_by_company: load_job_titles() for those companies
+
+        Returns:
+            Contact rows for save_contact_rows()
+        """
+        if target_titles is None:
+            target_titles = DEFAULT_TARGET_TITLES
+        if not self.apollo_async:
+            return await asyncio.to_thread(self._search_company_contacts, companies, job_titles_by_company,
+                                           target_titles, max_contacts_per_company)
+
+        logger.info(f"Enriching {len(companies)} companies with Apollo "
+                    f"({self.apollo_async.max_concurrency} concurrent searches)...")
+        results = await asyncio.gather(*[
+            self.apollo_async.search_people(
+                company_names=[company.name],
+                titles=target_titles,
+                per_page=25
+            )
+            for company in companies
+        ], return_exceptions=True)
+
+        rows = []
+        budget_skipped = sum(1 for result in results if isinstance(result, CreditBudgetExceeded))
+        if budget_skipped:
+            logger.warning(f"💳 Apollo credit budget reached - skipped {budget_skipped} companies")
+        for company, result in zip(companies, results):
+            if isinstance(result, CreditBudgetExceeded):
+                continue
+            if isinstance(result, Exception):
+                logger.error(f"Error enriching {company.name}: {result}")
+                continue
+            rows.extend(self._contact_rows(company, result, job_titles_by_company.get(company.id, []),
+                                           max_contacts_per_company))
+        return rows
+
+    def load_job_titles(self, session, companies: List[Company]) -> Dict[int, List[str]]:
+        """Job titles for all companies in one query, used to add context to contacts"""
+        job_titles_by_company: Dict[int, List[str]] = {}
+        company_ids = [company.id for company in companies]
+        if company_ids:
+            job_rows = session.query(JobPosting.company_id, JobPosting.job_title).filter(
+                JobPosting.company_id.in_(company_ids)
+            ).all()
+            for company_id, job_title in job_rows:
+                if job_title:
+                    job_titles_by_company.setdefault(company_id, []).append(job_title)
+        return job_titles_by_company
+
+    def _contact_rows(self, company: Company, result, job_titles: List[str],
+                      max_contacts_per_company: int) -> List[Dict[str, Any]]:
+        """Contact rows (with job posting context) for one company's Apollo search result"""
+        # Build job context for tags
+        job_context = f"recruiting for {', '.join(job_titles[:3])}" if job_titles else "has job openings"
+
+        # Prioritize contacts: CEO > Director > others
+        # Only take the first max_contacts_per_company
+        contacts_to_save = []
+        for contact_obj in result.contacts[:max_contacts_per_company]:
+            contacts_to_save.append(contact_obj)
+
+        if not contacts_to_save:
+            logger.warning(f"No contacts found for {company.name}")
+            return []
+
+        # Queue contacts for a single bulk save with job posting context
+        rows = []
+        for contact_obj in contacts_to_save:
+            # contact_obj is usually a Contact object from Apollo scraper, but may be a dict
+            if isinstance(contact_obj, dict):
+                get_field = contact_obj.get
+            else:
+                get_field = lambda field, default=None: getattr(contact_obj, field, default)
+
+            # Add job posting context tag
+            existing_tags = get_field('tags', [])
+            enhanced_tags = existing_tags.copy() if existing_tags else []
+            enhanced_tags.append(f"job_posting:{job_titles[0][:30] if job_titles else 'unknown'}")
+
+            # Build source reason with job context
+            source_reason = f"Found via job enrichment: {company.name} is {job_context}"
+
+            rows.append({
+                'email': get_field('email'),
+                'linkedin_url': get_field('linkedin_url'),
+                'name': get_field('name') or '',
+                'title': get_field('title'),
+                'company_id': company.id,
+                'company_name': company.name,
+                'phone': get_field('phone'),
+                'city': get_field('city'),
+                'state': get_field('state'),
+                'country': get_field('country'),
+                'seniority': get_field('seniority'),
+                'tags': enhanced_tags,
+                'source_reason': source_reason,
+                'source': 'apollo'
+            })
+
+        logger.info(f"Queued {len(contacts_to_save)} contact(s) at {company.name} (found {len(result.contacts)} total)")
+        return rows
+
+    def save_contact_rows(self, session, rows: List[Dict[str, Any]]) -> List[Contact]:
+        """Bulk upsert the queued contact rows"""
+        if not rows:
+            logger.info("Total contacts enriched: 0")
+            return []
+
+        upsert_result = self.db.bulk_upsert_contacts(session, rows)
+        all_contacts = upsert_result['contacts']
+
+        logger.info(f"Total contacts enriched: {len(all_contacts)} "
+                    f"({upsert_result['created']} added, {upsert_result['updated']} updated)")
         return all_contacts
     
     def run_full_enrichment(self, user_query: str, product_description: str = "",
                            jobs_per_query: int = 20, min_match_score: float = 60,
-                           max_contacts_per_company: int = 1) -> Dict[str, Any]:
+                           max_contacts_per_company: int = 1,
+                           max_credits: Optional[int] = None) -> Dict[str, Any]:
         """
         Run the complete job enrichment workflow
 
@@ -393,6 +532,9 @@ Return ONLY a JSON object: {{"score": <0-100>, "reasoning": "<brief explanation>
             jobs_per_query: Number of job postings to scrape per query
             min_match_score: Minimum company match score (0-100)
             max_contacts_per_company: Max contacts to find per company (default: 1 to save credits)
+            max_credits: Apollo credits the run may spend (defaults to
+                         APOLLO_REQUEST_CREDIT_BUDGET, then no cap). Best-matching
+                         companies are searched first, so a budget cuts off the weakest.
 
         Returns:
             {
@@ -402,8 +544,9 @@ Return ONLY a JSON object: {{"score": <0-100>, "reasoning": "<brief explanation>
                 'stats': {...}
             }
         """
-        session = self.db.get_session()
-
+        # The writer connection is only taken for the saves (steps 3, 5 and 7);
+        # scraping, the Claude analyses and the Apollo searches run with no
+        # writer session open
         try:
             # Step 1: Generate job search queries
             logger.info("Step 1: Generating job search queries...")
@@ -415,33 +558,51 @@ Return ONLY a JSON object: {{"score": <0-100>, "reasoning": "<brief explanation>
 
             # Step 3: Save to database
             logger.info("Step 3: Saving job postings to database...")
-            job_postings = self.save_job_postings_to_db(session, jobs)
+            with self.db.write_session() as session:
+                job_postings = self.save_job_postings_to_db(session, jobs)
 
-            # Step 4: Get unique companies
-            company_ids = list(set([job.company_id for job in job_postings if job.company_id]))
-            companies = [session.query(Company).get(cid) for cid in company_ids]
+                # Step 4: Get unique companies
+                company_ids = list(set([job.company_id for job in job_postings if job.company_id]))
+                companies = self.db._query_in(session, Company, Company.id, company_ids)
 
             # Step 5: Analyze company fit with AI
             logger.info("Step 5: Analyzing company fit...")
-            for company in companies:
-                analysis = self.analyze_company_fit(session, company, user_query, product_description)
-                self.db.update_company_match_score(session, company.id,
-                                                   analysis['score'], analysis['reasoning'])
+            session = self.db.get_read_session()
+            try:
+                analyses = {
+                    company.id: self.analyze_company_fit(session, company, user_query, product_description)
+                    for company in companies
+                }
+            finally:
+                session.close()
+
+            with self.db.write_session() as session:
+                for company_id, analysis in analyses.items():
+                    self.db.update_company_match_score(session, company_id,
+                                                       analysis['score'], analysis['reasoning'])
+                companies = self.db._query_in(session, Company, Company.id, company_ids)
 
             # Step 6: Filter companies by match score
             matched_companies = [c for c in companies if c.match_score and c.match_score >= min_match_score]
+            matched_companies.sort(key=lambda c: c.match_score, reverse=True)
             logger.info(f"Found {len(matched_companies)} companies with score >= {min_match_score}")
 
             # Step 7: Enrich with Apollo contacts (only 1 per company to save credits)
             logger.info(f"Step 7: Enriching with Apollo contacts ({max_contacts_per_company} per company)...")
-            contacts = self.enrich_companies_with_apollo(
-                session,
-                matched_companies,
-                max_contacts_per_company=max_contacts_per_company
-            )
-
-            # IMPORTANT: Commit all changes to database!
-            session.commit()
+            session = self.db.get_read_session()
+            try:
+                job_titles_by_company = self.load_job_titles(session, matched_companies)
+            finally:
+                session.close()
+
+            if max_credits is None:
+                max_credits = default_request_budget()
+            with usage_scope("job_enrichment", max_credits) as usage:
+                rows = self._search_company_contacts(matched_companies, job_titles_by_company,
+                                                     DEFAULT_TARGET_TITLES, max_contacts_per_company)
+
+            with self.db.write_session() as session:
+                contacts = self.save_contact_rows(session, rows)
             logger.info(f"✅ Committed {len(contacts)} contacts to database")
 
             return {
@@ -452,14 +613,13 @@ Return ONLY a JSON object: {{"score": <0-100>, "reasoning": "<brief explanation>
                     'total_jobs_scraped': len(job_postings),
                     'total_companies': len(companies),
                     'matched_companies': len(matched_companies),
-                    'total_contacts': len(contacts)
-                }
+                    'total_contacts': len(contacts),
+                    'credits_used': usage.spent
+                },
+                'usage': usage.to_dict()
             }
 
         except Exception as e:
-            session.rollback()
             logger.error(f"Error in full enrichment workflow: {e}")
             raise
-        finally:
-            session.close()
 
@@ -0,0 +1,37 @@
+"""
+Every installed HTML parser backend must extract exactly what the legacy
+html.parser code did from the saved pages in benchmarks/fixtures/html (the
+same comparison as `python benchmarks/html_parsing.py --check`).
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.html_parsing import FIXTURES, extract_all, load_pages
+from scrapers.html_parsing import available_backends
+
+
+@pytest.fixture(scope="module")
+def pages():
+    return load_pages(FIXTURES)
+
+
+@pytest.fixture(scope="module")
+def legacy(pages):
+    return extract_all('legacy', pages)
+
+
+@pytest.mark.parametrize("backend", ['html.parser', 'lxml', 'selectolax'])
+def test_backend_matches_legacy(backend, pages, legacy):
+    if backend not in available_backends():
+        pytest.skip(f"{backend} is not installed (requirements-optional.txt)")
+
+    results = extract_all(backend, pages)
+
+    assert set(results) == set(legacy)
+    for name, expected in legacy.items():
+        assert results[name] == expected, f"{backend} differs from legacy on {name}"